@@ -0,0 +1,65 @@
+"""
+Micro-benchmark for the grant matches PDF report
+
+Renders reports of 10, 100 and 1000 synthetic grants with generate_grants_pdf
+(in memory, no caching), checks each is a complete PDF whose page count grows
+with the number of grants, and prints the total and per-grant build time.
+
+Usage: python benchmark_grants_pdf.py [sizes...]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+import server  # noqa: E402
+
+def sample_grants(count: int):
+    return [{
+        'grant_id': f"{i:03d}",
+        'name': f"Startup Innovation Grant {i}",
+        'relevance_score': 80 + i % 20,
+        'funding_amount': f"₹{(i % 50 + 1) * 100000}",
+        'soft_approval': 'Yes' if i % 3 == 0 else 'No',
+        'deadline': '2026-12-31',
+        'reason': "Strong sector alignment and stage compatibility; the funding amount of ₹25,00,000 "
+                  "fits the startup's stated need and the eligibility criteria are met. " * 2,
+        'sector': 'Technology',
+        'eligibility': 'DPIIT-recognised startups under 10 years old',
+        'application_link': f"https://example.com/grants/{i}",
+        'stage': 'Early Traction',
+    } for i in range(count)]
+
+def benchmark(sizes):
+    print("=" * 60)
+    print("GRANT REPORT PDF BENCHMARK")
+    print("=" * 60)
+
+    # Warm-up: font loading and first-use setup shouldn't count against the first size
+    server.generate_grants_pdf(sample_grants(2), "Benchmark User")
+
+    print(f"\n{'grants':>8} {'pages':>7} {'total ms':>10} {'ms/grant':>10} {'KB':>8}")
+    results = []
+    previous_pages = 0
+    for count in sorted(sizes):
+        grants = sample_grants(count)
+        runs = 3 if count <= 100 else 1
+        best = None
+        for _ in range(runs):
+            start = time.perf_counter()
+            pdf_bytes = server.generate_grants_pdf(grants, "Benchmark User")
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        pages = pdf_bytes.count(b'/Type /Page\n')
+        # A fast but broken build shouldn't pass as a result
+        assert pdf_bytes.startswith(b'%PDF-') and pdf_bytes.rstrip().endswith(b'%%EOF'), "not a complete PDF"
+        assert pages >= max(previous_pages, 1), f"{count} grants rendered on {pages} pages"
+        previous_pages = pages
+        results.append({'grants': count, 'pages': pages, 'seconds': best, 'bytes': len(pdf_bytes)})
+        print(f"{count:>8} {pages:>7} {best * 1000:>10.1f} {best * 1000 / count:>10.2f} {len(pdf_bytes) / 1024:>8.0f}")
+    return results
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10, 100, 1000]
+    benchmark(sizes)
@@ -1,6 +1,5 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, UploadFile, File
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, Request, Response
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from fastapi.staticfiles import StaticFiles
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from typing import Any
@@ -16,17 +15,34 @@ import jwt
 import pandas as pd
 import openai
 import json
-import shutil
 import math
-from contextlib import asynccontextmanager
-from fastapi.responses import FileResponse
+import threading
+import bisect
+import heapq
+import asyncio
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib import colors
 from reportlab.lib.units import inch
+from PIL import Image, ImageOps, UnidentifiedImageError, features
 import io
 import tempfile
+import base64
+import gzip
+import hashlib
+import hmac
+import re
+import mimetypes
+import anyio
+from python_multipart import MultipartParser
+from python_multipart.exceptions import MultipartParseError
+from python_multipart.multipart import parse_options_header
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -39,6 +55,12 @@ COUPONS_CSV = DATA_DIR / 'coupons.csv'
 STARTUPS_CSV = DATA_DIR / 'startups.csv'
 GRANT_TRACKING_CSV = DATA_DIR / 'grant_tracking.csv'
 NOTIFICATIONS_CSV = DATA_DIR / 'notifications.csv'
+GRANT_ID_SEQUENCE_FILE = DATA_DIR / 'grant_id_sequence.txt'
+CHANGE_LOG_CSV = DATA_DIR / 'change_log.csv'
+TRACKING_EVENTS_CSV = DATA_DIR / 'tracking_events.csv'
+NOTIFICATION_ARCHIVE_DIR = DATA_DIR / 'notification_archive'
+UPLOADS_DIR = ROOT_DIR / 'uploads'
+PDF_CACHE_DIR = DATA_DIR / 'pdf_cache'
 
 # CSV Storage Configuration
 USERS_CSV = DATA_DIR / 'users.csv'
@@ -60,11 +82,21 @@ def load_users_df():
     """Load users from CSV file"""
     if USERS_CSV.exists():
         return pd.read_csv(USERS_CSV)
-    return pd.DataFrame(columns=['id', 'name', 'email', 'password', 'tier', 'has_completed_screening', 'created_at', 'profile', 'screening_completed_at', 'upgraded_at', 'coupon_used'])
+    return pd.DataFrame(columns=['id', 'name', 'email', 'password', 'tier', 'has_completed_screening', 'created_at', 'profile', 'screening_completed_at', 'upgraded_at', 'coupon_used', 'registration_source', 'incubation_admin_id'])
 
-def save_users_df(df):
+def save_users_df(df, row_ids=None):
     """Save users to CSV file"""
-    df.to_csv(USERS_CSV, index=False)
+    with track_table_changes('users', df, row_ids=row_ids):
+        df.to_csv(USERS_CSV, index=False)
+
+def update_user_row(user_id: str, values: dict):
+    """Set columns of one user's row, holding the change lock from load to save"""
+    with _change_lock:
+        users_df = load_users_df()
+        user_idx = users_df[users_df['id'] == user_id].index[0]
+        for column, value in values.items():
+            users_df.at[user_idx, column] = value
+        save_users_df(users_df, row_ids=[user_id])
 
 def load_grant_matches_df():
     """Load grant matches from CSV file"""
@@ -87,9 +119,10 @@ def load_startups_df():
         return pd.read_csv(STARTUPS_CSV)
     return pd.DataFrame(columns=['ID', 'Email', 'Password Hash', 'Name', 'Founder Name', 'Entity Type', 'Location', 'Industry', 'Company Size', 'Description', 'Contact Email', 'Contact Phone', 'Stage', 'Revenue', 'Stability', 'Demographic', 'Track Record', 'Past Grant Experience', 'Tier', 'Created At'])
 
-def save_startups_df(df):
+def save_startups_df(df, row_ids=None):
     """Save startups to CSV file"""
-    df.to_csv(STARTUPS_CSV, index=False)
+    with track_table_changes('startups', df, row_ids=row_ids):
+        df.to_csv(STARTUPS_CSV, index=False)
 
 def load_grant_tracking_df():
     """Load grant tracking from CSV file"""
@@ -97,9 +130,23 @@ def load_grant_tracking_df():
         return pd.read_csv(GRANT_TRACKING_CSV)
     return pd.DataFrame(columns=['id', 'user_id', 'startup_id', 'grant_id', 'status', 'progress', 'applied_date', 'approved_date', 'disbursed_date', 'rejected_date', 'disbursed_amount', 'screenshot_path', 'notes', 'created_at', 'updated_at'])
 
-def save_grant_tracking_df(df):
-    """Save grant tracking to CSV file"""
-    df.to_csv(GRANT_TRACKING_CSV, index=False)
+def save_grant_tracking_df(df, events=None, row_ids=None):
+    """Save grant tracking to CSV file, appending the tracking events describing the change in the same save"""
+    with track_table_changes('grant_tracking', df, row_ids=row_ids):
+        df.to_csv(GRANT_TRACKING_CSV, index=False)
+        record_tracking_events(events or [])
+
+def update_tracking_row(tracking_id: str, values: dict) -> bool:
+    """Set columns of one grant tracking row under the change lock, returning False if it no longer exists"""
+    with _change_lock:
+        tracking_df = load_grant_tracking_df()
+        tracking_idx = tracking_df[tracking_df['id'] == tracking_id].index
+        if tracking_idx.empty:
+            return False
+        for column, value in values.items():
+            tracking_df.at[tracking_idx[0], column] = value
+        save_grant_tracking_df(tracking_df, row_ids=[tracking_id])
+        return True
 
 def load_startup_assignments_df():
     """Load startup assignments from CSV file"""
@@ -107,9 +154,10 @@ def load_startup_assignments_df():
         return pd.read_csv(STARTUP_ASSIGNMENTS_CSV)
     return pd.DataFrame(columns=['id', 'startup_id', 'assigned_to_id', 'assigned_to_type', 'assigned_by', 'assigned_at'])
 
-def save_startup_assignments_df(df):
+def save_startup_assignments_df(df, row_ids=None):
     """Save startup assignments to CSV file"""
-    df.to_csv(STARTUP_ASSIGNMENTS_CSV, index=False)
+    with track_table_changes('startup_assignments', df, row_ids=row_ids):
+        df.to_csv(STARTUP_ASSIGNMENTS_CSV, index=False)
 
 def load_notifications_df():
     """Load notifications from CSV file"""
@@ -119,28 +167,385 @@ def load_notifications_df():
         'id', 'to_user_id', 'from_user_id', 'type', 'title', 'message', 'data', 'created_at', 'read'
     ])
 
-def save_notifications_df(df):
-    """Save notifications to CSV file"""
-    df.to_csv(NOTIFICATIONS_CSV, index=False)
+def save_notifications_df(df, archived: bool = False, row_ids=None):
+    """Save notifications to CSV file (archived: the rows this save drops were moved to the archive)"""
+    with track_table_changes('notifications', df, archived=archived, row_ids=row_ids):
+        df.to_csv(NOTIFICATIONS_CSV, index=False)
+
+# ============= CHANGE TRACKING =============
+# Every save_* path diffs the frame it writes against the last saved snapshot of
+# that table. Changes to the change-feed tables are appended to change_log.csv
+# with a monotonically increasing sequence number (served by GET /changes), and
+# all changes are handed to in-process listeners registered with on_table_change.
+# The log only records which row changed (plus the columns /changes filters on);
+# the feed serves rows from the current snapshot. Entries older than the retention
+# window are compacted away, and cursors from before that point must resync.
+# Writers hold _change_lock from load to save, so two read-modify-write cycles can't
+# interleave and the log only records states that were actually written. Saves that
+# touch a few rows pass their keys as row_ids (appends go through append_table_rows),
+# so only those rows are diffed rather than the whole table.
+
+TRACKED_TABLES = {
+    'users': (USERS_CSV, 'id'),
+    'startups': (STARTUPS_CSV, 'ID'),
+    'grants': (GRANTS_CSV, 'Grant ID'),
+    'grant_tracking': (GRANT_TRACKING_CSV, 'id'),
+    'notifications': (NOTIFICATIONS_CSV, 'id'),
+    'startup_assignments': (STARTUP_ASSIGNMENTS_CSV, 'id'),
+}
+CHANGE_FEED_TABLES = ['grants', 'grant_tracking', 'notifications', 'startup_assignments']
+# Columns kept with each log entry so /changes can decide who may see it
+CHANGE_FEED_SCOPE_COLUMNS = {
+    'grants': [],
+    'grant_tracking': ['user_id', 'startup_id'],
+    'notifications': ['to_user_id'],
+    'startup_assignments': ['assigned_to_id', 'startup_id'],
+}
+CHANGE_LOG_COLUMNS = ['seq', 'table', 'row_id', 'op', 'changed_at', 'scope']
+CHANGE_LOG_RETENTION_HOURS = int(os.environ.get('CHANGE_LOG_RETENTION_HOURS', '72'))
+CHANGE_LOG_MAX_ENTRIES = int(os.environ.get('CHANGE_LOG_MAX_ENTRIES', '200000'))
+CHANGE_LOG_COMPACT_INTERVAL_SECONDS = 3600
+
+_change_lock = threading.RLock()
+_table_snapshots = {}
+_table_row_hashes = {}  # table -> (columns, row hashes) of the snapshot
+_table_versions = {table: 0 for table in TRACKED_TABLES}
+_table_listeners = {table: [] for table in TRACKED_TABLES}
+_change_log_entries = None
+_change_log_seqs = []
+_change_log_floor = 0  # highest seq compacted away; cursors below it must resync
+
+def _normalize_table_frame(df, key):
+    """Stringify a table frame (NaN -> '') and index it by its key column"""
+    if df is None or df.empty or key not in df.columns:
+        columns = list(df.columns) if df is not None else [key]
+        return pd.DataFrame(columns=columns, dtype=str)
+    frame = df.astype(object).where(df.notna(), '').astype(str)
+    frame = frame.drop_duplicates(subset=key, keep='last')
+    frame.index = pd.Index(frame[key].values)
+    return frame
+
+def _row_hashes(frame) -> pd.Series:
+    return pd.Series(pd.util.hash_pandas_object(frame, index=False).values, index=frame.index)
+
+def _get_table_snapshot(table):
+    """Return the last saved snapshot of a table, seeding it from disk on first use"""
+    if table not in _table_snapshots:
+        path, key = TRACKED_TABLES[table]
+        df = None
+        if path.exists() and path.stat().st_size > 0:
+            df = pd.read_csv(path, dtype=str, keep_default_na=False, encoding='utf-8')
+        _table_snapshots[table] = _normalize_table_frame(df, key)
+    return _table_snapshots[table]
+
+def _get_snapshot_hashes(table, columns) -> pd.Series:
+    """Row hashes of the snapshot as it would look with the given columns"""
+    cached = _table_row_hashes.get(table)
+    if cached is not None and cached[0].equals(columns):
+        return cached[1]
+    snapshot = _get_table_snapshot(table)
+    if snapshot.columns.equals(columns):
+        hashes = _row_hashes(snapshot)
+        _table_row_hashes[table] = (snapshot.columns, hashes)
+        return hashes
+    # The save adds or drops columns; compare on the new layout
+    return _row_hashes(snapshot.reindex(columns=columns, fill_value=''))
+
+def _change_scope(table, row) -> dict:
+    return {column: (row or {}).get(column, '') for column in CHANGE_FEED_SCOPE_COLUMNS[table]}
+
+def _log_entry(entry) -> dict:
+    """The slim form of a change entry that the change log keeps"""
+    return {
+        'seq': entry['seq'],
+        'table': entry['table'],
+        'row_id': entry['row_id'],
+        # Listeners see archived rows as deletes; the feed tells clients they still exist
+        'op': 'archive' if entry['archived'] else entry['op'],
+        'changed_at': entry['changed_at'],
+        'scope': _change_scope(entry['table'], entry['row'])
+    }
+
+def _load_change_log():
+    """Load change_log.csv into memory once per process"""
+    global _change_log_entries, _change_log_seqs, _change_log_floor
+    if _change_log_entries is not None:
+        return
+    entries = []
+    legacy_format = False
+    if CHANGE_LOG_CSV.exists() and CHANGE_LOG_CSV.stat().st_size > 0:
+        log_df = pd.read_csv(CHANGE_LOG_CSV, dtype=str, keep_default_na=False)
+        # Older logs stored the full row JSON instead of the scope columns
+        legacy_format = 'scope' not in log_df.columns
+        payload_column = 'row' if legacy_format else 'scope'
+        for record in log_df.to_dict('records'):
+            if record['op'] == 'compacted':
+                _change_log_floor = int(record['seq'])
+                continue
+            try:
+                payload = json.loads(record[payload_column]) if record[payload_column] else None
+            except json.JSONDecodeError:
+                payload = None
+            entries.append({
+                'seq': int(record['seq']),
+                'table': record['table'],
+                'row_id': record['row_id'],
+                'op': record['op'],
+                'changed_at': record['changed_at'],
+                'scope': _change_scope(record['table'], payload) if legacy_format else (payload or {})
+            })
+    _change_log_entries = entries
+    _change_log_seqs = [entry['seq'] for entry in entries]
+    if legacy_format:
+        _write_change_log()
+
+def _write_change_log():
+    """Rewrite change_log.csv from memory: a 'compacted' marker at the floor seq, then the retained entries"""
+    marker = [{'seq': _change_log_floor, 'table': '', 'row_id': '', 'op': 'compacted', 'changed_at': '', 'scope': ''}] if _change_log_floor else []
+    log_rows = pd.DataFrame(marker + [
+        dict(entry, scope=json.dumps(entry['scope'])) for entry in _change_log_entries
+    ], columns=CHANGE_LOG_COLUMNS)
+    fd, temp_name = tempfile.mkstemp(dir=DATA_DIR, prefix='.change_log-', suffix='.csv')
+    try:
+        with os.fdopen(fd, 'w', newline='') as temp_file:
+            log_rows.to_csv(temp_file, index=False)
+        os.replace(temp_name, CHANGE_LOG_CSV)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+def _publish_table_changes(table, changes):
+    """Bump the table version, persist feed entries and notify listeners"""
+    if not changes:
+        return
+    _table_versions[table] += 1
+
+    if table in CHANGE_FEED_TABLES:
+        _load_change_log()
+        next_seq = (_change_log_seqs[-1] if _change_log_seqs else _change_log_floor) + 1
+        log_entries = []
+        for entry in changes:
+            entry['seq'] = next_seq
+            next_seq += 1
+            log_entries.append(_log_entry(entry))
+        _change_log_entries.extend(log_entries)
+        _change_log_seqs.extend(entry['seq'] for entry in log_entries)
+
+        log_rows = pd.DataFrame([
+            dict(entry, scope=json.dumps(entry['scope'])) for entry in log_entries
+        ], columns=CHANGE_LOG_COLUMNS)
+        write_header = not CHANGE_LOG_CSV.exists() or CHANGE_LOG_CSV.stat().st_size == 0
+        log_rows.to_csv(CHANGE_LOG_CSV, mode='a', header=write_header, index=False)
+
+    for listener in _table_listeners[table]:
+        try:
+            listener(changes)
+        except Exception as e:
+            logging.error(f"Change listener {listener.__name__} failed for {table}: {e}")
+
+def _build_change_entries(table, op, frame, ids, previous=None):
+    changed_at = datetime.now(timezone.utc).isoformat()
+    rows = frame.loc[ids].to_dict('records') if len(ids) else []
+    previous_rows = previous.loc[ids].to_dict('records') if previous is not None and len(ids) else [None] * len(rows)
+    return [{
+        'seq': None,
+        'table': table,
+        'row_id': str(row_id),
+        'op': op,
+        'changed_at': changed_at,
+        'row': row,
+        'previous': previous_row,
+        'archived': False
+    } for row_id, row, previous_row in zip(ids, rows, previous_rows)]
+
+def _patch_snapshot(snapshot, hashes, current, current_hashes, inserted, updated, deleted):
+    """Apply a row-level save to a table snapshot and its row hashes"""
+    if len(updated):
+        snapshot.loc[updated] = current.loc[updated]
+        hashes.loc[updated] = current_hashes.loc[updated]
+    if len(deleted):
+        snapshot, hashes = snapshot.drop(deleted), hashes.drop(deleted)
+    if len(inserted):
+        snapshot = pd.concat([snapshot, current.loc[inserted]])
+        hashes = pd.concat([hashes, current_hashes.loc[inserted]])
+    return snapshot, hashes
+
+@contextmanager
+def track_table_changes(table, df, archived: bool = False, row_ids=None):
+    """Diff a table save against the last snapshot and record the changes
+    
+    archived: rows missing from df were moved to an archive rather than deleted
+    row_ids: keys of the only rows this save inserts, updates or deletes; every other
+    row is taken as unchanged, so a single-row save doesn't normalize and hash the table
+    """
+    _, key = TRACKED_TABLES[table]
+    saved_df = df
+    if row_ids is not None and df is not None and key in df.columns:
+        row_ids = pd.Index([str(row_id) for row_id in row_ids]).unique()
+        df = df[df[key].astype(str).isin(row_ids)]
+    else:
+        row_ids = None
+    # Normalizing and hashing the new rows are the expensive steps and don't touch
+    # shared state, so they run before taking the lock; the snapshot's row hashes are
+    # kept from its own save, so only the new rows are hashed
+    current = _normalize_table_frame(df, key)
+    current_hashes = _row_hashes(current)
+    with _change_lock:
+        yield
+        
+        snapshot = _get_table_snapshot(table)
+        if row_ids is not None and not snapshot.columns.equals(current.columns):
+            # The save adds or drops columns, which touches every row
+            row_ids = None
+            current = _normalize_table_frame(saved_df, key)
+            current_hashes = _row_hashes(current)
+        previous_hashes = _get_snapshot_hashes(table, current.columns)
+        if row_ids is None:
+            previous = snapshot.reindex(columns=current.columns, fill_value='')
+        else:
+            present = snapshot.index.intersection(row_ids, sort=False)
+            previous = snapshot.loc[present]
+            previous_hashes = previous_hashes.loc[present]
+        inserted = current.index.difference(previous.index, sort=False)
+        deleted = previous.index.difference(current.index, sort=False)
+        common = current.index.intersection(previous.index, sort=False)
+        updated = common
+        if len(common):
+            updated = common[current_hashes.reindex(common).values != previous_hashes.reindex(common).values]
+
+        removals = _build_change_entries(table, 'delete', previous, deleted, previous)
+        for entry in removals:
+            entry['archived'] = archived
+        changes = (
+            _build_change_entries(table, 'insert', current, inserted)
+            + _build_change_entries(table, 'update', current, updated, previous)
+            + removals
+        )
+        if row_ids is None:
+            _table_snapshots[table] = current
+            _table_row_hashes[table] = (current.columns, current_hashes)
+        else:
+            snapshot, hashes = _patch_snapshot(snapshot, _table_row_hashes[table][1], current, current_hashes, inserted, updated, deleted)
+            _table_snapshots[table] = snapshot
+            _table_row_hashes[table] = (snapshot.columns, hashes)
+        _publish_table_changes(table, changes)
+
+@contextmanager
+def track_table_appends(table, rows_df):
+    """Record rows appended to a table without diffing the whole table"""
+    _, key = TRACKED_TABLES[table]
+    new_rows = _normalize_table_frame(rows_df, key)
+    with _change_lock:
+        snapshot = _get_table_snapshot(table)
+        yield
+
+        kept = ~snapshot.index.isin(new_rows.index)
+        _table_snapshots[table] = pd.concat([snapshot[kept], new_rows])
+        cached = _table_row_hashes.pop(table, None)
+        if cached is not None and cached[0].equals(new_rows.columns):
+            _table_row_hashes[table] = (cached[0], pd.concat([cached[1][kept], _row_hashes(new_rows)]))
+        _publish_table_changes(table, _build_change_entries(table, 'insert', new_rows, new_rows.index))
+
+def append_table_rows(table, rows_df, load_df, save_df):
+    """Append rows to a tracked table's CSV in one write instead of rewriting the table
+    
+    Falls back to load_df + save_df when the file is missing or the rows bring new columns.
+    """
+    path, _ = TRACKED_TABLES[table]
+    with _change_lock:
+        if path.exists() and path.stat().st_size > 0:
+            columns = pd.read_csv(path, nrows=0).columns
+            if set(rows_df.columns).issubset(columns):
+                rows_df = rows_df.reindex(columns=columns)
+                with track_table_appends(table, rows_df):
+                    rows_df.to_csv(path, mode='a', header=False, index=False)
+                return
+        save_df(pd.concat([load_df(), rows_df], ignore_index=True))
+
+def on_table_change(*tables):
+    """Register a listener called with the change entries of each save to the given tables"""
+    def decorator(listener):
+        for table in tables:
+            _table_listeners[table].append(listener)
+        return listener
+    return decorator
+
+def get_table_version(*tables):
+    """Return a tuple that changes whenever any of the given tables is saved with changes"""
+    return tuple(_table_versions[table] for table in tables)
+
+def read_change_log(since: int, limit: int):
+    """Return change-log entries with seq > since (at most limit), whether more remain, the latest seq and the compaction floor
+    
+    Each entry carries `row`: the row's current snapshot, or None if it no longer exists.
+    """
+    with _change_lock:
+        _load_change_log()
+        latest_seq = _change_log_seqs[-1] if _change_log_seqs else _change_log_floor
+        if since < _change_log_floor:
+            return [], False, latest_seq, _change_log_floor
+        start = bisect.bisect_right(_change_log_seqs, since)
+        entries = _change_log_entries[start:start + limit]
+        has_more = start + limit < len(_change_log_entries)
+        
+        ids_by_table = {}
+        for entry in entries:
+            ids_by_table.setdefault(entry['table'], set()).add(entry['row_id'])
+        rows_by_table = {}
+        for table, ids in ids_by_table.items():
+            snapshot = _get_table_snapshot(table)
+            rows_by_table[table] = snapshot.loc[snapshot.index.intersection(list(ids))].to_dict('index')
+        entries = [dict(entry, row=rows_by_table[entry['table']].get(entry['row_id'])) for entry in entries]
+    return entries, has_more, latest_seq, _change_log_floor
+
+def compact_change_log(retention_hours: int = CHANGE_LOG_RETENTION_HOURS, max_entries: int = CHANGE_LOG_MAX_ENTRIES) -> dict:
+    """Drop change-log entries older than retention_hours (and beyond the newest max_entries)"""
+    global _change_log_entries, _change_log_seqs, _change_log_floor
+    cutoff = (datetime.now(timezone.utc) - timedelta(hours=retention_hours)).isoformat()
+    with _change_lock:
+        _load_change_log()
+        keep_from = 0
+        while keep_from < len(_change_log_entries) and _change_log_entries[keep_from]['changed_at'] < cutoff:
+            keep_from += 1
+        keep_from = max(keep_from, len(_change_log_entries) - max_entries)
+        if keep_from == 0:
+            return {"removed": 0, "floor": _change_log_floor}
+        
+        _change_log_floor = _change_log_seqs[keep_from - 1]
+        _change_log_entries = _change_log_entries[keep_from:]
+        _change_log_seqs = _change_log_seqs[keep_from:]
+        _write_change_log()
+    logging.info(f"Compacted {keep_from} change log entries (floor seq {_change_log_floor})")
+    return {"removed": keep_from, "floor": _change_log_floor}
+
+async def run_change_log_compactor():
+    """Background task that compacts the change log on a fixed schedule"""
+    while True:
+        try:
+            await asyncio.to_thread(compact_change_log)
+        except Exception as e:
+            logging.error(f"Error compacting change log: {e}")
+        await asyncio.sleep(CHANGE_LOG_COMPACT_INTERVAL_SECONDS)
 
 def sync_user_tier_to_startup(user_email: str, new_tier: str):
     """Sync user tier from users.csv to startups.csv - ensures both files stay in sync"""
     try:
-        startups_df = load_startups_df()
-        if not startups_df.empty:
-            # Update tier in startups.csv for matching email (case-insensitive)
-            startup_idx = startups_df[startups_df['Email'].str.lower() == user_email.lower()].index
-            if not startup_idx.empty:
-                # Use the exact column name from the CSV
-                for idx in startup_idx:
-                    startups_df.at[idx, 'Tier'] = new_tier
-                    print(f"✅ Syncing tier '{new_tier}' for {user_email} in startups.csv (row {idx})")
-                save_startups_df(startups_df)
-                print(f"✅ Successfully synced tier '{new_tier}' for {user_email} in startups.csv")
+        with _change_lock:
+            startups_df = load_startups_df()
+            if not startups_df.empty:
+                # Update tier in startups.csv for matching email (case-insensitive)
+                startup_idx = startups_df[email_matches(startups_df['Email'], user_email)].index
+                if not startup_idx.empty:
+                    # Use the exact column name from the CSV
+                    for idx in startup_idx:
+                        startups_df.at[idx, 'Tier'] = new_tier
+                        print(f"✅ Syncing tier '{new_tier}' for {user_email} in startups.csv (row {idx})")
+                    save_startups_df(startups_df, row_ids=startups_df.loc[startup_idx, 'ID'])
+                    print(f"✅ Successfully synced tier '{new_tier}' for {user_email} in startups.csv")
+                else:
+                    print(f"⚠️ No startup found with email {user_email} in startups.csv")
             else:
-                print(f"⚠️ No startup found with email {user_email} in startups.csv")
-        else:
-            print(f"⚠️ Startups CSV is empty")
+                print(f"⚠️ Startups CSV is empty")
     except Exception as e:
         print(f"❌ Error syncing tier to startup: {e}")
         import traceback
@@ -149,14 +554,15 @@ def sync_user_tier_to_startup(user_email: str, new_tier: str):
 def sync_startup_tier_to_user(user_email: str, new_tier: str):
     """Sync startup tier from startups.csv to users.csv"""
     try:
-        users_df = load_users_df()
-        if not users_df.empty:
-            # Update tier in users.csv for matching email
-            user_idx = users_df[users_df['email'] == user_email].index
-            if not user_idx.empty:
-                users_df.at[user_idx[0], 'tier'] = new_tier
-                save_users_df(users_df)
-                print(f"✅ Synced tier '{new_tier}' for {user_email} in users.csv")
+        with _change_lock:
+            users_df = load_users_df()
+            if not users_df.empty:
+                # Update tier in users.csv for matching email
+                user_idx = users_df[email_matches(users_df['email'], user_email)].index
+                if not user_idx.empty:
+                    users_df.at[user_idx[0], 'tier'] = new_tier
+                    save_users_df(users_df, row_ids=[users_df.at[user_idx[0], 'id']])
+                    print(f"✅ Synced tier '{new_tier}' for {user_email} in users.csv")
     except Exception as e:
         print(f"❌ Error syncing tier to user: {e}")
 
@@ -194,8 +600,29 @@ def generate_link_code():
     import string
     return ''.join(secrets.choice(string.ascii_uppercase + string.digits) for _ in range(8))
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run data migrations and start background tasks before the app serves requests"""
+    backfill_registration_columns()
+    seed_tracking_events()
+    migrate_uploads_to_content_store()
+    # Build the read indexes now rather than on the first request
+    get_notification_index()
+    get_kpi_counters()
+    get_tracking_read_model()
+    background_tasks = [
+        asyncio.create_task(run_kpi_reconciler()),
+        asyncio.create_task(run_stats_refresher()),
+        asyncio.create_task(run_notification_sweeper()),
+        asyncio.create_task(run_upload_collector()),
+        asyncio.create_task(run_change_log_compactor())
+    ]
+    yield
+    for task in background_tasks:
+        task.cancel()
+
 # Create the main app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 api_router = APIRouter(prefix="/api")
 security = HTTPBearer()
 
@@ -219,10 +646,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Mount static files directory for serving uploaded screenshots
-uploads_dir = ROOT_DIR / "uploads"
-uploads_dir.mkdir(exist_ok=True)  # Ensure directory exists
-app.mount("/backend/uploads", StaticFiles(directory=str(uploads_dir)), name="uploads")
+# Uploaded photos and screenshots are served by serve_upload under /backend/uploads
+UPLOADS_DIR.mkdir(exist_ok=True)  # Ensure directory exists
 
 # Models
 class UserRegister(BaseModel):
@@ -320,6 +745,24 @@ class GrantTrackingUpdate(BaseModel):
     screenshot_path: Optional[str] = None
     notes: Optional[str] = None
 
+class NotificationBulkRequest(BaseModel):
+    ids: Optional[List[str]] = None
+    all_before: Optional[str] = None  # ISO timestamp; selects notifications created at or before it
+
+class NotificationRecipientSelector(BaseModel):
+    # Recipients are the union of every selector given
+    user_ids: Optional[List[str]] = None
+    tiers: Optional[List[str]] = None
+    analysts_of_startup: Optional[str] = None  # venture analysts assigned to this startup
+    startups_of_incubator: Optional[str] = None  # startups assigned to or registered through this incubation admin
+
+class NotificationFanoutRequest(BaseModel):
+    recipients: NotificationRecipientSelector
+    type: str = 'generic'
+    title: str
+    message: str
+    data: Optional[dict] = None
+
 class VentureAnalystProfileUpdate(BaseModel):
     name: Optional[str] = None
     photo_url: Optional[str] = None
@@ -451,6 +894,12 @@ def clean_for_json(obj):
         # Convert to string as fallback
         return str(obj)
 
+def frame_to_records(df, fill=None) -> List[dict]:
+    """Convert a DataFrame to a list of dicts of native Python values, replacing NaN with fill"""
+    names = list(df.columns)
+    columns = [df[name].astype(object).where(df[name].notna(), fill).tolist() for name in names]
+    return [dict(zip(names, values)) for values in zip(*columns)]
+
 def hash_password(password: str) -> str:
     return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
 
@@ -514,7 +963,8 @@ def load_grants_df():
 
 def save_grants_df(df):
     """Save grants to CSV file"""
-    df.to_csv(GRANTS_CSV, index=False, encoding='utf-8', quoting=1)
+    with track_table_changes('grants', df):
+        df.to_csv(GRANTS_CSV, index=False, encoding='utf-8', quoting=1)
 
 def load_soft_approvals():
     """Load soft approved grant IDs - returns normalized IDs for comparison"""
@@ -551,6 +1001,109 @@ def is_soft_approved(grant_id, soft_approval_ids):
     grant_id_str = str(grant_id).strip()
     return grant_id_str in soft_approval_ids
 
+# ============= GRANT CREATION SERVICE =============
+
+# Guards the grant ID sequence and the appends that follow an allocation
+_grant_id_lock = threading.Lock()
+
+def _catalog_max_grant_id() -> int:
+    """Highest numeric Grant ID in grants.csv (0 if there is none)"""
+    if not GRANTS_CSV.exists() or GRANTS_CSV.stat().st_size == 0:
+        return 0
+    ids_df = pd.read_csv(GRANTS_CSV, usecols=lambda column: column == 'Grant ID', dtype=str, encoding='utf-8', quoting=1)
+    if 'Grant ID' not in ids_df.columns:
+        return 0
+    numeric_ids = pd.to_numeric(ids_df['Grant ID'], errors='coerce').dropna()
+    return int(numeric_ids.max()) if not numeric_ids.empty else 0
+
+def _next_grant_id() -> int:
+    """Allocate the next numeric grant ID from the persisted sequence (caller holds _grant_id_lock)"""
+    last_id = 0
+    if GRANT_ID_SEQUENCE_FILE.exists():
+        try:
+            last_id = int(GRANT_ID_SEQUENCE_FILE.read_text().strip())
+        except ValueError:
+            last_id = 0
+    
+    # Grants added to the catalog outside create_grant (imports, hand edits) don't
+    # advance the sequence, so never allocate at or below the catalog's highest ID
+    next_id = max(last_id, _catalog_max_grant_id()) + 1
+    temp_path = GRANT_ID_SEQUENCE_FILE.with_suffix('.tmp')
+    temp_path.write_text(str(next_id))
+    os.replace(temp_path, GRANT_ID_SEQUENCE_FILE)
+    return next_id
+
+def append_grant_row(grant: dict):
+    """Append a single grant to grants.csv without rewriting the catalog"""
+    with _change_lock:
+        if GRANTS_CSV.exists() and GRANTS_CSV.stat().st_size > 0:
+            columns = pd.read_csv(GRANTS_CSV, nrows=0, dtype=str, encoding='utf-8', quoting=1).columns
+            if set(grant).issubset(columns):
+                row_df = pd.DataFrame([grant]).reindex(columns=columns)
+                with track_table_appends('grants', row_df):
+                    row_df.to_csv(GRANTS_CSV, mode='a', header=False, index=False, encoding='utf-8', quoting=1)
+                return
+        # Missing file or new columns - fall back to a full rewrite
+        grants_df = pd.concat([load_grants_df(), pd.DataFrame([grant])], ignore_index=True)
+        save_grants_df(grants_df)
+
+def register_soft_approval(grant_id: str):
+    """Append a grant ID to soft_approval.csv"""
+    if SOFT_APPROVAL_CSV.exists() and SOFT_APPROVAL_CSV.stat().st_size > 0:
+        columns = pd.read_csv(SOFT_APPROVAL_CSV, nrows=0).columns
+        if list(columns) == ['grant_id']:
+            pd.DataFrame([{'grant_id': grant_id}]).to_csv(SOFT_APPROVAL_CSV, mode='a', header=False, index=False)
+            return
+    # Legacy or missing file - rewrite it in the normalized single-column format
+    soft_approvals_df = pd.DataFrame(load_soft_approvals(), columns=['grant_id'])
+    soft_approvals_df = pd.concat([soft_approvals_df, pd.DataFrame([{'grant_id': grant_id}])], ignore_index=True)
+    soft_approvals_df.to_csv(SOFT_APPROVAL_CSV, index=False)
+
+def create_grant(request: CreateGrantRequest) -> str:
+    """Create a grant: allocate its ID, append it to the catalog and register soft approval"""
+    sector_value = request.sector
+    if request.sector == 'Other' and request.sector_other:
+        sector_value = request.sector_other
+
+    with _grant_id_lock:
+        new_grant_id = str(_next_grant_id())
+        new_grant = {
+            'Grant ID': new_grant_id,
+            'Name': request.name,
+            'Sector(s)': sector_value,
+            'Eligibility Criteria': request.eligibility,
+            'Funding Amount': request.funding_amount,
+            'Funding Type': request.funding_type,
+            'Funding Ratio': request.funding_ratio,
+            'Application Link': request.application_link,
+            'Documents Required': request.documents_required,
+            'Due Date': request.deadline,
+            'Region/Focus': request.region_focus,
+            'Contact Info': request.contact_info,
+            'Place': request.place,
+            'Created At': datetime.now(timezone.utc).strftime('%Y-%m-%d'),
+            'Soft Approval': request.soft_approval,
+            'Stage of Startup': request.stage,
+            'Sector Focus': request.sector_focus,
+            'Gender Focus': request.gender_focus,
+            'Innovation Type': request.innovation_type,
+            'TRL': request.trl,
+            'Impact Criteria': request.impact_criteria,
+            'Co-investment Requirement': request.co_investment_requirement,
+            'Matching Investment': request.matching_investment,
+            'Repayment Terms': request.repayment_terms,
+            'Disbursement Schedule': request.disbursement_schedule,
+            'Mentorship/Training': request.mentorship_training,
+            'Program Duration': request.program_duration,
+            'Success Metrics': request.success_metrics
+        }
+        append_grant_row(new_grant)
+
+        if request.soft_approval == "Yes":
+            register_soft_approval(new_grant_id)
+
+    return new_grant_id
+
 async def ai_match_grants(profile: dict) -> List[Dict]:
     """Use OpenAI to match and rank grants"""
     grants_df = load_grants_df()
@@ -710,14 +1263,7 @@ async def root():
     return {"message": "MyProBuddy API v1.0", "status": "active"}
 
 @api_router.post("/auth/register")
-async def register(user: UserRegister):
-    # Load existing users
-    users_df = load_users_df()
-    
-    # Check if user exists
-    if not users_df.empty and user.email in users_df['email'].values:
-        raise HTTPException(status_code=400, detail="Email already registered")
-    
+def register(user: UserRegister):
     # Create new user
     user_id = str(uuid.uuid4())
     new_user = {
@@ -734,12 +1280,15 @@ async def register(user: UserRegister):
         "coupon_used": ""
     }
     
-    # Add new user to dataframe
-    new_user_df = pd.DataFrame([new_user])
-    users_df = pd.concat([users_df, new_user_df], ignore_index=True)
-    
-    # Save to CSV
-    save_users_df(users_df)
+    # Check and append under the change lock so two registrations can't both pass the check
+    with _change_lock:
+        users_df = load_users_df()
+        
+        # Check if user exists
+        if not users_df.empty and user.email in users_df['email'].values:
+            raise HTTPException(status_code=400, detail="Email already registered")
+        
+        append_table_rows('users', pd.DataFrame([new_user]), load_users_df, save_users_df)
     
     return {
         "message": "Registration successful",
@@ -747,7 +1296,7 @@ async def register(user: UserRegister):
     }
 
 @api_router.post("/auth/login")
-async def login(credentials: UserLogin):
+def login(credentials: UserLogin):
     # Load users from CSV
     users_df = load_users_df()
     user_row = users_df[users_df['email'] == credentials.email]
@@ -811,21 +1360,22 @@ async def get_me(user: dict = Depends(get_current_user)):
     }
 
 @api_router.put("/auth/profile")
-async def update_profile(profile_data: VentureAnalystProfileUpdate, user: dict = Depends(get_current_user)):
+def update_profile(profile_data: VentureAnalystProfileUpdate, user: dict = Depends(get_current_user)):
     """Update user profile (name, photo_url, calendly_link)"""
     try:
-        users_df = load_users_df()
-        user_idx = users_df[users_df['id'] == user['id']].index[0]
-        
-        # Update fields if provided
-        if profile_data.name is not None:
-            users_df.at[user_idx, 'name'] = profile_data.name
-        if profile_data.photo_url is not None:
-            users_df.at[user_idx, 'photo_url'] = profile_data.photo_url
-        if profile_data.calendly_link is not None:
-            users_df.at[user_idx, 'calendly_link'] = profile_data.calendly_link
-        
-        save_users_df(users_df)
+        with _change_lock:
+            users_df = load_users_df()
+            user_idx = users_df[users_df['id'] == user['id']].index[0]
+            
+            # Update fields if provided
+            if profile_data.name is not None:
+                users_df.at[user_idx, 'name'] = profile_data.name
+            if profile_data.photo_url is not None:
+                users_df.at[user_idx, 'photo_url'] = profile_data.photo_url
+            if profile_data.calendly_link is not None:
+                users_df.at[user_idx, 'calendly_link'] = profile_data.calendly_link
+            
+            save_users_df(users_df, row_ids=[user['id']])
         
         # Return updated user data
         updated_user = users_df.loc[user_idx]
@@ -845,43 +1395,680 @@ async def update_profile(profile_data: VentureAnalystProfileUpdate, user: dict =
         logging.error(f"Error updating profile: {e}")
         raise HTTPException(status_code=500, detail="Failed to update profile")
 
+# ============= UPLOAD SERVICE =============
+# Upload endpoints parse the multipart body themselves as it arrives instead of
+# letting Starlette spool it to disk first: a declared Content-Length over the
+# kind's limit is rejected before anything is read, and the limit is checked again
+# on every received chunk, so an oversized upload is cut off as soon as it crosses
+# it. File data is written in chunks on a worker thread, so uploads never block
+# the event loop. Each upload kind has its own size limit and accepted image types
+# (checked against the file's magic bytes, not its name). Files are content-addressed:
+# the data is hashed on the way to a temp file, then fsynced and atomically renamed
+# to <kind>/<h[0:2]>/<h[2:4]>/<sha256>.<ext>. An identical upload reuses the stored file.
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+# Room for the multipart boundaries and part headers around the file itself
+UPLOAD_FORM_OVERHEAD = 64 * 1024
+
+# Serializes reusing/creating a stored file with the garbage collector deleting it
+_upload_store_lock = threading.Lock()
+UPLOAD_POLICIES = {
+    'profile_photos': {'max_bytes': 5 * 1024 * 1024, 'types': ['jpeg', 'png', 'gif', 'webp']},
+    'screenshots': {'max_bytes': 10 * 1024 * 1024, 'types': ['jpeg', 'png', 'gif', 'webp']},
+}
+IMAGE_EXTENSIONS = {'jpeg': 'jpg', 'png': 'png', 'gif': 'gif', 'webp': 'webp'}
+
+def detect_image_type(header: bytes) -> Optional[str]:
+    """Identify an image from its leading bytes"""
+    if header.startswith(b'\xff\xd8\xff'):
+        return 'jpeg'
+    if header.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'png'
+    if header[:6] in (b'GIF87a', b'GIF89a'):
+        return 'gif'
+    if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+        return 'webp'
+    return None
+
+def _fsync_directory(directory: Path):
+    # Makes the rename durable; directories can't be opened for fsync on Windows
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def content_store_path(kind: str, digest: str, extension: str) -> str:
+    return f"{kind}/{digest[0:2]}/{digest[2:4]}/{digest}.{extension}"
+
+def upload_too_large(policy) -> HTTPException:
+    return HTTPException(status_code=413, detail=f"File too large. Maximum size is {policy['max_bytes'] // (1024 * 1024)} MB.")
+
+class UploadWriter:
+    """Hash and write one upload into a temp file, then move it into the content-addressed store
+    
+    All methods block on disk I/O - call them off the event loop.
+    """
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.policy = UPLOAD_POLICIES[kind]
+        kind_dir = UPLOADS_DIR / kind
+        kind_dir.mkdir(parents=True, exist_ok=True)
+        fd, self.temp_name = tempfile.mkstemp(dir=kind_dir, prefix='.upload-', suffix='.part')
+        self.temp_file = os.fdopen(fd, 'wb')
+        self.image_type = None
+        self.size = 0
+        self.digest = hashlib.sha256()
+
+    def write(self, chunk: bytes):
+        if self.image_type is None:
+            self.image_type = detect_image_type(chunk)
+            if self.image_type not in self.policy['types']:
+                raise HTTPException(status_code=400, detail="Invalid file type. Only images are allowed.")
+        self.size += len(chunk)
+        if self.size > self.policy['max_bytes']:
+            raise upload_too_large(self.policy)
+        self.digest.update(chunk)
+        self.temp_file.write(chunk)
+
+    def commit(self) -> str:
+        """Store the written file and return its path relative to UPLOADS_DIR"""
+        if self.size == 0:
+            raise HTTPException(status_code=400, detail="Empty file")
+
+        stored_path = content_store_path(self.kind, self.digest.hexdigest(), IMAGE_EXTENSIONS[self.image_type])
+        target = UPLOADS_DIR / stored_path
+        with _upload_store_lock:
+            duplicate = target.exists()
+            if duplicate:
+                # Restart the garbage collector's grace period before the new reference is saved
+                os.utime(target)
+        if duplicate:
+            self.abort()
+            return stored_path
+
+        self.temp_file.flush()
+        os.fsync(self.temp_file.fileno())
+        self.temp_file.close()
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with _upload_store_lock:
+            os.replace(self.temp_name, target)
+        _fsync_directory(target.parent)
+        return stored_path
+
+    def abort(self):
+        self.temp_file.close()
+        Path(self.temp_name).unlink(missing_ok=True)
+
+def store_upload(source, kind: str) -> str:
+    """Copy a file object into the content-addressed store and return its path relative to UPLOADS_DIR
+    
+    Blocking - call it off the event loop.
+    """
+    writer = UploadWriter(kind)
+    try:
+        while chunk := source.read(UPLOAD_CHUNK_SIZE):
+            writer.write(chunk)
+        return writer.commit()
+    except BaseException:
+        writer.abort()
+        raise
+
+async def receive_upload(request: Request, kind: str, field: str = 'file') -> str:
+    """Stream the `field` file part of a multipart request into the content store and return its stored path"""
+    policy = UPLOAD_POLICIES[kind]
+    body_limit = policy['max_bytes'] + UPLOAD_FORM_OVERHEAD
+    declared_length = request.headers.get('content-length', '')
+    if declared_length.isdigit() and int(declared_length) > body_limit:
+        raise upload_too_large(policy)
+
+    content_type, params = parse_options_header(request.headers.get('content-type', ''))
+    if content_type != b'multipart/form-data' or not params.get(b'boundary'):
+        raise HTTPException(status_code=400, detail="Expected a multipart/form-data upload")
+
+    # Parser callbacks only collect the target part's data; it is written after each parser.write
+    part = {'headers': {}, 'header_field': b'', 'header_value': b'', 'in_file': False, 'complete': False}
+    received = []
+
+    def on_part_begin():
+        part['headers'] = {}
+
+    def on_header_field(data, start, end):
+        part['header_field'] += data[start:end]
+
+    def on_header_value(data, start, end):
+        part['header_value'] += data[start:end]
+
+    def on_header_end():
+        part['headers'][part['header_field'].lower()] = part['header_value']
+        part['header_field'] = part['header_value'] = b''
+
+    def on_headers_finished():
+        _, options = parse_options_header(part['headers'].get(b'content-disposition', b''))
+        # Only the first part named `field` is stored; anything else is skipped
+        part['in_file'] = not part['complete'] and options.get(b'name') == field.encode()
+
+    def on_part_data(data, start, end):
+        if part['in_file']:
+            received.append(data[start:end])
+
+    def on_part_end():
+        if part['in_file']:
+            part['in_file'] = False
+            part['complete'] = True
+
+    parser = MultipartParser(params[b'boundary'], {
+        'on_part_begin': on_part_begin,
+        'on_header_field': on_header_field,
+        'on_header_value': on_header_value,
+        'on_header_end': on_header_end,
+        'on_headers_finished': on_headers_finished,
+        'on_part_data': on_part_data,
+        'on_part_end': on_part_end,
+    })
+
+    writer = await asyncio.to_thread(UploadWriter, kind)
+    try:
+        body_size = 0
+        file_size = 0
+        pending = bytearray()
+        async for chunk in request.stream():
+            body_size += len(chunk)
+            if body_size > body_limit:
+                raise upload_too_large(policy)
+            parser.write(chunk)
+            for data in received:
+                file_size += len(data)
+                if file_size > policy['max_bytes']:
+                    raise upload_too_large(policy)
+                pending += data
+            received.clear()
+            if len(pending) >= UPLOAD_CHUNK_SIZE:
+                await asyncio.to_thread(writer.write, bytes(pending))
+                pending.clear()
+        parser.finalize()
+        if not part['complete']:
+            raise HTTPException(status_code=400, detail="No file uploaded")
+        if pending:
+            await asyncio.to_thread(writer.write, bytes(pending))
+        return await asyncio.to_thread(writer.commit)
+    except MultipartParseError:
+        writer.abort()
+        raise HTTPException(status_code=400, detail="Malformed multipart upload")
+    except BaseException:
+        writer.abort()
+        raise
+
+# ============= IMAGE DERIVATIVES =============
+# Uploaded images get downscaled variants (IMAGE_SIZES, longest edge in px) stored
+# next to the original as <name>.<size>.webp (JPEG if Pillow lacks WebP support).
+# They are rendered on a small worker pool right after upload, and on first request
+# (then kept) for files uploaded earlier. Originals are content-addressed and never
+# change, so an existing variant is always current. serve_upload exposes them as
+# /backend/uploads/<path>?size=thumb.
+
+IMAGE_SIZES = {'thumb': 160, 'medium': 800}
+IMAGE_WORKERS = 2
+DERIVATIVE_FORMAT = 'WEBP' if features.check('webp') else 'JPEG'
+DERIVATIVE_EXTENSION = DERIVATIVE_FORMAT.lower().replace('jpeg', 'jpg')
+
+_image_pool = ThreadPoolExecutor(max_workers=IMAGE_WORKERS, thread_name_prefix='image-derivatives')
+_derivative_jobs = {}  # derivative path -> in-flight Future
+_derivative_jobs_lock = threading.Lock()
+
+def derivative_path(original: Path, size: str) -> Path:
+    return original.with_name(f"{original.stem}.{size}.{DERIVATIVE_EXTENSION}")
+
+def render_derivative(original: Path, size: str) -> Path:
+    """Write the given size variant of an image and return its path"""
+    target = derivative_path(original, size)
+    max_edge = IMAGE_SIZES[size]
+    with Image.open(original) as source:
+        source.draft('RGB', (max_edge, max_edge))  # JPEGs decode straight at a reduced scale
+        image = ImageOps.exif_transpose(source)
+        image.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+        has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+        if has_alpha and DERIVATIVE_FORMAT == 'WEBP':
+            image = image.convert('RGBA')
+        elif has_alpha:
+            rgba = image.convert('RGBA')
+            image = Image.new('RGB', rgba.size, 'white')
+            image.paste(rgba, mask=rgba.getchannel('A'))
+        else:
+            image = image.convert('RGB')
+
+        fd, temp_name = tempfile.mkstemp(dir=target.parent, prefix='.derivative-', suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                image.save(temp_file, DERIVATIVE_FORMAT, quality=80)
+            os.replace(temp_name, target)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+    return target
+
+def submit_derivative(original: Path, size: str):
+    """Queue rendering of a size variant, sharing the job with concurrent requests for it"""
+    target = derivative_path(original, size)
+    with _derivative_jobs_lock:
+        job = _derivative_jobs.get(target)
+        if job is None:
+            job = _image_pool.submit(render_derivative, original, size)
+            _derivative_jobs[target] = job
+    # Outside the lock: the callback runs immediately if the job has already finished
+    job.add_done_callback(lambda _: _derivative_jobs.pop(target, None))
+    return job
+
+def _log_derivative_failure(job):
+    if job.exception() is not None:
+        logging.warning(f"Could not render image derivative: {job.exception()}")
+
+def schedule_image_derivatives(stored_path: str):
+    """Render every size variant of a freshly stored upload in the background"""
+    original = UPLOADS_DIR / stored_path
+    for size in IMAGE_SIZES:
+        if not derivative_path(original, size).exists():
+            submit_derivative(original, size).add_done_callback(_log_derivative_failure)
+
+async def image_variant(original: Path, size: str) -> Path:
+    """Return the size variant of an image, rendering it first if missing"""
+    target = derivative_path(original, size)
+    if target.exists():
+        return target
+    return await asyncio.wrap_future(submit_derivative(original, size))
+
+# ============= UPLOAD REFERENCES =============
+# users.photo_url and grant_tracking.screenshot_path are the only references to
+# stored uploads. A reference count per stored path is kept current by a change
+# listener; the garbage collector deletes uploads (and their image variants) nobody
+# references once they are older than UPLOAD_GC_MIN_AGE_SECONDS, which covers the
+# gap between storing a file and saving the row that points at it. That age can't be
+# set below UPLOAD_GC_MIN_AGE_FLOOR_SECONDS, and each deletion re-checks the file's
+# references and age while holding the change lock (so no row save is in progress)
+# and the upload store lock (so no upload is reusing the file at that moment).
+
+UPLOAD_REFERENCE_COLUMNS = {'users': 'photo_url', 'grant_tracking': 'screenshot_path'}
+UPLOAD_URL_PREFIXES = ['/backend/uploads/', 'backend/uploads/']
+UPLOAD_GC_MIN_AGE_SECONDS = 3600
+UPLOAD_GC_MIN_AGE_FLOOR_SECONDS = 600
+UPLOAD_GC_INTERVAL_SECONDS = 24 * 3600
+CONTENT_ADDRESSED_PATTERN = re.compile(r'^[a-z_]+/[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}\.\w+$')
+DERIVATIVE_NAME_PATTERN = re.compile(rf'^(.+)\.({"|".join(IMAGE_SIZES)})\.{DERIVATIVE_EXTENSION}$')
+
+_upload_refcounts = None
+
+def upload_reference(value) -> Optional[str]:
+    """Return the path relative to UPLOADS_DIR that a photo_url / screenshot_path value points at"""
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return None
+    text = str(value).replace('\\', '/')
+    for prefix in UPLOAD_URL_PREFIXES:
+        if text.startswith(prefix):
+            return text[len(prefix):]
+    return None
+
+def get_upload_refcounts() -> Counter:
+    """Return stored path -> number of rows referencing it, building it from the snapshots on first use"""
+    global _upload_refcounts
+    with _change_lock:
+        if _upload_refcounts is None:
+            counts = Counter()
+            for table, column in UPLOAD_REFERENCE_COLUMNS.items():
+                snapshot = _get_table_snapshot(table)
+                if column in snapshot.columns:
+                    counts.update(filter(None, map(upload_reference, snapshot[column])))
+            _upload_refcounts = counts
+        return _upload_refcounts
+
+@on_table_change('users', 'grant_tracking')
+def _update_upload_refcounts(changes):
+    if _upload_refcounts is None:
+        return
+    for entry in changes:
+        column = UPLOAD_REFERENCE_COLUMNS[entry['table']]
+        if entry['op'] != 'insert':
+            previous = upload_reference((entry['previous'] or {}).get(column))
+            if previous:
+                _upload_refcounts[previous] -= 1
+                if _upload_refcounts[previous] <= 0:
+                    del _upload_refcounts[previous]
+        if entry['op'] != 'delete':
+            current = upload_reference(entry['row'].get(column))
+            if current:
+                _upload_refcounts[current] += 1
+
+def migrate_uploads_to_content_store() -> int:
+    """Re-store uploads still referenced by their legacy {id}_{timestamp} names and repoint the rows"""
+    migrated = {}
+
+    def relocate(value):
+        reference = upload_reference(value)
+        if not reference or CONTENT_ADDRESSED_PATTERN.match(reference):
+            return value
+        if reference not in migrated:
+            kind = reference.split('/')[0]
+            source = UPLOADS_DIR / reference
+            migrated[reference] = None
+            if kind in UPLOAD_POLICIES and source.is_file():
+                try:
+                    with open(source, 'rb') as source_file:
+                        migrated[reference] = store_upload(source_file, kind)
+                except HTTPException as e:
+                    logging.warning(f"Leaving {reference} in place: {e.detail}")
+        if migrated[reference] is None:
+            return value
+        prefix = next(prefix for prefix in UPLOAD_URL_PREFIXES if str(value).replace('\\', '/').startswith(prefix))
+        return prefix + migrated[reference]
+
+    updated = 0
+    for load, save, column in [
+        (load_users_df, save_users_df, 'photo_url'),
+        (load_grant_tracking_df, save_grant_tracking_df, 'screenshot_path'),
+    ]:
+        df = load()
+        if column not in df.columns:
+            continue
+        relocated = df[column].map(relocate)
+        changed = relocated.ne(df[column]) & relocated.notna()
+        if changed.any():
+            df[column] = relocated
+            save(df)
+            updated += int(changed.sum())
+    if updated:
+        logging.info(f"Moved {updated} upload references into the content-addressed store")
+    return updated
+
+def collect_orphaned_uploads(min_age_seconds: int = UPLOAD_GC_MIN_AGE_SECONDS) -> dict:
+    """Delete unreferenced uploads older than min_age_seconds (at least UPLOAD_GC_MIN_AGE_FLOOR_SECONDS), with their image variants"""
+    cutoff = time.time() - max(min_age_seconds, UPLOAD_GC_MIN_AGE_FLOOR_SECONDS)
+    with _change_lock:
+        refcounts = dict(get_upload_refcounts())
+    removed = 0
+    freed_bytes = 0
+
+    def remove(path: Path):
+        nonlocal removed, freed_bytes
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except FileNotFoundError:
+            return
+        removed += 1
+        freed_bytes += size
+
+    for kind in UPLOAD_POLICIES:
+        for directory, _, filenames in os.walk(UPLOADS_DIR / kind):
+            directory = Path(directory)
+            originals = {Path(name).stem for name in filenames if not DERIVATIVE_NAME_PATTERN.match(name)}
+            for name in filenames:
+                path = directory / name
+                derivative = DERIVATIVE_NAME_PATTERN.match(name)
+                if derivative:
+                    # Variants go with their original
+                    if derivative.group(1) not in originals:
+                        remove(path)
+                    continue
+                reference = path.relative_to(UPLOADS_DIR).as_posix()
+                if refcounts.get(reference) or path.stat().st_mtime > cutoff:
+                    continue
+                # The scan above used a copy of the counts; confirm against the live ones
+                with _change_lock, _upload_store_lock:
+                    try:
+                        still_orphaned = not get_upload_refcounts().get(reference) and path.stat().st_mtime <= cutoff
+                    except FileNotFoundError:
+                        continue
+                    if still_orphaned:
+                        remove(path)
+                if still_orphaned:
+                    for size in IMAGE_SIZES:
+                        remove(derivative_path(path, size))
+    if removed:
+        logging.info(f"Upload GC removed {removed} files ({freed_bytes} bytes)")
+    return {"removed": removed, "freed_bytes": freed_bytes}
+
+async def run_upload_collector():
+    """Background task that deletes orphaned uploads on a fixed schedule"""
+    while True:
+        try:
+            await asyncio.to_thread(collect_orphaned_uploads)
+        except Exception as e:
+            logging.error(f"Error collecting orphaned uploads: {e}")
+        await asyncio.sleep(UPLOAD_GC_INTERVAL_SECONDS)
+
+# ============= UPLOAD SERVING =============
+# serve_upload handles /backend/uploads. Content-addressed files and their image
+# variants never change, so their hash is a strong ETag and they are cacheable for a
+# year as immutable; other files (logos, legacy names) must revalidate. A single byte
+# Range is honoured, a precompressed .br / .gz sibling is sent when the client accepts
+# it, and screenshots are only served to users who can see a tracking entry using them.
+# <img> tags and links can't send the Authorization header, so tracking responses carry
+# a signed screenshot_url instead: an HMAC over one path and an expiry, rounded to the
+# hour so the URL (and the browser's cached copy) stays the same between polls.
+
+UPLOAD_IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+SIGNED_UPLOAD_URL_TTL_SECONDS = 3600
+PRECOMPRESSED_ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+PROTECTED_UPLOAD_KINDS = ['screenshots']
+CONTENT_HASH_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+_uploads_root = UPLOADS_DIR.resolve()
+_screenshot_owners = {}
+
+def _upload_stem(reference: str) -> str:
+    """Stored path without extension, shared by an upload and its image variants"""
+    path = Path(reference)
+    derivative = DERIVATIVE_NAME_PATTERN.match(path.name)
+    return (path.parent / (derivative.group(1) if derivative else path.stem)).as_posix()
+
+def get_screenshot_owners() -> Dict[str, list]:
+    """Map screenshot stem -> (analyst user_id, startup_id) of the tracking rows using it, cached per version"""
+    with _change_lock:
+        version = get_table_version('grant_tracking')
+        if _screenshot_owners.get('version') != version:
+            tracking = _get_table_snapshot('grant_tracking')
+            owners = {}
+            if {'screenshot_path', 'user_id', 'startup_id'}.issubset(tracking.columns):
+                for path, user_id, startup_id in zip(tracking['screenshot_path'], tracking['user_id'], tracking['startup_id']):
+                    reference = upload_reference(path)
+                    if reference:
+                        owners.setdefault(_upload_stem(reference), []).append((user_id, startup_id))
+            _screenshot_owners.update(version=version, owners=owners)
+        return _screenshot_owners['owners']
+
+def screenshot_visible_to(reference: str, user: dict) -> bool:
+    """Apply the grant tracking visibility rules of the change feed to the rows using a screenshot"""
+    tier = user.get('tier')
+    if tier == 'admin':
+        return True
+    user_id = str(user['id'])
+    owners = get_screenshot_owners().get(_upload_stem(reference), [])
+    if tier == 'venture_analyst':
+        return any(analyst_id == user_id for analyst_id, _ in owners)
+    if tier == 'incubation_admin':
+        assigned = get_recipient_index()['startups_by_assignee'].get(user_id, set())
+        return any(startup_id in assigned for _, startup_id in owners)
+    # Startups own tracking rows through the startups.csv entry sharing their email
+    joined = get_startup_user_join()
+    own_startup_ids = set(joined.loc[joined['user_id'] == user_id, 'ID'].astype(str)) | {user_id}
+    return any(startup_id in own_startup_ids for _, startup_id in owners)
+
+def _upload_signature(reference: str, expires: int) -> str:
+    return hmac.new(f"upload:{JWT_SECRET}".encode(), f"{reference}:{expires}".encode(), hashlib.sha256).hexdigest()
+
+def signed_upload_url(stored_path) -> Optional[str]:
+    """URL of an upload (any ?size= variant) that is valid for one to two TTLs without other credentials"""
+    reference = upload_reference(stored_path)
+    if not reference:
+        return None
+    expires = (int(time.time()) // SIGNED_UPLOAD_URL_TTL_SECONDS + 2) * SIGNED_UPLOAD_URL_TTL_SECONDS
+    return f"/backend/uploads/{reference}?expires={expires}&sig={_upload_signature(reference, expires)}"
+
+def upload_signature_valid(reference: str, expires: Optional[str], sig: Optional[str]) -> bool:
+    if not expires or not sig or not expires.isdigit() or int(expires) < time.time():
+        return False
+    return hmac.compare_digest(sig, _upload_signature(reference, int(expires)))
+
+def parse_byte_range(header: str, size: int) -> Optional[tuple]:
+    """Parse a single-range 'bytes=' header into inclusive (start, end)
+    
+    Returns None for headers to ignore (multiple ranges, malformed) and raises
+    ValueError when the range can't be satisfied.
+    """
+    unit, _, spec = header.partition('=')
+    if unit.strip().lower() != 'bytes' or ',' in spec:
+        return None
+    start_text, separator, end_text = spec.strip().partition('-')
+    if not separator or not (start_text + end_text).isdigit():
+        return None
+    if not start_text:
+        # Suffix range: the last N bytes
+        if int(end_text) == 0 or size == 0:
+            raise ValueError("Empty suffix range")
+        return max(0, size - int(end_text)), size - 1
+    start = int(start_text)
+    end = int(end_text) if end_text else size - 1
+    if end_text and start > end:
+        return None
+    if start >= size:
+        raise ValueError("Range starts past the end of the file")
+    return start, min(end, size - 1)
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+    return '*' in tags or etag in tags
+
+def _accepted_encodings(request: Request) -> set:
+    return {part.split(';')[0].strip().lower() for part in request.headers.get('accept-encoding', '').split(',')}
+
+async def _read_file_range(path: Path, start: int, length: int):
+    async with await anyio.open_file(path, 'rb') as file:
+        await file.seek(start)
+        while length > 0:
+            chunk = await file.read(min(UPLOAD_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+def upload_response(request: Request, path: Path, private: bool) -> Response:
+    """Build the response for a stored file with validators, caching, encoding and Range handling"""
+    stat_result = path.stat()
+    name_stem = path.name.rsplit('.', 1)[0]  # <sha256> or <sha256>.<size> for stored files
+    if CONTENT_HASH_PATTERN.match(name_stem.split('.')[0]):
+        etag = f'"{name_stem}"'
+        cache_control = f"{'private' if private else 'public'}, max-age={UPLOAD_IMMUTABLE_MAX_AGE}, immutable"
+    else:
+        etag_base = f"{stat_result.st_mtime}-{stat_result.st_size}"
+        etag = f'"{hashlib.md5(etag_base.encode(), usedforsecurity=False).hexdigest()}"'
+        cache_control = 'private, no-cache' if private else 'no-cache'
+    media_type = mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+    headers = {'Accept-Ranges': 'bytes', 'Cache-Control': cache_control, 'Vary': 'Accept-Encoding'}
+
+    accepted = _accepted_encodings(request)
+    for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+        encoded_path = path.with_name(path.name + suffix)
+        if encoding in accepted and encoded_path.is_file():
+            path, stat_result = encoded_path, encoded_path.stat()
+            etag = f'{etag[:-1]}-{encoding}"'
+            headers['Content-Encoding'] = encoding
+            break
+    headers['ETag'] = etag
+
+    if _etag_matches(request.headers.get('if-none-match'), etag):
+        return Response(status_code=304, headers=headers)
+
+    range_header = request.headers.get('range')
+    # Ranges address the identity bytes, and If-Range asks for the whole file if it changed
+    if (range_header and request.method == 'GET' and 'Content-Encoding' not in headers
+            and request.headers.get('if-range', etag) == etag):
+        size = stat_result.st_size
+        try:
+            byte_range = parse_byte_range(range_header, size)
+        except ValueError:
+            return Response(status_code=416, headers={**headers, 'Content-Range': f"bytes */{size}"})
+        if byte_range:
+            start, end = byte_range
+            headers['Content-Range'] = f"bytes {start}-{end}/{size}"
+            headers['Content-Length'] = str(end - start + 1)
+            return StreamingResponse(_read_file_range(path, start, end - start + 1), status_code=206, headers=headers, media_type=media_type)
+
+    return FileResponse(path, headers=headers, media_type=media_type, stat_result=stat_result)
+
+async def user_from_authorization(request: Request) -> dict:
+    """Authenticate from the Authorization header, for routes that also accept other credentials"""
+    authorization = request.headers.get('Authorization', '')
+    if not authorization.lower().startswith('bearer '):
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    return await get_current_user(HTTPAuthorizationCredentials(scheme='Bearer', credentials=authorization[7:]))
+
+@app.api_route("/backend/uploads/{file_path:path}", methods=["GET", "HEAD"], include_in_schema=False)
+async def serve_upload(
+    file_path: str,
+    request: Request,
+    size: Optional[str] = None,
+    expires: Optional[str] = None,
+    sig: Optional[str] = None
+):
+    """Serve an uploaded file, or a downscaled variant of an image with ?size=thumb|medium
+    
+    - expires / sig: from signed_upload_url, for screenshot requests from <img> / links,
+      which can't set an Authorization header
+    """
+    # Hidden names are in-progress temp files
+    if any(part.startswith('.') for part in Path(file_path).parts):
+        raise HTTPException(status_code=404, detail="Not Found")
+    original = (UPLOADS_DIR / file_path).resolve()
+    if not original.is_relative_to(_uploads_root) or not original.is_file():
+        raise HTTPException(status_code=404, detail="Not Found")
+    reference = original.relative_to(_uploads_root).as_posix()
+
+    protected = reference.split('/')[0] in PROTECTED_UPLOAD_KINDS
+    if protected and not upload_signature_valid(reference, expires, sig):
+        user = await user_from_authorization(request)
+        if not await asyncio.to_thread(screenshot_visible_to, reference, user):
+            raise HTTPException(status_code=403, detail="Access denied")
+
+    path = original
+    if size is not None:
+        if size not in IMAGE_SIZES:
+            raise HTTPException(status_code=400, detail=f"Unknown size. Use one of: {', '.join(IMAGE_SIZES)}")
+        try:
+            path = await image_variant(original, size)
+        except (UnidentifiedImageError, OSError) as e:
+            # Not an image Pillow can decode - serve it as is
+            logging.warning(f"No {size} variant for {reference}: {e}")
+    response = upload_response(request, path, private=protected)
+    if protected:
+        # Keep the signed URL out of Referer headers sent from the opened file
+        response.headers['Referrer-Policy'] = 'no-referrer'
+    return response
+
 @api_router.post("/auth/upload-photo")
-async def upload_profile_photo(file: UploadFile = File(...), user: dict = Depends(get_current_user)):
-    """Upload profile photo for user"""
+async def upload_profile_photo(request: Request, user: dict = Depends(get_current_user)):
+    """Upload profile photo for user (multipart field `file`)"""
     try:
-        # Create uploads directory for profile photos
-        upload_dir = "backend/uploads/profile_photos"
-        os.makedirs(upload_dir, exist_ok=True)
-        
-        # Validate file type
-        allowed_extensions = ['jpg', 'jpeg', 'png', 'gif', 'webp']
-        file_extension = file.filename.split('.')[-1].lower() if '.' in file.filename else ''
-        
-        if file_extension not in allowed_extensions:
-            raise HTTPException(status_code=400, detail="Invalid file type. Only images are allowed.")
-        
-        # Generate unique filename
-        filename = f"{user['id']}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{file_extension}"
-        file_path = os.path.join(upload_dir, filename)
-        
-        # Save file
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        # Save file (type and size are validated while the body streams in)
+        stored_path = await receive_upload(request, 'profile_photos')
+        schedule_image_derivatives(stored_path)
         
         # Generate URL path for frontend
-        photo_url = f"/backend/uploads/profile_photos/{filename}"
+        photo_url = f"/backend/uploads/{stored_path}"
         
         # Update user's photo_url in database
-        users_df = load_users_df()
-        user_idx = users_df[users_df['id'] == user['id']].index[0]
-        users_df.at[user_idx, 'photo_url'] = photo_url
-        save_users_df(users_df)
+        await asyncio.to_thread(update_user_row, user['id'], {'photo_url': photo_url})
         
         return {
             "message": "Photo uploaded successfully",
             "photo_url": photo_url
         }
     
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"Error uploading photo: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to upload photo: {str(e)}")
@@ -931,7 +2118,7 @@ async def get_complete_profile(user: dict = Depends(get_current_user)):
         # Get startup data - simplified approach
         startup_data = None
         if not startups_df.empty:
-            user_startup = startups_df[startups_df['Email'] == user['email']]
+            user_startup = startups_df[email_matches(startups_df['Email'], user['email'])]
             if not user_startup.empty:
                 startup_row = user_startup.iloc[0]
                 startup_data = {
@@ -1006,6 +2193,408 @@ async def get_complete_profile(user: dict = Depends(get_current_user)):
         logging.error(f"Error getting complete profile: {e}")
         raise HTTPException(status_code=500, detail="Failed to get profile data")
 
+# ============= NOTIFICATION STREAM =============
+# GET /notifications/stream is a Server-Sent Events channel. Every notification
+# inserted into notifications.csv (by send_notification or any other producer) is
+# published to the recipient's open streams by a change listener, so clients no
+# longer need to poll /notifications/my.
+# EventSource can't set headers, so browsers first POST /notifications/stream-ticket
+# for a one-minute, stream-only ticket and pass that in the URL instead of the JWT.
+
+NOTIFICATION_STREAM_KEEPALIVE_SECONDS = 15
+NOTIFICATION_STREAM_QUEUE_SIZE = 100
+NOTIFICATION_STREAM_TICKET_TTL_SECONDS = 60
+NOTIFICATION_STREAM_TICKET_AUDIENCE = 'notification-stream'
+
+_notification_subscribers = {}  # to_user_id -> set of (event loop, queue)
+_notification_subscribers_lock = threading.Lock()
+
+def notification_record(row) -> dict:
+    """Shape a stored notification row (parsed or as CSV strings) for API responses"""
+    data = row.get('data')
+    read = row.get('read')
+    return {
+        'id': str(row['id']),
+        'type': str(row['type']),
+        'title': str(row['title']),
+        'message': str(row['message']),
+        'data': json.loads(data) if pd.notna(data) and str(data).strip() else {},
+        'created_at': str(row['created_at']),
+        'read': str(read).strip().lower() in ['true', '1', '1.0'] if pd.notna(read) else False,
+    }
+
+def subscribe_notifications(user_id: str):
+    """Register a queue that receives the user's new notifications on the running event loop"""
+    subscriber = (asyncio.get_running_loop(), asyncio.Queue(maxsize=NOTIFICATION_STREAM_QUEUE_SIZE))
+    with _notification_subscribers_lock:
+        _notification_subscribers.setdefault(user_id, set()).add(subscriber)
+    return subscriber
+
+def unsubscribe_notifications(user_id: str, subscriber):
+    with _notification_subscribers_lock:
+        subscribers = _notification_subscribers.get(user_id, set())
+        subscribers.discard(subscriber)
+        if not subscribers:
+            _notification_subscribers.pop(user_id, None)
+
+def _deliver_notification(queue, record):
+    try:
+        queue.put_nowait(record)
+    except asyncio.QueueFull:
+        # A stalled client misses live events; it catches up via Last-Event-ID on reconnect
+        logging.warning(f"Dropping notification {record['id']} for a slow stream subscriber")
+
+@on_table_change('notifications')
+def _publish_new_notifications(changes):
+    """Push inserted notifications to the recipient's open streams"""
+    for entry in changes:
+        if entry['op'] != 'insert':
+            continue
+        with _notification_subscribers_lock:
+            subscribers = list(_notification_subscribers.get(entry['row'].get('to_user_id', ''), ()))
+        if not subscribers:
+            continue
+        record = notification_record(entry['row'])
+        for loop, queue in subscribers:
+            # Saves may run on worker threads, so hand the event to the subscriber's loop
+            loop.call_soon_threadsafe(_deliver_notification, queue, record)
+
+def notifications_after(user_id: str, last_event_id: str) -> List[dict]:
+    """Notifications for the user created after the one with id last_event_id (oldest first)"""
+    with _change_lock:
+        index = get_notification_index()
+        indexed = index['rows'].get(last_event_id)
+        if indexed is None or indexed[0]['to_user_id'] != user_id:
+            return []
+        keys = index['by_user'].get(user_id, [])
+        start = bisect.bisect_right(keys, (indexed[1], last_event_id))
+        rows = [dict(index['rows'][notification_id][0]) for _, notification_id in keys[start:]]
+    return [notification_record(row) for row in rows]
+
+def format_sse(record: dict) -> str:
+    return f"id: {record['id']}\nevent: notification\ndata: {json.dumps(record)}\n\n"
+
+def create_stream_ticket(user_id: str) -> str:
+    """Short-lived token that can only open the notification stream"""
+    payload = {
+        'user_id': user_id,
+        'aud': NOTIFICATION_STREAM_TICKET_AUDIENCE,
+        'exp': datetime.now(timezone.utc) + timedelta(seconds=NOTIFICATION_STREAM_TICKET_TTL_SECONDS)
+    }
+    return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
+
+async def user_from_stream_ticket(ticket: str) -> dict:
+    try:
+        payload = jwt.decode(ticket, JWT_SECRET, algorithms=[JWT_ALGORITHM], audience=NOTIFICATION_STREAM_TICKET_AUDIENCE)
+    except jwt.PyJWTError:
+        raise HTTPException(status_code=401, detail="Invalid or expired stream ticket")
+    users_df = await asyncio.to_thread(load_users_df)
+    if users_df[users_df['id'] == payload['user_id']].empty:
+        raise HTTPException(status_code=401, detail="User not found")
+    return {"id": payload['user_id']}
+
+@api_router.post("/notifications/stream-ticket")
+async def issue_stream_ticket(current_user: dict = Depends(get_current_user)):
+    """Issue a ticket for opening /notifications/stream from an EventSource"""
+    return {
+        "ticket": create_stream_ticket(str(current_user['id'])),
+        "expires_in": NOTIFICATION_STREAM_TICKET_TTL_SECONDS
+    }
+
+@api_router.get("/notifications/stream")
+async def stream_notifications(request: Request, ticket: Optional[str] = None, last_event_id: Optional[str] = None):
+    """Server-Sent Events stream of the current user's new notifications
+    
+    - ticket: from POST /notifications/stream-ticket, for clients that cannot set an
+      Authorization header (EventSource)
+    - last_event_id (or the Last-Event-ID header): replay notifications received after it
+    """
+    user = await user_from_stream_ticket(ticket) if ticket else await user_from_authorization(request)
+    user_id = str(user['id'])
+    last_event_id = last_event_id or request.headers.get('Last-Event-ID')
+    
+    # Subscribe before reading the replay so nothing persisted in between is missed
+    subscriber = subscribe_notifications(user_id)
+    try:
+        replay = await asyncio.to_thread(notifications_after, user_id, last_event_id) if last_event_id else []
+    except Exception:
+        unsubscribe_notifications(user_id, subscriber)
+        raise
+    
+    async def event_stream():
+        _, queue = subscriber
+        sent_ids = set()
+        try:
+            yield "retry: 3000\n\n"
+            for record in replay:
+                sent_ids.add(record['id'])
+                yield format_sse(record)
+            while not await request.is_disconnected():
+                try:
+                    record = await asyncio.wait_for(queue.get(), timeout=NOTIFICATION_STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if record['id'] not in sent_ids:
+                    yield format_sse(record)
+        finally:
+            unsubscribe_notifications(user_id, subscriber)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "Referrer-Policy": "no-referrer"}
+    )
+
+# ============= NOTIFICATION INBOX INDEX =============
+# Per-recipient index over notifications.csv, kept current by a change listener.
+# Each recipient has (created_at, id) keys sorted oldest first for all and for unread
+# notifications, so inbox pages and unread counts never scan the whole table.
+
+NOTIFICATION_PAGE_MAX_LIMIT = 200
+
+_notification_index = None
+
+def _notification_is_read(row) -> bool:
+    return str(row.get('read', '')).strip().lower() in ['true', '1', '1.0']
+
+def _index_notification(index, row, sort_key):
+    key = (sort_key, row['id'])
+    index['rows'][row['id']] = (row, sort_key)
+    bisect.insort(index['by_user'].setdefault(row['to_user_id'], []), key)
+    if not _notification_is_read(row):
+        bisect.insort(index['unread_by_user'].setdefault(row['to_user_id'], []), key)
+
+def _unindex_notification(index, notification_id):
+    indexed = index['rows'].pop(notification_id, None)
+    if indexed is None:
+        return
+    row, sort_key = indexed
+    key = (sort_key, notification_id)
+    for keys in [index['by_user'].get(row['to_user_id'], []), index['unread_by_user'].get(row['to_user_id'], [])]:
+        position = bisect.bisect_left(keys, key)
+        if position < len(keys) and keys[position] == key:
+            del keys[position]
+
+def get_notification_index() -> dict:
+    """Return the per-recipient notification index, building it from notifications.csv on first use"""
+    global _notification_index
+    with _change_lock:
+        if _notification_index is None:
+            index = {'rows': {}, 'by_user': {}, 'unread_by_user': {}}
+            snapshot = _get_table_snapshot('notifications')
+            if not snapshot.empty:
+                sort_keys = created_at_sort_keys(snapshot['created_at']).tolist()
+                for row, sort_key in zip(snapshot.to_dict('records'), sort_keys):
+                    _index_notification(index, row, sort_key)
+            _notification_index = index
+        return _notification_index
+
+@on_table_change('notifications')
+def _update_notification_index(changes):
+    index = _notification_index
+    if index is None:
+        return
+    # Parse all created_at values at once; a fan-out inserts thousands of rows in one save
+    live = [entry for entry in changes if entry['op'] != 'delete']
+    sort_keys = created_at_sort_keys(pd.Series([entry['row'].get('created_at', '') for entry in live], dtype=object)).tolist()
+    for entry in changes:
+        _unindex_notification(index, entry['row_id'])
+    for entry, sort_key in zip(live, sort_keys):
+        _index_notification(index, entry['row'], sort_key)
+
+def read_notification_page(user_id: str, limit: int, cursor_position=None, unread_only: bool = False) -> tuple:
+    """Return (rows newest first, next cursor position) for one recipient"""
+    with _change_lock:
+        index = get_notification_index()
+        keys = (index['unread_by_user'] if unread_only else index['by_user']).get(user_id, [])
+        end = bisect.bisect_left(keys, cursor_position) if cursor_position else len(keys)
+        start = max(0, end - limit)
+        page_keys = keys[start:end][::-1]
+        rows = [dict(index['rows'][notification_id][0]) for _, notification_id in page_keys]
+        next_position = page_keys[-1] if start > 0 else None
+        return rows, next_position
+
+def unread_notification_count(user_id: str) -> int:
+    with _change_lock:
+        return len(get_notification_index()['unread_by_user'].get(user_id, []))
+
+def read_notification_inbox(user_id: str, limit: int, cursor_position=None, unread_only: bool = False) -> tuple:
+    """Return (rows newest first, next cursor position, unread count) read under one lock"""
+    with _change_lock:
+        rows, next_position = read_notification_page(user_id, limit, cursor_position, unread_only)
+        return rows, next_position, unread_notification_count(user_id)
+
+# ============= NOTIFICATION RETENTION =============
+# Read notifications older than NOTIFICATION_RETENTION_DAYS are moved out of
+# notifications.csv into gzip-compressed monthly partitions
+# (notification_archive/notifications-YYYY-MM.csv.gz). Unread notifications are never
+# archived. A background task sweeps every NOTIFICATION_SWEEP_INTERVAL_SECONDS and
+# admins can sweep on demand; archived notifications are served by /notifications/history.
+
+NOTIFICATION_RETENTION_DAYS = int(os.environ.get('NOTIFICATION_RETENTION_DAYS', '30'))
+NOTIFICATION_SWEEP_INTERVAL_SECONDS = 3600
+NOTIFICATION_ARCHIVE_COLUMNS = ['id', 'to_user_id', 'from_user_id', 'type', 'title', 'message', 'data', 'created_at', 'read']
+
+_notification_sweep_lock = threading.Lock()
+_archive_partition_cache = {}  # path -> (mtime, frame sorted newest first)
+
+def notification_archive_path(month: str) -> Path:
+    return NOTIFICATION_ARCHIVE_DIR / f"notifications-{month}.csv.gz"
+
+def sweep_notifications(retention_days: int = NOTIFICATION_RETENTION_DAYS) -> dict:
+    """Move read notifications older than retention_days into the monthly archive partitions"""
+    # Holding the change lock from load to save means a concurrent save can't be lost:
+    # it either lands before our load or re-adds archived rows, which a later sweep re-archives
+    with _notification_sweep_lock, _change_lock:
+        notifications_df = load_notifications_df()
+        if notifications_df.empty:
+            return {"archived": 0, "partitions": []}
+        
+        cutoff = pd.Timestamp.now(tz='UTC') - pd.Timedelta(days=retention_days)
+        created_at = parse_utc_dates(notifications_df['created_at'])
+        is_read = notifications_df['read'].astype(str).str.strip().str.lower().isin(['true', '1', '1.0'])
+        expired = is_read & created_at.notna() & (created_at < cutoff)
+        if not expired.any():
+            return {"archived": 0, "partitions": []}
+        
+        # Append to the archive before trimming the hot table: a crash in between
+        # leaves duplicates (ignored by history reads) rather than losing rows
+        NOTIFICATION_ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
+        archived = notifications_df[expired].reindex(columns=NOTIFICATION_ARCHIVE_COLUMNS)
+        months = created_at[expired].dt.strftime('%Y-%m')
+        for month, rows in archived.groupby(months.values):
+            path = notification_archive_path(month)
+            write_header = not path.exists()
+            # gzip members can be concatenated, so each sweep appends a new member
+            with gzip.open(path, 'at', encoding='utf-8', newline='') as handle:
+                rows.to_csv(handle, header=write_header, index=False)
+        
+        save_notifications_df(notifications_df[~expired], archived=True)
+        partitions = sorted(set(months))
+        logging.info(f"Archived {int(expired.sum())} notifications into {len(partitions)} partitions")
+        return {"archived": int(expired.sum()), "partitions": partitions}
+
+async def run_notification_sweeper():
+    """Background task that archives expired notifications on a fixed schedule"""
+    while True:
+        try:
+            await asyncio.to_thread(sweep_notifications)
+        except Exception as e:
+            logging.error(f"Error sweeping notifications: {e}")
+        await asyncio.sleep(NOTIFICATION_SWEEP_INTERVAL_SECONDS)
+
+def load_archive_partition(path: Path) -> pd.DataFrame:
+    """Load one archive partition (deduplicated, newest first with sort keys), cached until it changes"""
+    mtime = path.stat().st_mtime
+    cached = _archive_partition_cache.get(path)
+    if cached is None or cached[0] != mtime:
+        frame = pd.read_csv(path, dtype=str, keep_default_na=False, compression='gzip')
+        frame = frame.drop_duplicates('id', keep='last')
+        frame = frame.assign(_sort_key=created_at_sort_keys(frame['created_at']).values)
+        frame = frame.sort_values(['_sort_key', 'id'], ascending=False, kind='stable')
+        cached = (mtime, frame)
+        _archive_partition_cache[path] = cached
+    return cached[1]
+
+def read_archived_notifications(user_id: str, limit: int, cursor_position=None) -> tuple:
+    """Return (archived rows newest first, next cursor position) for one recipient"""
+    if not NOTIFICATION_ARCHIVE_DIR.exists():
+        return [], None
+    rows = []
+    # Partition names sort chronologically, so walk them newest month first
+    for path in sorted(NOTIFICATION_ARCHIVE_DIR.glob('notifications-*.csv.gz'), reverse=True):
+        frame = load_archive_partition(path)
+        mine = frame[frame['to_user_id'] == user_id]
+        if cursor_position:
+            cursor_key, cursor_id = cursor_position
+            mine = mine[(mine['_sort_key'] < cursor_key) | ((mine['_sort_key'] == cursor_key) & (mine['id'] < cursor_id))]
+        rows.extend(mine.head(limit + 1 - len(rows)).to_dict('records'))
+        if len(rows) > limit:
+            break
+    next_position = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_position = (int(rows[-1]['_sort_key']), rows[-1]['id'])
+    return rows, next_position
+
+# ============= NOTIFICATION FAN-OUT =============
+# POST /notifications/fanout sends one notification to a group of recipients. The
+# selector is resolved against an in-memory recipient index (users by tier, analysts
+# by startup, startups by assignee) rebuilt once per data version, and all rows are
+# appended to notifications.csv in a single write instead of one rewrite per recipient.
+# Only admins may notify arbitrary users; everyone else is limited to the users they
+# share an assignment with, and to a much smaller batch.
+
+NOTIFICATION_FANOUT_MAX_RECIPIENTS = 50000
+NOTIFICATION_FANOUT_MAX_RECIPIENTS_NON_ADMIN = 500
+
+_recipient_index = {}
+
+def _group_ids(frame, by, value) -> Dict[str, set]:
+    if frame.empty or by not in frame.columns or value not in frame.columns:
+        return {}
+    return {key: set(ids) for key, ids in frame.groupby(by, sort=False)[value] if key}
+
+def get_recipient_index() -> dict:
+    """Return recipient lookups built from the users / startup_assignments snapshots"""
+    with _change_lock:
+        version = get_table_version('users', 'startup_assignments')
+        if _recipient_index.get('version') != version:
+            users = _get_table_snapshot('users')
+            assignments = _get_table_snapshot('startup_assignments')
+            if 'assigned_to_type' in assignments.columns:
+                analyst_assignments = assignments[assignments['assigned_to_type'] == 'venture_analyst']
+            else:
+                analyst_assignments = assignments
+            _recipient_index.update({
+                'version': version,
+                'users': set(users.index),
+                'by_tier': _group_ids(users, 'tier', 'id'),
+                'analysts_by_startup': _group_ids(analyst_assignments, 'startup_id', 'assigned_to_id'),
+                'startups_by_assignee': _group_ids(assignments, 'assigned_to_id', 'startup_id'),
+            })
+        return _recipient_index
+
+def resolve_notification_recipients(selector: NotificationRecipientSelector) -> List[str]:
+    """Resolve a recipient selector to the sorted ids of existing users it matches"""
+    index = get_recipient_index()
+    recipients = set(selector.user_ids or [])
+    for tier in selector.tiers or []:
+        recipients |= index['by_tier'].get(tier, set())
+    if selector.analysts_of_startup:
+        recipients |= index['analysts_by_startup'].get(selector.analysts_of_startup, set())
+    if selector.startups_of_incubator:
+        incubator_id = selector.startups_of_incubator
+        recipients |= index['startups_by_assignee'].get(incubator_id, set())
+        links_df = load_incubation_links_df()
+        registration_index = get_registration_index()
+        for link_code in links_df.loc[links_df['incubation_admin_id'] == incubator_id, 'link_code']:
+            recipients |= registration_index.get(link_code, set())
+    return sorted(recipients & index['users'])
+
+def own_notification_recipients(user: dict) -> set:
+    """Users a non-admin may notify: their assigned startups / analysts and startups registered through their links"""
+    return set(resolve_notification_recipients(NotificationRecipientSelector(
+        analysts_of_startup=user['id'],
+        startups_of_incubator=user['id']
+    )))
+
+def check_fanout_selector(selector: NotificationRecipientSelector, user: dict):
+    """Admins may use any selector; other users may only target explicit ids and their own groups"""
+    if user.get('tier') == 'admin':
+        return
+    if selector.tiers:
+        raise HTTPException(status_code=403, detail="Only admins can notify whole tiers")
+    if selector.analysts_of_startup and selector.analysts_of_startup != user['id']:
+        raise HTTPException(status_code=403, detail="Can only notify the analysts of your own startup")
+    if selector.startups_of_incubator and selector.startups_of_incubator != user['id']:
+        raise HTTPException(status_code=403, detail="Can only notify your own incubator's startups")
+
+def append_notification_rows(rows: List[dict]):
+    """Append notifications to notifications.csv in one write without rewriting the table"""
+    append_table_rows('notifications', pd.DataFrame(rows), load_notifications_df, save_notifications_df)
+
 @api_router.post("/notifications/send")
 async def send_notification(notification_data: dict, user: dict = Depends(get_current_user)):
     """Send notification to another user and persist it"""
@@ -1015,7 +2604,6 @@ async def send_notification(notification_data: dict, user: dict = Depends(get_cu
             if field not in notification_data:
                 raise HTTPException(status_code=400, detail=f"Missing field: {field}")
 
-        notifications_df = load_notifications_df()
         notif_id = str(uuid.uuid4())
         created_at = datetime.now(timezone.utc).isoformat()
 
@@ -1031,8 +2619,7 @@ async def send_notification(notification_data: dict, user: dict = Depends(get_cu
             'read': False,
         }
 
-        notifications_df = pd.concat([notifications_df, pd.DataFrame([new_row])], ignore_index=True)
-        save_notifications_df(notifications_df)
+        await asyncio.to_thread(append_notification_rows, [new_row])
 
         logging.info(f"Notification saved: {notif_id} -> {new_row['to_user_id']}")
 
@@ -1046,153 +2633,272 @@ async def send_notification(notification_data: dict, user: dict = Depends(get_cu
         logging.error(f"Error sending notification: {e}")
         raise HTTPException(status_code=500, detail="Failed to send notification")
 
+@api_router.post("/notifications/fanout")
+async def fan_out_notification(request: NotificationFanoutRequest, user: dict = Depends(get_current_user)):
+    """Send one notification to every user matched by the recipient selector"""
+    check_fanout_selector(request.recipients, user)
+    is_admin = user.get('tier') == 'admin'
+    max_recipients = NOTIFICATION_FANOUT_MAX_RECIPIENTS if is_admin else NOTIFICATION_FANOUT_MAX_RECIPIENTS_NON_ADMIN
+    if len(request.recipients.user_ids or []) > max_recipients:
+        raise HTTPException(status_code=400, detail=f"Selector matches more than {max_recipients} recipients")
+    try:
+        recipient_ids = await asyncio.to_thread(resolve_notification_recipients, request.recipients)
+        if not is_admin:
+            own_recipients = await asyncio.to_thread(own_notification_recipients, user)
+            if not own_recipients.issuperset(recipient_ids):
+                raise HTTPException(status_code=403, detail="Can only notify users assigned to you")
+        if len(recipient_ids) > max_recipients:
+            raise HTTPException(status_code=400, detail=f"Selector matches more than {max_recipients} recipients")
+        if not recipient_ids:
+            return {"message": "No recipients matched", "count": 0}
+
+        created_at = datetime.now(timezone.utc).isoformat()
+        data = json.dumps(request.data or {})
+        rows = [{
+            'id': str(uuid.uuid4()),
+            'to_user_id': recipient_id,
+            'from_user_id': str(user['id']),
+            'type': request.type,
+            'title': request.title,
+            'message': request.message,
+            'data': data,
+            'created_at': created_at,
+            'read': False,
+        } for recipient_id in recipient_ids]
+        await asyncio.to_thread(append_notification_rows, rows)
+
+        logging.info(f"Notification fanned out by {user['id']} to {len(rows)} recipients")
+        return {"message": "Notification sent successfully", "count": len(rows)}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(f"Error fanning out notification: {e}")
+        raise HTTPException(status_code=500, detail="Failed to send notification")
+
 @api_router.get("/notifications/my")
-async def list_my_notifications(user: dict = Depends(get_current_user)):
-    """List notifications for the current user"""
+async def list_my_notifications(
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    unread_only: bool = False,
+    user: dict = Depends(get_current_user)
+):
+    """List a page of the current user's notifications, newest first
+    
+    - unread_only: only unread notifications
+    - cursor: the next_cursor value returned by the previous page
+    """
+    limit = max(1, min(limit, NOTIFICATION_PAGE_MAX_LIMIT))
+    cursor_position = decode_page_cursor(cursor) if cursor else None
     try:
-        notifications_df = load_notifications_df()
-        if notifications_df.empty:
-            return {"notifications": []}
-
-        my_notifs = notifications_df[notifications_df['to_user_id'] == str(user['id'])]
-        notifs = []
-        for _, row in my_notifs.sort_values(by='created_at', ascending=False).iterrows():
-            notifs.append({
-                'id': str(row['id']),
-                'type': str(row['type']),
-                'title': str(row['title']),
-                'message': str(row['message']),
-                'data': json.loads(row['data']) if pd.notna(row['data']) and str(row['data']).strip() else {},
-                'created_at': str(row['created_at']),
-                'read': bool(row['read']) if pd.notna(row['read']) else False,
-            })
-        return {"notifications": notifs}
+        # Background saves hold the change lock during CSV I/O, so wait for it off the event loop
+        rows, next_position, unread_count = await asyncio.to_thread(
+            read_notification_inbox, str(user['id']), limit, cursor_position, unread_only
+        )
+        return {
+            "notifications": [notification_record(row) for row in rows],
+            "next_cursor": encode_page_cursor(*next_position) if next_position else None,
+            "unread_count": unread_count
+        }
     except Exception as e:
         logging.error(f"Error listing notifications: {e}")
         raise HTTPException(status_code=500, detail="Failed to list notifications")
 
-@api_router.post("/notifications/{notification_id}/read")
-async def mark_notification_read(notification_id: str, user: dict = Depends(get_current_user)):
-    """Mark a notification as read"""
+@api_router.get("/notifications/history")
+async def list_archived_notifications(limit: int = 50, cursor: Optional[str] = None, user: dict = Depends(get_current_user)):
+    """List a page of the current user's archived notifications, newest first"""
+    limit = max(1, min(limit, NOTIFICATION_PAGE_MAX_LIMIT))
+    cursor_position = decode_page_cursor(cursor) if cursor else None
     try:
-        notifications_df = load_notifications_df()
-        if notifications_df.empty:
-            raise HTTPException(status_code=404, detail="Notification not found")
+        rows, next_position = await asyncio.to_thread(read_archived_notifications, str(user['id']), limit, cursor_position)
+        return {
+            "notifications": [notification_record(row) for row in rows],
+            "next_cursor": encode_page_cursor(*next_position) if next_position else None
+        }
+    except Exception as e:
+        logging.error(f"Error listing archived notifications: {e}")
+        raise HTTPException(status_code=500, detail="Failed to list archived notifications")
 
-        idx = notifications_df[notifications_df['id'] == notification_id].index
-        if idx.empty:
-            raise HTTPException(status_code=404, detail="Notification not found")
+@api_router.get("/notifications/unread-count")
+async def get_unread_notification_count(user: dict = Depends(get_current_user)):
+    """Get the current user's unread notification count"""
+    return {"unread_count": await asyncio.to_thread(unread_notification_count, str(user['id']))}
 
-        # Ensure user owns this notification
-        if str(notifications_df.at[idx[0], 'to_user_id']) != str(user['id']):
+def select_user_notifications(notifications_df, user_id: str, ids: Optional[List[str]] = None, all_before: Optional[str] = None) -> pd.Series:
+    """Mask of the user's notifications matching ids or created at/before all_before
+    
+    Raises 404 if none of the ids exist and 403 if any of them belongs to another user.
+    """
+    owned = notifications_df['to_user_id'].astype(str) == user_id
+    if ids is not None:
+        listed = notifications_df['id'].astype(str).isin(set(ids))
+        if not listed.any():
+            raise HTTPException(status_code=404, detail="Notification not found")
+        # Ensure user owns every listed notification
+        if (listed & ~owned).any():
             raise HTTPException(status_code=403, detail="Not authorized to modify this notification")
+        return listed
+    cutoff = pd.to_datetime(all_before, utc=True, errors='coerce')
+    if pd.isna(cutoff):
+        raise HTTPException(status_code=400, detail="all_before must be an ISO timestamp")
+    return owned & (created_at_sort_keys(notifications_df['created_at']) <= cutoff.value)
+
+def bulk_notification_selection(request: NotificationBulkRequest):
+    """Validate that a bulk request names exactly one of ids / all_before"""
+    if (request.ids is None) == (request.all_before is None):
+        raise HTTPException(status_code=400, detail="Provide either ids or all_before")
+    return request.ids, request.all_before
+
+@api_router.post("/notifications/read")
+def mark_notifications_read(request: NotificationBulkRequest, user: dict = Depends(get_current_user)):
+    """Mark several notifications as read (by ids, or everything created at/before all_before) in one write"""
+    ids, all_before = bulk_notification_selection(request)
+    try:
+        with _change_lock:
+            notifications_df = load_notifications_df()
+            selected = select_user_notifications(notifications_df, str(user['id']), ids, all_before)
+            unread = selected & ~notifications_df['read'].astype(str).str.strip().str.lower().isin(['true', '1', '1.0'])
+            if unread.any():
+                notifications_df['read'] = notifications_df['read'].astype(object)
+                notifications_df.loc[unread, 'read'] = True
+                save_notifications_df(notifications_df, row_ids=notifications_df.loc[unread, 'id'])
+        
+        return {"message": "Notifications marked as read", "updated": int(unread.sum())}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(f"Error marking notifications read: {e}")
+        raise HTTPException(status_code=500, detail="Failed to mark notifications as read")
 
-        notifications_df.at[idx[0], 'read'] = True
-        save_notifications_df(notifications_df)
-
-        return {"message": "Notification marked as read"}
+@api_router.post("/notifications/delete")
+def delete_notifications(request: NotificationBulkRequest, user: dict = Depends(get_current_user)):
+    """Delete several notifications (by ids, or everything created at/before all_before) in one write"""
+    ids, all_before = bulk_notification_selection(request)
+    try:
+        with _change_lock:
+            notifications_df = load_notifications_df()
+            selected = select_user_notifications(notifications_df, str(user['id']), ids, all_before)
+            if selected.any():
+                save_notifications_df(notifications_df[~selected], row_ids=notifications_df.loc[selected, 'id'])
+        
+        return {"message": "Notifications deleted", "deleted": int(selected.sum())}
     except HTTPException:
         raise
     except Exception as e:
-        logging.error(f"Error marking notification read: {e}")
-        raise HTTPException(status_code=500, detail="Failed to mark notification as read")
+        logging.error(f"Error deleting notifications: {e}")
+        raise HTTPException(status_code=500, detail="Failed to delete notifications")
 
-@api_router.post("/screening/submit")
-async def submit_screening(screening_data: GrantScreeningCombined, user: dict = Depends(get_current_user)):
-    # Get profile data
-    profile = screening_data.model_dump()
-    
+@api_router.post("/notifications/{notification_id}/read")
+def mark_notification_read(notification_id: str, user: dict = Depends(get_current_user)):
+    """Mark a notification as read"""
+    mark_notifications_read(NotificationBulkRequest(ids=[notification_id]), user)
+    return {"message": "Notification marked as read"}
+
+def store_screening_profile(user: dict, profile: dict) -> dict:
+    """Merge screening answers into the user's profile and startups.csv row, returning the merged profile"""
     # Update user profile in CSV
-    users_df = load_users_df()
-    user_idx = users_df[users_df['id'] == user['id']].index[0]
-    
-    # Preserve existing profile data (like registration_source for incubation admin links)
-    existing_profile = {}
-    if pd.notna(users_df.at[user_idx, 'profile']) and users_df.at[user_idx, 'profile']:
-        try:
-            existing_profile = json.loads(users_df.at[user_idx, 'profile'])
-        except:
-            pass
-    
-    # Merge screening data with existing profile data, preserving incubation admin info
-    merged_profile = {**existing_profile, **profile}
-    
-    users_df.at[user_idx, 'profile'] = json.dumps(merged_profile)
-    users_df.at[user_idx, 'has_completed_screening'] = True
-    users_df.at[user_idx, 'screening_completed_at'] = datetime.now(timezone.utc).isoformat()
-    save_users_df(users_df)
+    with _change_lock:
+        users_df = load_users_df()
+        user_idx = users_df[users_df['id'] == user['id']].index[0]
+        
+        # Preserve existing profile data (like registration_source for incubation admin links)
+        existing_profile = {}
+        if pd.notna(users_df.at[user_idx, 'profile']) and users_df.at[user_idx, 'profile']:
+            try:
+                existing_profile = json.loads(users_df.at[user_idx, 'profile'])
+            except:
+                pass
+        
+        # Merge screening data with existing profile data, preserving incubation admin info
+        merged_profile = {**existing_profile, **profile}
+        
+        users_df.at[user_idx, 'profile'] = json.dumps(merged_profile)
+        users_df.at[user_idx, 'has_completed_screening'] = True
+        users_df.at[user_idx, 'screening_completed_at'] = datetime.now(timezone.utc).isoformat()
+        save_users_df(users_df, row_ids=[user['id']])
     
     # Store startup data in startups.csv
     try:
-        startups_df = load_startups_df()
-        
-        # Check if startup already exists for this user
-        existing_startup = startups_df[startups_df['Email'] == user['email']]
-        
-        if not existing_startup.empty:
-            # Update existing startup
-            startup_idx = existing_startup.index[0]
-            startups_df.at[startup_idx, 'Name'] = profile['startup_name']
-            startups_df.at[startup_idx, 'Founder Name'] = profile['founder_name']
-            startups_df.at[startup_idx, 'Entity Type'] = profile['entity_type']
-            startups_df.at[startup_idx, 'Location'] = profile['location']
-            startups_df.at[startup_idx, 'Year of Incorporation'] = profile['year_of_incorporation']
-            startups_df.at[startup_idx, 'Industry'] = profile['industry']
-            startups_df.at[startup_idx, 'Company Size'] = profile['company_size']
-            startups_df.at[startup_idx, 'Description'] = profile['description']
-            startups_df.at[startup_idx, 'Contact Email'] = profile['contact_email']
-            startups_df.at[startup_idx, 'Contact Phone'] = profile['contact_phone']
-            # Handle both string and array formats for backward compatibility
-            ownership_type = profile['ownership_type']
-            if isinstance(ownership_type, list):
-                startups_df.at[startup_idx, 'Ownership Type'] = ', '.join(ownership_type)
+        with _change_lock:
+            startups_df = load_startups_df()
+            
+            # Check if startup already exists for this user
+            existing_startup = startups_df[email_matches(startups_df['Email'], user['email'])]
+            
+            if not existing_startup.empty:
+                # Update existing startup
+                startup_idx = existing_startup.index[0]
+                startup_id = startups_df.at[startup_idx, 'ID']
+                startups_df.at[startup_idx, 'Name'] = profile['startup_name']
+                startups_df.at[startup_idx, 'Founder Name'] = profile['founder_name']
+                startups_df.at[startup_idx, 'Entity Type'] = profile['entity_type']
+                startups_df.at[startup_idx, 'Location'] = profile['location']
+                startups_df.at[startup_idx, 'Year of Incorporation'] = profile['year_of_incorporation']
+                startups_df.at[startup_idx, 'Industry'] = profile['industry']
+                startups_df.at[startup_idx, 'Company Size'] = profile['company_size']
+                startups_df.at[startup_idx, 'Description'] = profile['description']
+                startups_df.at[startup_idx, 'Contact Email'] = profile['contact_email']
+                startups_df.at[startup_idx, 'Contact Phone'] = profile['contact_phone']
+                # Handle both string and array formats for backward compatibility
+                ownership_type = profile['ownership_type']
+                if isinstance(ownership_type, list):
+                    startups_df.at[startup_idx, 'Ownership Type'] = ', '.join(ownership_type)
+                else:
+                    startups_df.at[startup_idx, 'Ownership Type'] = ownership_type
+                startups_df.at[startup_idx, 'Funding Need'] = profile['funding_need']
+                startups_df.at[startup_idx, 'Stage'] = profile['stage']
+                startups_df.at[startup_idx, 'Revenue'] = profile['revenue']
+                startups_df.at[startup_idx, 'Stability'] = profile['stability']
+                startups_df.at[startup_idx, 'Demographic'] = profile['demographic']
+                startups_df.at[startup_idx, 'Track Record'] = profile['track_record']
+                startups_df.at[startup_idx, 'Past Grant Experience'] = profile['past_grant_experience']
+                startups_df.at[startup_idx, 'Tier'] = user['tier']
             else:
-                startups_df.at[startup_idx, 'Ownership Type'] = ownership_type
-            startups_df.at[startup_idx, 'Funding Need'] = profile['funding_need']
-            startups_df.at[startup_idx, 'Stage'] = profile['stage']
-            startups_df.at[startup_idx, 'Revenue'] = profile['revenue']
-            startups_df.at[startup_idx, 'Stability'] = profile['stability']
-            startups_df.at[startup_idx, 'Demographic'] = profile['demographic']
-            startups_df.at[startup_idx, 'Track Record'] = profile['track_record']
-            startups_df.at[startup_idx, 'Past Grant Experience'] = profile['past_grant_experience']
-            startups_df.at[startup_idx, 'Tier'] = user['tier']
-        else:
-            # Create new startup entry
-            new_startup = {
-                'ID': user['id'],
-                'Email': user['email'],
-                'Password Hash': '',  # Not storing password in startups table
-                'Name': profile['startup_name'],
-                'Founder Name': profile['founder_name'],
-                'Entity Type': profile['entity_type'],
-                'Location': profile['location'],
-                'Year of Incorporation': profile['year_of_incorporation'],
-                'Industry': profile['industry'],
-                'Company Size': profile['company_size'],
-                'Description': profile['description'],
-                'Contact Email': profile['contact_email'],
-                'Contact Phone': profile['contact_phone'],
-                'Ownership Type': ', '.join(profile['ownership_type']) if isinstance(profile['ownership_type'], list) else profile['ownership_type'],
-                'Funding Need': profile['funding_need'],
-                'Stage': profile['stage'],
-                'Revenue': profile['revenue'],
-                'Stability': profile['stability'],
-                'Demographic': profile['demographic'],
-                'Track Record': profile['track_record'],
-                'Past Grant Experience': profile['past_grant_experience'],
-                'Tier': user['tier'],
-                'Created At': datetime.now(timezone.utc).isoformat()
-            }
+                # Create new startup entry
+                startup_id = user['id']
+                new_startup = {
+                    'ID': user['id'],
+                    'Email': user['email'],
+                    'Password Hash': '',  # Not storing password in startups table
+                    'Name': profile['startup_name'],
+                    'Founder Name': profile['founder_name'],
+                    'Entity Type': profile['entity_type'],
+                    'Location': profile['location'],
+                    'Year of Incorporation': profile['year_of_incorporation'],
+                    'Industry': profile['industry'],
+                    'Company Size': profile['company_size'],
+                    'Description': profile['description'],
+                    'Contact Email': profile['contact_email'],
+                    'Contact Phone': profile['contact_phone'],
+                    'Ownership Type': ', '.join(profile['ownership_type']) if isinstance(profile['ownership_type'], list) else profile['ownership_type'],
+                    'Funding Need': profile['funding_need'],
+                    'Stage': profile['stage'],
+                    'Revenue': profile['revenue'],
+                    'Stability': profile['stability'],
+                    'Demographic': profile['demographic'],
+                    'Track Record': profile['track_record'],
+                    'Past Grant Experience': profile['past_grant_experience'],
+                    'Tier': user['tier'],
+                    'Created At': datetime.now(timezone.utc).isoformat()
+                }
+                
+                new_startup_df = pd.DataFrame([new_startup])
+                startups_df = pd.concat([startups_df, new_startup_df], ignore_index=True)
             
-            new_startup_df = pd.DataFrame([new_startup])
-            startups_df = pd.concat([startups_df, new_startup_df], ignore_index=True)
-        
-        save_startups_df(startups_df)
-        logging.info(f"Startup data saved for user {user['email']}")
+            save_startups_df(startups_df, row_ids=[startup_id])
+            logging.info(f"Startup data saved for user {user['email']}")
     except Exception as e:
         logging.error(f"Error saving startup data: {e}")
         # Continue with the rest of the function even if startup saving fails
     
+    return merged_profile
+
+@api_router.post("/screening/submit")
+async def submit_screening(screening_data: GrantScreeningCombined, user: dict = Depends(get_current_user)):
+    # Get profile data
+    profile = screening_data.model_dump()
+    
+    merged_profile = await asyncio.to_thread(store_screening_profile, user, profile)
+    
     # Run AI matching
     matches = await ai_match_grants(merged_profile)
     
@@ -1278,7 +2984,7 @@ async def get_matches(user: dict = Depends(get_current_user)):
     }
 
 @api_router.post("/coupon/validate")
-async def validate_coupon(coupon: CouponValidate, user: dict = Depends(get_current_user)):
+def validate_coupon(coupon: CouponValidate, user: dict = Depends(get_current_user)):
     if not COUPONS_CSV.exists():
         raise HTTPException(status_code=404, detail="Coupons not available")
     
@@ -1295,12 +3001,11 @@ async def validate_coupon(coupon: CouponValidate, user: dict = Depends(get_curre
     
     # Update user tier in CSV
     new_tier = coupon_info['Tier']
-    users_df = load_users_df()
-    user_idx = users_df[users_df['id'] == user['id']].index[0]
-    users_df.at[user_idx, 'tier'] = new_tier
-    users_df.at[user_idx, 'upgraded_at'] = datetime.now(timezone.utc).isoformat()
-    users_df.at[user_idx, 'coupon_used'] = coupon.code.upper()
-    save_users_df(users_df)
+    update_user_row(user['id'], {
+        'tier': new_tier,
+        'upgraded_at': datetime.now(timezone.utc).isoformat(),
+        'coupon_used': coupon.code.upper()
+    })
     
     # Sync tier to startups.csv - CRITICAL: Keep both files in sync
     print(f"🔄 Starting tier sync for {user['email']} to tier: {new_tier}")
@@ -1313,19 +3018,94 @@ async def validate_coupon(coupon: CouponValidate, user: dict = Depends(get_curre
         "description": coupon_info['Description']
     }
 
-@api_router.get("/stats")
-async def get_stats():
+# ============= PUBLIC STATS =============
+# /stats is unauthenticated and hit by the landing page, so it is served from memory.
+# A background task refreshes the numbers every STATS_REFRESH_INTERVAL_SECONDS and
+# each client IP is limited to STATS_RATE_LIMIT requests per window. Behind a reverse
+# proxy listed in TRUSTED_PROXIES the client IP is taken from X-Forwarded-For.
+
+STATS_REFRESH_INTERVAL_SECONDS = 60
+STATS_RATE_LIMIT = 30
+STATS_RATE_WINDOW_SECONDS = 60
+STATS_RATE_MAX_TRACKED_IPS = 10000
+TRUSTED_PROXIES = {ip.strip() for ip in os.environ.get('TRUSTED_PROXIES', '').split(',') if ip.strip()}
+
+_public_stats = None
+_stats_request_windows = OrderedDict()  # client ip -> [window start, request count], oldest window first
+
+def compute_public_stats() -> dict:
+    """Count users, grants and matches for the public stats endpoint"""
     grants_df = load_grants_df()
     users_df = load_users_df()
     grant_matches_df = load_grant_matches_df()
-    
     return {
         "total_startups": len(users_df),
         "total_grants": len(grants_df) if not grants_df.empty else 0,
         "active_matches": len(grant_matches_df),
-        "success_rate": 87.5
+        "success_rate": get_funnel()['success_rate']
     }
 
+def refresh_public_stats():
+    """Recompute the cached public stats"""
+    global _public_stats
+    _public_stats = compute_public_stats()
+
+async def run_stats_refresher():
+    """Background task that refreshes the public stats on a fixed interval"""
+    while True:
+        try:
+            await asyncio.to_thread(refresh_public_stats)
+        except Exception as e:
+            logging.error(f"Error refreshing public stats: {e}")
+        await asyncio.sleep(STATS_REFRESH_INTERVAL_SECONDS)
+
+def client_address(request: Request) -> str:
+    """The requesting client's IP, read from X-Forwarded-For when the peer is a trusted proxy"""
+    peer = request.client.host if request.client else 'unknown'
+    if peer not in TRUSTED_PROXIES:
+        return peer
+    # The rightmost address not added by one of our own proxies is the client
+    forwarded = [ip.strip() for ip in request.headers.get('x-forwarded-for', '').split(',') if ip.strip()]
+    for ip in reversed(forwarded):
+        if ip not in TRUSTED_PROXIES:
+            return ip
+    return peer
+
+def allow_stats_request(client_ip: str) -> bool:
+    """Fixed-window rate limit for /stats, keyed by client IP"""
+    now = time.monotonic()
+    window = _stats_request_windows.get(client_ip)
+    if window is None or now - window[0] >= STATS_RATE_WINDOW_SECONDS:
+        # Windows are kept in start order, so expired ones are at the front; past the
+        # cap the oldest window is dropped even if it is still running
+        _stats_request_windows.pop(client_ip, None)
+        while _stats_request_windows:
+            started, _ = next(iter(_stats_request_windows.values()))
+            if now - started < STATS_RATE_WINDOW_SECONDS and len(_stats_request_windows) < STATS_RATE_MAX_TRACKED_IPS:
+                break
+            _stats_request_windows.popitem(last=False)
+        _stats_request_windows[client_ip] = [now, 1]
+        return True
+    window[1] += 1
+    return window[1] <= STATS_RATE_LIMIT
+
+@api_router.get("/stats")
+async def get_stats(request: Request, response: Response):
+    """Public platform stats, served from memory"""
+    if not allow_stats_request(client_address(request)):
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests",
+            headers={"Retry-After": str(STATS_RATE_WINDOW_SECONDS)}
+        )
+    
+    if _public_stats is None:
+        # Only before the background refresher has completed its first run
+        await asyncio.to_thread(refresh_public_stats)
+    
+    response.headers["Cache-Control"] = f"public, max-age={STATS_REFRESH_INTERVAL_SECONDS}"
+    return _public_stats
+
 @api_router.get("/grants/all")
 async def get_all_grants(user: dict = Depends(get_current_user)):
     """Admin/Expert endpoint to view all grants"""
@@ -1375,7 +3155,7 @@ async def get_all_grants(user: dict = Depends(get_current_user)):
 async def get_my_startup(user: dict = Depends(get_current_user)):
     """Get current user's startup data"""
     startups_df = load_startups_df()
-    user_startup = startups_df[startups_df['Email'] == user['email']]
+    user_startup = startups_df[email_matches(startups_df['Email'], user['email'])]
     
     if user_startup.empty:
         return None
@@ -1407,47 +3187,404 @@ async def get_all_startups(user: dict = Depends(get_current_user)):
     return {"startups": startups_list}
 
 # Grant Tracking Endpoints
-@api_router.get("/tracking/startups")
-async def get_startups_for_tracking(user: dict = Depends(get_current_user)):
-    """Get startups for venture analysts to track - based on user tier from users.csv"""
+# ============= STARTUP ACCOUNT JOIN =============
+# startups.csv and users.csv describe the same startup and are linked by email.
+# The join is computed once per data version, matching emails case-insensitively.
+
+TRACKING_STARTUPS_MAX_LIMIT = 1000
+
+_startup_user_join = {}
+_tracking_startups_cache = {}
+
+def email_matches(emails: pd.Series, email) -> pd.Series:
+    """Boolean mask of the emails equal to email, ignoring case like the startup/user join"""
+    return emails.astype(str).str.lower() == str(email).lower()
+
+def get_startup_user_join() -> pd.DataFrame:
+    """Return startups.csv rows with user_id / user_tier of the users.csv account sharing their email"""
+    version = get_table_version('users', 'startups')
+    if _startup_user_join.get('version') != version:
+        startups_df = load_startups_df()
+        users_df = load_users_df()
+        users = users_df.loc[users_df['email'].notna(), ['id', 'email', 'tier']]
+        users = users.assign(email_key=users['email'].astype(str).str.lower())
+        users = users.drop_duplicates('email_key', keep='first').drop(columns=['email'])
+        users = users.rename(columns={'id': 'user_id', 'tier': 'user_tier'})
+        joined = startups_df.assign(email_key=startups_df['Email'].astype(str).str.lower())
+        _startup_user_join['frame'] = joined.merge(users, on='email_key', how='left')
+        _startup_user_join['version'] = version
+    return _startup_user_join['frame']
+
+def get_tracking_startups(premium_only: bool) -> List[dict]:
+    """Dropdown entries for /tracking/startups sorted by name, cached per data version"""
+    version = get_table_version('users', 'startups')
+    if _tracking_startups_cache.get('version') != version:
+        _tracking_startups_cache.clear()
+        _tracking_startups_cache['version'] = version
+    if premium_only not in _tracking_startups_cache:
+        joined = get_startup_user_join()
+        if premium_only:
+            joined = joined[joined['user_tier'].isin(['expert', 'premium'])]
+        entries = pd.DataFrame({
+            'id': joined['ID'],
+            'name': joined['Name'],
+            'founder_name': joined['Founder Name'],
+            'email': joined['Email'],
+            'industry': joined['Industry'],
+            'location': joined['Location'],
+            # Tier comes from users.csv; startups without an account show as free
+            'tier': joined['user_tier'].fillna('free')
+        })
+        entries = entries.assign(_name_key=entries['name'].fillna('').astype(str).str.lower())
+        entries = entries.sort_values('_name_key', kind='stable')
+        _tracking_startups_cache[premium_only] = frame_to_records(entries)
+    return _tracking_startups_cache[premium_only]
+
+@api_router.get("/tracking/startups")
+async def get_startups_for_tracking(
+    q: Optional[str] = None,
+    limit: int = 50,
+    offset: int = 0,
+    user: dict = Depends(get_current_user)
+):
+    """Get a page of startups for venture analysts to track - based on user tier from users.csv
+    
+    - q: case-insensitive startup name prefix
+    """
     if user.get('tier') not in ['venture_analyst', 'expert', 'admin']:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    startups_df = load_startups_df()
-    users_df = load_users_df()
-    
-    if startups_df.empty or users_df.empty:
-        return {"startups": []}
-    
-    # Filter to show only Expert/Premium tier startups for venture analysts
-    if user.get('tier') == 'venture_analyst':
-        # Get users with expert or premium tier
-        expert_premium_users = users_df[users_df['tier'].isin(['expert', 'premium'])]
-        expert_premium_emails = expert_premium_users['email'].tolist()
-        
-        # Filter startups based on user tier
-        filtered_startups = startups_df[startups_df['Email'].isin(expert_premium_emails)]
-    else:
-        filtered_startups = startups_df  # Admin/expert can see all
-    
-    # Return simplified startup data for dropdown
-    startups_list = []
-    for _, startup in filtered_startups.iterrows():
-        # Get user tier from users.csv
-        user_info = users_df[users_df['email'] == startup['Email']]
-        user_tier = user_info['tier'].iloc[0] if not user_info.empty else 'free'
-        
-        startups_list.append({
-            "id": startup['ID'],
-            "name": startup['Name'],
-            "founder_name": startup['Founder Name'],
-            "email": startup['Email'],
-            "industry": startup['Industry'],
-            "location": startup['Location'],
-            "tier": user_tier  # Use tier from users.csv
-        })
+    # Venture analysts only see Expert/Premium tier startups; admin/expert can see all
+    entries = get_tracking_startups(premium_only=user.get('tier') == 'venture_analyst')
+    if q:
+        prefix = q.strip().lower()
+        entries = [entry for entry in entries if entry['_name_key'].startswith(prefix)]
     
-    return {"startups": startups_list}
+    limit = max(1, min(limit, TRACKING_STARTUPS_MAX_LIMIT))
+    offset = max(0, offset)
+    page = [{key: value for key, value in entry.items() if key != '_name_key'} for entry in entries[offset:offset + limit]]
+    return {"startups": page, "total": len(entries)}
+
+# ============= TRACKING READ MODEL =============
+# grant_tracking rows projected with their grant, startup and analyst names, kept in
+# memory and updated by the grant_tracking, grants, startups and users change listeners.
+# Rows are indexed by startup_id, by the analyst's user_id and by (user_id, status), in
+# file order, and hold the stored CSV values as strings.
+# Handlers read it through asyncio.to_thread, because saves hold _change_lock during CSV I/O.
+
+TRACKING_VALUE_FIELDS = [
+    'id', 'user_id', 'startup_id', 'grant_id', 'status', 'progress', 'applied_date', 'approved_date',
+    'disbursed_date', 'rejected_date', 'disbursed_amount', 'screenshot_path', 'notes', 'created_at', 'updated_at'
+]
+
+TRACKING_BOARD_STATUSES = ['Draft', 'Applied', 'Approved', 'Disbursed', 'Rejected']
+TRACKING_BOARD_CARD_FIELDS = [
+    'id', 'startup_id', 'startup_name', 'grant_id', 'grant_name', 'progress', 'disbursed_amount', 'analyst_name', 'updated_at'
+]
+TRACKING_BOARD_MAX_CARDS = 50
+
+_tracking_read_model = None
+
+def _build_grant_name_lookups(grants_snapshot) -> tuple:
+    """Map Grant ID -> Name, and Grant ID without leading zeros -> Name (first row wins)"""
+    names, stripped_names = {}, {}
+    if 'Name' not in grants_snapshot.columns:
+        return names, stripped_names
+    for grant_id, name in zip(grants_snapshot['Grant ID'].tolist(), grants_snapshot['Name'].tolist()):
+        names.setdefault(grant_id, name)
+        stripped_names.setdefault(grant_id.lstrip('0'), name)
+    return names, stripped_names
+
+def _resolve_grant_name(grant_id: str, grant_lookups) -> str:
+    """Match a tracked grant id as stored, zero-padded ("9" -> "009") or without leading zeros"""
+    names, stripped_names = grant_lookups
+    if grant_id in names:
+        return names[grant_id]
+    if grant_id.isdigit() and grant_id.zfill(3) in names:
+        return names[grant_id.zfill(3)]
+    return stripped_names.get(grant_id, f"Grant {grant_id}")
+
+def _table_column_lookup(table, column) -> Dict[str, str]:
+    snapshot = _get_table_snapshot(table)
+    if column not in snapshot.columns:
+        return {}
+    return dict(zip(snapshot.index, snapshot[column]))
+
+def _project_tracking_row(row, model) -> dict:
+    """Copy a stored tracking row and attach its display names"""
+    projected = {field: row.get(field, '') for field in TRACKING_VALUE_FIELDS}
+    projected['grant_name'] = _resolve_grant_name(projected['grant_id'], model['grant_names'])
+    projected['startup_name'] = model['startup_names'].get(projected['startup_id'], "Unknown Startup")
+    projected['analyst_name'] = model['user_names'].get(projected['user_id'], "Unknown Analyst")
+    return projected
+
+def _board_status(projected) -> str:
+    # Rows saved without a status are shown as drafts
+    return projected['status'] or "Draft"
+
+def _index_tracking_row(model, projected):
+    model['rows'][projected['id']] = projected
+    model['by_startup'].setdefault(projected['startup_id'], {})[projected['id']] = None
+    model['by_user'].setdefault(projected['user_id'], {})[projected['id']] = None
+    model['by_user_status'].setdefault((projected['user_id'], _board_status(projected)), {})[projected['id']] = None
+
+def _unindex_tracking_row(model, tracking_id):
+    projected = model['rows'].pop(tracking_id, None)
+    if projected is not None:
+        model['by_startup'].get(projected['startup_id'], {}).pop(tracking_id, None)
+        model['by_user'].get(projected['user_id'], {}).pop(tracking_id, None)
+        model['by_user_status'].get((projected['user_id'], _board_status(projected)), {}).pop(tracking_id, None)
+
+def get_tracking_read_model() -> dict:
+    """Return the tracking read model, building it from the stored tables on first use"""
+    global _tracking_read_model
+    with _change_lock:
+        if _tracking_read_model is None:
+            model = {
+                'rows': {},
+                'by_startup': {},
+                'by_user': {},
+                'by_user_status': {},
+                'grant_names': _build_grant_name_lookups(_get_table_snapshot('grants')),
+                'startup_names': _table_column_lookup('startups', 'Name'),
+                'user_names': _table_column_lookup('users', 'name')
+            }
+            tracking = _get_table_snapshot('grant_tracking').reindex(columns=TRACKING_VALUE_FIELDS, fill_value='')
+            for row in tracking.to_dict('records'):
+                _index_tracking_row(model, _project_tracking_row(row, model))
+            _tracking_read_model = model
+        return _tracking_read_model
+
+def read_tracking_rows(startup_id: Optional[str] = None, user_id: Optional[str] = None) -> List[dict]:
+    """Return copies of the projected tracking rows for a startup and/or analyst (all rows if neither)"""
+    with _change_lock:
+        model = get_tracking_read_model()
+        if startup_id is not None:
+            ids = model['by_startup'].get(startup_id, {})
+        elif user_id is not None:
+            ids = model['by_user'].get(user_id, {})
+        else:
+            ids = model['rows']
+        rows = [model['rows'][tracking_id] for tracking_id in ids]
+        if startup_id is not None and user_id is not None:
+            rows = [row for row in rows if row['user_id'] == user_id]
+        return [dict(row) for row in rows]
+
+def read_tracking_row(tracking_id: str) -> Optional[dict]:
+    """Return a copy of one projected tracking row, or None if it does not exist"""
+    with _change_lock:
+        row = get_tracking_read_model()['rows'].get(tracking_id)
+        return dict(row) if row is not None else None
+
+@on_table_change('grant_tracking')
+def _update_tracking_read_model(changes):
+    model = _tracking_read_model
+    if model is None:
+        return
+    for entry in changes:
+        _unindex_tracking_row(model, entry['row_id'])
+        if entry['op'] != 'delete':
+            _index_tracking_row(model, _project_tracking_row(entry['row'], model))
+
+@on_table_change('grants')
+def _update_tracking_grant_names(changes):
+    model = _tracking_read_model
+    if model is None:
+        return
+    # Grant writes are rare and a new id can resolve previously unmatched rows, so re-resolve all
+    model['grant_names'] = _build_grant_name_lookups(_get_table_snapshot('grants'))
+    for projected in model['rows'].values():
+        projected['grant_name'] = _resolve_grant_name(projected['grant_id'], model['grant_names'])
+
+@on_table_change('startups')
+def _update_tracking_startup_names(changes):
+    model = _tracking_read_model
+    if model is None:
+        return
+    for entry in changes:
+        name = entry['row'].get('Name', '') if entry['op'] != 'delete' else None
+        if name is None:
+            model['startup_names'].pop(entry['row_id'], None)
+        else:
+            model['startup_names'][entry['row_id']] = name
+        for tracking_id in model['by_startup'].get(entry['row_id'], {}):
+            model['rows'][tracking_id]['startup_name'] = "Unknown Startup" if name is None else name
+
+@on_table_change('users')
+def _update_tracking_analyst_names(changes):
+    model = _tracking_read_model
+    if model is None:
+        return
+    for entry in changes:
+        name = entry['row'].get('name', '') if entry['op'] != 'delete' else None
+        if name is None:
+            model['user_names'].pop(entry['row_id'], None)
+        else:
+            model['user_names'][entry['row_id']] = name
+        for tracking_id in model['by_user'].get(entry['row_id'], {}):
+            model['rows'][tracking_id]['analyst_name'] = "Unknown Analyst" if name is None else name
+
+def read_tracking_board(user_id: Optional[str], card_limit: int) -> List[dict]:
+    """Group tracking rows by status for one analyst (or everyone) with counts, disbursed totals and the latest cards"""
+    with _change_lock:
+        model = get_tracking_read_model()
+        buckets = {}
+        for (owner_id, status_name), ids in model['by_user_status'].items():
+            if ids and (user_id is None or owner_id == user_id):
+                buckets.setdefault(status_name, []).extend(model['rows'][tracking_id] for tracking_id in ids)
+        
+        columns = []
+        statuses = TRACKING_BOARD_STATUSES + sorted(set(buckets) - set(TRACKING_BOARD_STATUSES))
+        for status_name in statuses:
+            rows = buckets.get(status_name, [])
+            amounts = pd.to_numeric(pd.Series([row['disbursed_amount'] for row in rows], dtype=object), errors='coerce')
+            latest = heapq.nlargest(card_limit, rows, key=lambda row: row['updated_at'])
+            columns.append({
+                'status': status_name,
+                'count': len(rows),
+                'total_disbursed': float(amounts.sum()),
+                'cards': [{field: row[field] for field in TRACKING_BOARD_CARD_FIELDS} for row in latest]
+            })
+        return columns
+
+TRACKING_RESPONSE_FIELDS = [
+    'id', 'grant_id', 'grant_name', 'status', 'progress', 'applied_date', 'approved_date', 'disbursed_date',
+    'rejected_date', 'disbursed_amount', 'screenshot_path', 'notes', 'created_at', 'updated_at'
+]
+
+def tracking_response(row, fields) -> dict:
+    """Shape a projected tracking row for an endpoint response"""
+    response = {field: row[field] for field in fields}
+    if 'status' in response and not response['status']:
+        response['status'] = "Draft"
+    if 'screenshot_path' in response:
+        response['screenshot_url'] = signed_upload_url(response['screenshot_path'])
+    return response
+
+# ============= TRACKING EVENT HISTORY =============
+# Every tracking create, status/progress change and delete is appended to
+# tracking_events.csv as an immutable event. grant_tracking.csv stays the current-state
+# snapshot; the events give the exact history behind it and time spent in each status.
+# Events are written by save_grant_tracking_df while it holds the change lock, right
+# after the row, so concurrent saves can't interleave a row and its event. A crash
+# between the two writes is repaired at startup: rows whose latest event disagrees with
+# them get a 'reconciled' event, and removed rows get their 'deleted' event. Rows that
+# predate the event log get one 'imported' event carrying their current state.
+
+TRACKING_EVENT_COLUMNS = [
+    'id', 'tracking_id', 'event', 'old_status', 'new_status', 'old_progress', 'new_progress', 'actor_id', 'occurred_at'
+]
+
+_tracking_events = None  # tracking_id -> events in occurrence order
+_tracking_events_lock = threading.Lock()
+
+def _tracking_value(value) -> str:
+    return '' if pd.isna(value) else str(value)
+
+def _same_tracking_value(stored: str, current) -> bool:
+    # pandas may read a column as float in one load and int in another ('50.0' vs '50')
+    current = _tracking_value(current)
+    if stored == current:
+        return True
+    try:
+        return float(stored) == float(current)
+    except ValueError:
+        return False
+
+def _load_tracking_events():
+    """Load tracking_events.csv into memory once per process"""
+    global _tracking_events
+    if _tracking_events is not None:
+        return
+    events = {}
+    if TRACKING_EVENTS_CSV.exists() and TRACKING_EVENTS_CSV.stat().st_size > 0:
+        events_df = pd.read_csv(TRACKING_EVENTS_CSV, dtype=str, keep_default_na=False)
+        for event in events_df.to_dict('records'):
+            events.setdefault(event['tracking_id'], []).append(event)
+    _tracking_events = events
+
+def tracking_event(tracking_id, event, old_row, new_row, actor_id, occurred_at) -> dict:
+    """Build a tracking event from the row before and after a change (either may be None)"""
+    old_row = old_row or {}
+    new_row = new_row or {}
+    return {
+        'id': str(uuid.uuid4()),
+        'tracking_id': tracking_id,
+        'event': event,
+        'old_status': _tracking_value(old_row.get('status', '')),
+        'new_status': _tracking_value(new_row.get('status', '')),
+        'old_progress': _tracking_value(old_row.get('progress', '')),
+        'new_progress': _tracking_value(new_row.get('progress', '')),
+        'actor_id': actor_id,
+        'occurred_at': occurred_at
+    }
+
+def record_tracking_events(events: List[dict]):
+    """Append events to tracking_events.csv and the in-memory history"""
+    if not events:
+        return
+    with _tracking_events_lock:
+        _load_tracking_events()
+        write_header = not TRACKING_EVENTS_CSV.exists() or TRACKING_EVENTS_CSV.stat().st_size == 0
+        pd.DataFrame(events, columns=TRACKING_EVENT_COLUMNS).to_csv(TRACKING_EVENTS_CSV, mode='a', header=write_header, index=False)
+        for event in events:
+            _tracking_events.setdefault(event['tracking_id'], []).append(event)
+
+def seed_tracking_events() -> int:
+    """Bring tracking_events.csv in line with grant_tracking.csv: import untracked rows and repair crash gaps"""
+    try:
+        with _change_lock:
+            with _tracking_events_lock:
+                _load_tracking_events()
+                latest = {tracking_id: events[-1] for tracking_id, events in _tracking_events.items() if events}
+            tracking_df = load_grant_tracking_df()
+            now = datetime.now(timezone.utc).isoformat()
+            events = []
+            for row in tracking_df.to_dict('records'):
+                tracking_id = str(row['id'])
+                occurred_at = _tracking_value(row['updated_at']) or _tracking_value(row['created_at'])
+                last = latest.pop(tracking_id, None)
+                if last is None:
+                    events.append(tracking_event(tracking_id, 'imported', None, row, _tracking_value(row['user_id']), occurred_at))
+                elif (last['event'] == 'deleted' or not _same_tracking_value(last['new_status'], row['status'])
+                      or not _same_tracking_value(last['new_progress'], row['progress'])):
+                    # The row was saved but its event was not (actor unknown)
+                    old_row = None if last['event'] == 'deleted' else {'status': last['new_status'], 'progress': last['new_progress']}
+                    events.append(tracking_event(tracking_id, 'reconciled', old_row, row, '', occurred_at))
+            for tracking_id, last in latest.items():
+                if last['event'] != 'deleted':
+                    events.append(tracking_event(tracking_id, 'deleted', {'status': last['new_status'], 'progress': last['new_progress']}, None, '', now))
+            record_tracking_events(events)
+        return len(events)
+    except Exception as e:
+        logging.error(f"Error seeding tracking events: {e}")
+        return 0
+
+def get_tracking_events(tracking_id: str) -> List[dict]:
+    """Return a copy of a tracking row's events in occurrence order"""
+    with _tracking_events_lock:
+        _load_tracking_events()
+        return [dict(event) for event in _tracking_events.get(tracking_id, [])]
+
+def time_in_status(events: List[dict], until: datetime) -> Dict[str, float]:
+    """Total seconds spent in each status, replaying the events up to `until`"""
+    durations = {}
+    current_status, entered_at = None, None
+    for event in events:
+        if event['event'] == 'deleted':
+            until = pd.to_datetime(event['occurred_at'], utc=True, errors='coerce')
+            break
+        if event['new_status'] == current_status:
+            continue
+        occurred_at = pd.to_datetime(event['occurred_at'], utc=True, errors='coerce')
+        if pd.isna(occurred_at):
+            continue
+        if current_status is not None:
+            durations[current_status] = durations.get(current_status, 0.0) + (occurred_at - entered_at).total_seconds()
+        current_status, entered_at = event['new_status'], occurred_at
+    if current_status is not None and not pd.isna(until):
+        durations[current_status] = durations.get(current_status, 0.0) + max(0.0, (until - entered_at).total_seconds())
+    return {status_name: round(seconds, 3) for status_name, seconds in durations.items()}
 
 @api_router.get("/tracking/grants/{startup_id}")
 async def get_startup_grant_tracking(startup_id: str, user: dict = Depends(get_current_user)):
@@ -1455,54 +3592,11 @@ async def get_startup_grant_tracking(startup_id: str, user: dict = Depends(get_c
     if user.get('tier') not in ['venture_analyst', 'expert', 'admin']:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    tracking_df = load_grant_tracking_df()
-    startup_tracking = tracking_df[tracking_df['startup_id'] == startup_id]
-    
     # Filter by user for venture analysts - they only see their own tracking entries
-    if user.get('tier') == 'venture_analyst':
-        startup_tracking = startup_tracking[startup_tracking['user_id'] == user['id']]
-    
-    if startup_tracking.empty:
-        return {"tracking": []}
+    analyst_id = user['id'] if user.get('tier') == 'venture_analyst' else None
+    rows = await asyncio.to_thread(read_tracking_rows, startup_id=startup_id, user_id=analyst_id)
     
-    # Get grant details for each tracking entry
-    grants_df = load_grants_df()
-    tracking_list = []
-    
-    for _, track in startup_tracking.iterrows():
-        # Try to match grant ID with different formats
-        grant_id = str(track['grant_id'])
-        grant_info = grants_df[grants_df['Grant ID'] == grant_id]
-        
-        # If not found, try with leading zeros (e.g., "9" -> "009")
-        if grant_info.empty and grant_id.isdigit():
-            padded_id = grant_id.zfill(3)
-            grant_info = grants_df[grants_df['Grant ID'] == padded_id]
-        
-        # If still not found, try without leading zeros (e.g., "003" -> "3")
-        if grant_info.empty:
-            grant_info = grants_df[grants_df['Grant ID'].str.lstrip('0') == grant_id]
-        
-        grant_name = grant_info['Name'].iloc[0] if not grant_info.empty else f"Grant {grant_id}"
-        
-        tracking_list.append({
-            "id": str(track['id']) if pd.notna(track['id']) else "",
-            "grant_id": str(track['grant_id']) if pd.notna(track['grant_id']) else "",
-            "grant_name": grant_name,
-            "status": str(track['status']) if pd.notna(track['status']) else "Draft",
-            "progress": str(track['progress']) if pd.notna(track['progress']) else "",
-            "applied_date": str(track['applied_date']) if pd.notna(track['applied_date']) else "",
-            "approved_date": str(track['approved_date']) if pd.notna(track['approved_date']) else "",
-            "disbursed_date": str(track['disbursed_date']) if pd.notna(track['disbursed_date']) else "",
-            "rejected_date": str(track['rejected_date']) if pd.notna(track['rejected_date']) else "",
-            "disbursed_amount": str(track['disbursed_amount']) if pd.notna(track['disbursed_amount']) else "",
-            "screenshot_path": str(track['screenshot_path']) if pd.notna(track['screenshot_path']) else "",
-            "notes": str(track['notes']) if pd.notna(track['notes']) else "",
-            "created_at": str(track['created_at']) if pd.notna(track['created_at']) else "",
-            "updated_at": str(track['updated_at']) if pd.notna(track['updated_at']) else ""
-        })
-    
-    return {"tracking": tracking_list}
+    return {"tracking": [tracking_response(row, TRACKING_RESPONSE_FIELDS) for row in rows]}
 
 @api_router.get("/tracking/all")
 async def get_all_venture_analyst_tracking(user: dict = Depends(get_current_user)):
@@ -1510,162 +3604,165 @@ async def get_all_venture_analyst_tracking(user: dict = Depends(get_current_user
     if user.get('tier') not in ['venture_analyst', 'expert', 'admin']:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    tracking_df = load_grant_tracking_df()
-    
-    # For venture analysts, filter by their user_id
-    if user.get('tier') == 'venture_analyst':
-        analyst_tracking = tracking_df[tracking_df['user_id'] == user['id']]
-    else:
-        # For experts and admins, show all tracking
-        analyst_tracking = tracking_df
-    
-    if analyst_tracking.empty:
-        return {"tracking": [], "count": 0}
+    # For venture analysts, filter by their user_id; experts and admins see all tracking
+    analyst_id = user['id'] if user.get('tier') == 'venture_analyst' else None
+    rows = await asyncio.to_thread(read_tracking_rows, user_id=analyst_id)
     
-    # Get grant details and startup info for each tracking entry
-    grants_df = load_grants_df()
-    startups_df = load_startups_df()
-    tracking_list = []
+    fields = ['id', 'startup_id', 'startup_name'] + TRACKING_RESPONSE_FIELDS[1:]
+    tracking_list = [tracking_response(row, fields) for row in rows]
+    return {"tracking": tracking_list, "count": len(tracking_list)}
+
+@api_router.get("/tracking/board")
+async def get_tracking_board(limit: int = 5, analyst_id: Optional[str] = None, user: dict = Depends(get_current_user)):
+    """Get the analyst pipeline as a kanban board: per status count, disbursed total and latest cards
     
-    for _, track in analyst_tracking.iterrows():
-        # Try to match grant ID with different formats
-        grant_id = str(track['grant_id'])
-        grant_info = grants_df[grants_df['Grant ID'] == grant_id]
-        
-        # If not found, try with leading zeros (e.g., "9" -> "009")
-        if grant_info.empty and grant_id.isdigit():
-            padded_id = grant_id.zfill(3)
-            grant_info = grants_df[grants_df['Grant ID'] == padded_id]
-        
-        # If still not found, try without leading zeros (e.g., "003" -> "3")
-        if grant_info.empty:
-            grant_info = grants_df[grants_df['Grant ID'].str.lstrip('0') == grant_id]
-        
-        grant_name = grant_info['Name'].iloc[0] if not grant_info.empty else f"Grant {grant_id}"
-        
-        # Get startup info
-        startup_info = startups_df[startups_df['ID'] == track['startup_id']]
-        startup_name = startup_info['Name'].iloc[0] if not startup_info.empty else "Unknown Startup"
-        
-        tracking_list.append({
-            "id": str(track['id']) if pd.notna(track['id']) else "",
-            "startup_id": str(track['startup_id']) if pd.notna(track['startup_id']) else "",
-            "startup_name": startup_name,
-            "grant_id": str(track['grant_id']) if pd.notna(track['grant_id']) else "",
-            "grant_name": grant_name,
-            "status": str(track['status']) if pd.notna(track['status']) else "Draft",
-            "progress": str(track['progress']) if pd.notna(track['progress']) else "",
-            "applied_date": str(track['applied_date']) if pd.notna(track['applied_date']) else "",
-            "approved_date": str(track['approved_date']) if pd.notna(track['approved_date']) else "",
-            "disbursed_date": str(track['disbursed_date']) if pd.notna(track['disbursed_date']) else "",
-            "rejected_date": str(track['rejected_date']) if pd.notna(track['rejected_date']) else "",
-            "disbursed_amount": str(track['disbursed_amount']) if pd.notna(track['disbursed_amount']) else "",
-            "screenshot_path": str(track['screenshot_path']) if pd.notna(track['screenshot_path']) else "",
-            "notes": str(track['notes']) if pd.notna(track['notes']) else "",
-            "created_at": str(track['created_at']) if pd.notna(track['created_at']) else "",
-            "updated_at": str(track['updated_at']) if pd.notna(track['updated_at']) else ""
-        })
+    - limit: cards per column, most recently updated first
+    - analyst_id: admins only; defaults to all analysts
+    """
+    if user.get('tier') not in ['venture_analyst', 'admin']:
+        raise HTTPException(status_code=403, detail="Access denied")
     
-    return {"tracking": tracking_list, "count": len(tracking_list)}
+    # Venture analysts always get their own board
+    board_user_id = user['id'] if user.get('tier') == 'venture_analyst' else analyst_id
+    limit = max(0, min(limit, TRACKING_BOARD_MAX_CARDS))
+    columns = await asyncio.to_thread(read_tracking_board, board_user_id, limit)
+    return {"columns": columns, "total": sum(column['count'] for column in columns)}
 
 @api_router.post("/tracking/create")
-async def create_grant_tracking(tracking_data: GrantTrackingCreate, user: dict = Depends(get_current_user)):
+def create_grant_tracking(tracking_data: GrantTrackingCreate, user: dict = Depends(get_current_user)):
     """Create new grant tracking entry"""
     if user.get('tier') not in ['venture_analyst', 'expert', 'admin']:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    tracking_df = load_grant_tracking_df()
-    
-    # Check if tracking already exists
-    existing = tracking_df[(tracking_df['startup_id'] == tracking_data.startup_id) & 
-                          (tracking_df['grant_id'] == tracking_data.grant_id)]
-    if not existing.empty:
-        raise HTTPException(status_code=400, detail="Grant tracking already exists for this startup")
-    
-    # Create new tracking entry
-    tracking_id = str(uuid.uuid4())
-    new_tracking = {
-        "id": tracking_id,
-        "user_id": user['id'],
-        "startup_id": tracking_data.startup_id,
-        "grant_id": tracking_data.grant_id,
-        "status": tracking_data.status,
-        "progress": tracking_data.progress,
-        "applied_date": "",
-        "approved_date": "",
-        "disbursed_date": "",
-        "rejected_date": "",
-        "disbursed_amount": "",
-        "screenshot_path": "",
-        "notes": tracking_data.notes,
-        "created_at": datetime.now(timezone.utc).isoformat(),
-        "updated_at": datetime.now(timezone.utc).isoformat()
-    }
-    
-    new_tracking_df = pd.DataFrame([new_tracking])
-    tracking_df = pd.concat([tracking_df, new_tracking_df], ignore_index=True)
-    save_grant_tracking_df(tracking_df)
+    with _change_lock:
+        tracking_df = load_grant_tracking_df()
+        
+        # Check if tracking already exists
+        existing = tracking_df[(tracking_df['startup_id'] == tracking_data.startup_id) & 
+                              (tracking_df['grant_id'] == tracking_data.grant_id)]
+        if not existing.empty:
+            raise HTTPException(status_code=400, detail="Grant tracking already exists for this startup")
+        
+        # Create new tracking entry
+        tracking_id = str(uuid.uuid4())
+        new_tracking = {
+            "id": tracking_id,
+            "user_id": user['id'],
+            "startup_id": tracking_data.startup_id,
+            "grant_id": tracking_data.grant_id,
+            "status": tracking_data.status,
+            "progress": tracking_data.progress,
+            "applied_date": "",
+            "approved_date": "",
+            "disbursed_date": "",
+            "rejected_date": "",
+            "disbursed_amount": "",
+            "screenshot_path": "",
+            "notes": tracking_data.notes,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "updated_at": datetime.now(timezone.utc).isoformat()
+        }
+        
+        append_table_rows('grant_tracking', pd.DataFrame([new_tracking]), load_grant_tracking_df, save_grant_tracking_df)
+        record_tracking_events([tracking_event(tracking_id, 'created', None, new_tracking, user['id'], new_tracking['created_at'])])
     
     return {"message": "Grant tracking created successfully", "tracking_id": tracking_id}
 
 @api_router.put("/tracking/{tracking_id}")
-async def update_grant_tracking(tracking_id: str, update_data: GrantTrackingUpdate, user: dict = Depends(get_current_user)):
+def update_grant_tracking(tracking_id: str, update_data: GrantTrackingUpdate, user: dict = Depends(get_current_user)):
     """Update grant tracking entry"""
     if user.get('tier') not in ['venture_analyst', 'expert', 'admin']:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    tracking_df = load_grant_tracking_df()
-    tracking_idx = tracking_df[tracking_df['id'] == tracking_id].index
-    
-    if tracking_idx.empty:
-        raise HTTPException(status_code=404, detail="Grant tracking not found")
-    
-    # Update fields
-    for field, value in update_data.model_dump(exclude_unset=True).items():
-        if value is not None:
-            tracking_df.at[tracking_idx[0], field] = value
-    
-    # Set updated timestamp
-    tracking_df.at[tracking_idx[0], 'updated_at'] = datetime.now(timezone.utc).isoformat()
-    
-    # Set status-specific dates (check for NaN or empty values properly)
-    if update_data.status == "Applied":
-        current_date = tracking_df.at[tracking_idx[0], 'applied_date']
-        if pd.isna(current_date) or str(current_date).strip() == '':
-            tracking_df.at[tracking_idx[0], 'applied_date'] = datetime.now(timezone.utc).isoformat()
-    elif update_data.status == "Approved":
-        current_date = tracking_df.at[tracking_idx[0], 'approved_date']
-        if pd.isna(current_date) or str(current_date).strip() == '':
-            tracking_df.at[tracking_idx[0], 'approved_date'] = datetime.now(timezone.utc).isoformat()
-    elif update_data.status == "Disbursed":
-        current_date = tracking_df.at[tracking_idx[0], 'disbursed_date']
-        if pd.isna(current_date) or str(current_date).strip() == '':
-            tracking_df.at[tracking_idx[0], 'disbursed_date'] = datetime.now(timezone.utc).isoformat()
-    elif update_data.status == "Rejected":
-        current_date = tracking_df.at[tracking_idx[0], 'rejected_date']
-        if pd.isna(current_date) or str(current_date).strip() == '':
-            tracking_df.at[tracking_idx[0], 'rejected_date'] = datetime.now(timezone.utc).isoformat()
-    
-    save_grant_tracking_df(tracking_df)
+    with _change_lock:
+        tracking_df = load_grant_tracking_df()
+        tracking_idx = tracking_df[tracking_df['id'] == tracking_id].index
+        
+        if tracking_idx.empty:
+            raise HTTPException(status_code=404, detail="Grant tracking not found")
+        
+        previous = tracking_df.loc[tracking_idx[0], ['status', 'progress']].to_dict()
+        
+        # Update fields
+        for field, value in update_data.model_dump(exclude_unset=True).items():
+            if value is not None:
+                tracking_df.at[tracking_idx[0], field] = value
+        
+        # Set updated timestamp
+        updated_at = datetime.now(timezone.utc).isoformat()
+        tracking_df.at[tracking_idx[0], 'updated_at'] = updated_at
+        
+        # Set status-specific dates (check for NaN or empty values properly)
+        if update_data.status == "Applied":
+            current_date = tracking_df.at[tracking_idx[0], 'applied_date']
+            if pd.isna(current_date) or str(current_date).strip() == '':
+                tracking_df.at[tracking_idx[0], 'applied_date'] = datetime.now(timezone.utc).isoformat()
+        elif update_data.status == "Approved":
+            current_date = tracking_df.at[tracking_idx[0], 'approved_date']
+            if pd.isna(current_date) or str(current_date).strip() == '':
+                tracking_df.at[tracking_idx[0], 'approved_date'] = datetime.now(timezone.utc).isoformat()
+        elif update_data.status == "Disbursed":
+            current_date = tracking_df.at[tracking_idx[0], 'disbursed_date']
+            if pd.isna(current_date) or str(current_date).strip() == '':
+                tracking_df.at[tracking_idx[0], 'disbursed_date'] = datetime.now(timezone.utc).isoformat()
+        elif update_data.status == "Rejected":
+            current_date = tracking_df.at[tracking_idx[0], 'rejected_date']
+            if pd.isna(current_date) or str(current_date).strip() == '':
+                tracking_df.at[tracking_idx[0], 'rejected_date'] = datetime.now(timezone.utc).isoformat()
+        
+        current = tracking_df.loc[tracking_idx[0], ['status', 'progress']].to_dict()
+        events = []
+        if _tracking_value(current['status']) != _tracking_value(previous['status']):
+            events.append(tracking_event(tracking_id, 'status_changed', previous, current, user['id'], updated_at))
+        elif _tracking_value(current['progress']) != _tracking_value(previous['progress']):
+            events.append(tracking_event(tracking_id, 'progress_changed', previous, current, user['id'], updated_at))
+        save_grant_tracking_df(tracking_df, events, row_ids=[tracking_id])
     
     return {"message": "Grant tracking updated successfully"}
 
 @api_router.delete("/tracking/{tracking_id}")
-async def delete_grant_tracking(tracking_id: str, user: dict = Depends(get_current_user)):
+def delete_grant_tracking(tracking_id: str, user: dict = Depends(get_current_user)):
     """Delete grant tracking entry"""
     if user.get('tier') not in ['venture_analyst', 'expert', 'admin']:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    tracking_df = load_grant_tracking_df()
-    tracking_idx = tracking_df[tracking_df['id'] == tracking_id].index
+    with _change_lock:
+        tracking_df = load_grant_tracking_df()
+        tracking_idx = tracking_df[tracking_df['id'] == tracking_id].index
+        
+        if tracking_idx.empty:
+            raise HTTPException(status_code=404, detail="Grant tracking not found")
+        
+        previous = tracking_df.loc[tracking_idx[0], ['status', 'progress']].to_dict()
+        tracking_df = tracking_df.drop(tracking_idx[0])
+        save_grant_tracking_df(tracking_df, [tracking_event(tracking_id, 'deleted', previous, None, user['id'], datetime.now(timezone.utc).isoformat())], row_ids=[tracking_id])
     
-    if tracking_idx.empty:
+    return {"message": "Grant tracking deleted successfully"}
+
+@api_router.get("/tracking/{tracking_id}/history")
+async def get_grant_tracking_history(tracking_id: str, user: dict = Depends(get_current_user)):
+    """Get the status/progress change history of a grant tracking entry and time spent in each status"""
+    if user.get('tier') not in ['venture_analyst', 'expert', 'admin']:
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    events = await asyncio.to_thread(get_tracking_events, tracking_id)
+    if not events:
         raise HTTPException(status_code=404, detail="Grant tracking not found")
     
-    tracking_df = tracking_df.drop(tracking_idx[0])
-    save_grant_tracking_df(tracking_df)
+    # Venture analysts only see the history of their own tracking entries
+    if user.get('tier') == 'venture_analyst':
+        row = await asyncio.to_thread(read_tracking_row, tracking_id)
+        owner_id = row['user_id'] if row else events[0]['actor_id']
+        if owner_id != user['id']:
+            raise HTTPException(status_code=403, detail="Access denied")
     
-    return {"message": "Grant tracking deleted successfully"}
+    return {
+        "tracking_id": tracking_id,
+        "status": events[-1]['new_status'],
+        "deleted": events[-1]['event'] == 'deleted',
+        "events": events,
+        "time_in_status": time_in_status(events, datetime.now(timezone.utc))
+    }
 
 @api_router.get("/tracking/expert/{startup_id}")
 async def get_expert_startup_tracking(startup_id: str, user: dict = Depends(get_current_user)):
@@ -1675,70 +3772,27 @@ async def get_expert_startup_tracking(startup_id: str, user: dict = Depends(get_
         raise HTTPException(status_code=403, detail="Access denied")
     
     # Verify the startup belongs to this user
-    startups_df = load_startups_df()
-    startup = startups_df[startups_df['ID'] == startup_id]
+    joined = get_startup_user_join()
+    startup = joined[joined['ID'] == startup_id]
     
     if startup.empty:
         raise HTTPException(status_code=404, detail="Startup not found")
     
     # Users can only see tracking for their own startup (except admins)
-    if user.get('tier') != 'admin' and startup.iloc[0]['Email'] != user.get('email'):
+    if user.get('tier') != 'admin' and startup.iloc[0]['user_id'] != user.get('id'):
         raise HTTPException(status_code=403, detail="Access denied - not your startup")
     
-    tracking_df = load_grant_tracking_df()
-    startup_tracking = tracking_df[tracking_df['startup_id'] == startup_id]
-    
-    if startup_tracking.empty:
-        return {"tracking": []}
-    
-    # Get grant details and venture analyst info for each tracking entry
-    grants_df = load_grants_df()
-    users_df = load_users_df()
+    fields = TRACKING_RESPONSE_FIELDS + ['analyst_name', 'user_id']
     tracking_list = []
-    
-    for _, track in startup_tracking.iterrows():
-        # Try to match grant ID with different formats
-        grant_id = str(track['grant_id'])
-        grant_info = grants_df[grants_df['Grant ID'] == grant_id]
-        
-        # If not found, try with leading zeros (e.g., "9" -> "009")
-        if grant_info.empty and grant_id.isdigit():
-            padded_id = grant_id.zfill(3)
-            grant_info = grants_df[grants_df['Grant ID'] == padded_id]
-        
-        # If still not found, try without leading zeros (e.g., "003" -> "3")
-        if grant_info.empty:
-            grant_info = grants_df[grants_df['Grant ID'].str.lstrip('0') == grant_id]
-        
-        grant_name = grant_info['Name'].iloc[0] if not grant_info.empty else f"Grant {grant_id}"
-        
-        # Get venture analyst info
-        analyst_info = users_df[users_df['id'] == track['user_id']]
-        analyst_name = analyst_info['name'].iloc[0] if not analyst_info.empty else "Unknown Analyst"
-        
-        tracking_list.append({
-            "id": str(track['id']) if pd.notna(track['id']) else "",
-            "grant_id": str(track['grant_id']) if pd.notna(track['grant_id']) else "",
-            "grant_name": grant_name,
-            "status": str(track['status']) if pd.notna(track['status']) else "Draft",
-            "progress": str(track['progress']) if pd.notna(track['progress']) else "",
-            "applied_date": str(track['applied_date']) if pd.notna(track['applied_date']) else "",
-            "approved_date": str(track['approved_date']) if pd.notna(track['approved_date']) else "",
-            "disbursed_date": str(track['disbursed_date']) if pd.notna(track['disbursed_date']) else "",
-            "rejected_date": str(track['rejected_date']) if pd.notna(track['rejected_date']) else "",
-            "disbursed_amount": str(track['disbursed_amount']) if pd.notna(track['disbursed_amount']) else "",
-            "screenshot_path": str(track['screenshot_path']) if pd.notna(track['screenshot_path']) else "",
-            "notes": str(track['notes']) if pd.notna(track['notes']) else "",
-            "created_at": str(track['created_at']) if pd.notna(track['created_at']) else "",
-            "updated_at": str(track['updated_at']) if pd.notna(track['updated_at']) else "",
-            "analyst_name": analyst_name,
-            "analyst_id": str(track['user_id']) if pd.notna(track['user_id']) else ""
-        })
+    for row in await asyncio.to_thread(read_tracking_rows, startup_id=startup_id):
+        entry = tracking_response(row, fields)
+        entry['analyst_id'] = entry.pop('user_id')
+        tracking_list.append(entry)
     
     return {"tracking": tracking_list}
 
 @api_router.put("/users/{user_id}/tier")
-async def update_user_tier(user_id: str, tier_data: dict, user: dict = Depends(get_current_user)):
+def update_user_tier(user_id: str, tier_data: dict, user: dict = Depends(get_current_user)):
     """Update user tier and sync with startups.csv"""
     if user.get('tier') not in ['admin', 'venture_analyst']:
         raise HTTPException(status_code=403, detail="Access denied")
@@ -1748,19 +3802,20 @@ async def update_user_tier(user_id: str, tier_data: dict, user: dict = Depends(g
         raise HTTPException(status_code=400, detail="Invalid tier. Must be 'free', 'premium', or 'expert'")
     
     try:
-        users_df = load_users_df()
-        user_idx = users_df[users_df['id'] == user_id].index
-        
-        if user_idx.empty:
-            raise HTTPException(status_code=404, detail="User not found")
-        
-        user_email = users_df.at[user_idx[0], 'email']
-        old_tier = users_df.at[user_idx[0], 'tier']
-        
-        # Update tier in users.csv
-        users_df.at[user_idx[0], 'tier'] = new_tier
-        users_df.at[user_idx[0], 'upgraded_at'] = datetime.now(timezone.utc).isoformat()
-        save_users_df(users_df)
+        with _change_lock:
+            users_df = load_users_df()
+            user_idx = users_df[users_df['id'] == user_id].index
+            
+            if user_idx.empty:
+                raise HTTPException(status_code=404, detail="User not found")
+            
+            user_email = users_df.at[user_idx[0], 'email']
+            old_tier = users_df.at[user_idx[0], 'tier']
+            
+            # Update tier in users.csv
+            users_df.at[user_idx[0], 'tier'] = new_tier
+            users_df.at[user_idx[0], 'upgraded_at'] = datetime.now(timezone.utc).isoformat()
+            save_users_df(users_df, row_ids=[user_id])
         
         # Sync tier to startups.csv
         sync_user_tier_to_startup(user_email, new_tier)
@@ -1777,57 +3832,199 @@ async def update_user_tier(user_id: str, tier_data: dict, user: dict = Depends(g
         raise HTTPException(status_code=500, detail=f"Failed to update user tier: {str(e)}")
 
 @api_router.post("/tracking/{tracking_id}/screenshot")
-async def upload_screenshot(tracking_id: str, file: UploadFile = File(...), user: dict = Depends(get_current_user)):
-    """Upload screenshot for a tracking entry"""
+async def upload_screenshot(tracking_id: str, request: Request, user: dict = Depends(get_current_user)):
+    """Upload screenshot for a tracking entry (multipart field `file`)"""
     if user.get('tier') not in ['venture_analyst', 'expert', 'admin']:
         raise HTTPException(status_code=403, detail="Access denied")
     
     # Verify tracking entry exists and user has access
-    tracking_df = load_grant_tracking_df()
-    tracking_idx = tracking_df[tracking_df['id'] == tracking_id].index
+    tracking_entry = await asyncio.to_thread(read_tracking_row, tracking_id)
     
-    if tracking_idx.empty:
+    if tracking_entry is None:
         raise HTTPException(status_code=404, detail="Grant tracking not found")
     
     # Check if user has access to this tracking entry
-    tracking_entry = tracking_df.iloc[tracking_idx[0]]
     if user.get('tier') == 'venture_analyst' and tracking_entry['user_id'] != user['id']:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    # Create uploads directory if it doesn't exist
-    upload_dir = "backend/uploads/screenshots"
-    os.makedirs(upload_dir, exist_ok=True)
-    
-    # Generate unique filename
-    file_extension = file.filename.split('.')[-1] if '.' in file.filename else 'png'
-    filename = f"{tracking_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{file_extension}"
-    file_path = os.path.join(upload_dir, filename)
-    
-    # Save file
+    # Save file (type and size are validated while the body streams in)
     try:
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        # Update tracking entry with screenshot path
-        tracking_df.at[tracking_idx[0], 'screenshot_path'] = file_path
-        tracking_df.at[tracking_idx[0], 'updated_at'] = datetime.now(timezone.utc).isoformat()
-        save_grant_tracking_df(tracking_df)
+        stored_path = await receive_upload(request, 'screenshots')
+        schedule_image_derivatives(stored_path)
+        # Stored relative to the repo root, matching the /backend/uploads mount
+        file_path = f"backend/uploads/{stored_path}"
+        
+        # Update tracking entry with screenshot path, re-reading it since the upload took a while
+        updated = await asyncio.to_thread(update_tracking_row, tracking_id, {
+            'screenshot_path': file_path,
+            'updated_at': datetime.now(timezone.utc).isoformat()
+        })
+        if not updated:
+            raise HTTPException(status_code=404, detail="Grant tracking not found")
         
         return {"message": "Screenshot uploaded successfully", "file_path": file_path}
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to upload screenshot: {str(e)}")
 
-def generate_grants_pdf(grants_data, user_name="User"):
-    """Generate PDF with grants data in professional card-based layout"""
+# ============= PDF REPORTS =============
+# ReportLab builds are CPU-bound, so grant reports are rendered on a bounded thread
+# pool instead of the event loop. /grants/download-pdf returns the PDF once it is
+# built; with ?mode=async it returns a job at once, which the client polls at
+# /grants/pdf-jobs/{job_id} for progress before downloading the result.
+#
+# Reports are rendered in memory and cached in PDF_CACHE_DIR under a hash of
+# everything they are built from (user name, match rows, soft-approval state and
+# PDF_TEMPLATE_VERSION), so an unchanged report is served without touching ReportLab.
+# The "Generated on" timestamp is left out of the key: a cached report keeps the time
+# it was rendered, which is when its contents were last current. The cache is an LRU (recency = file
+# mtime) capped at PDF_CACHE_MAX_BYTES; cached reports are read into memory before
+# responding, so an eviction can't remove a file mid-response.
+
+PDF_WORKERS = 2
+PDF_JOB_TTL_SECONDS = 3600
+PDF_TEMPLATE_VERSION = 3  # bump whenever generate_grants_pdf's output changes
+PDF_CACHE_MAX_BYTES = int(os.environ.get('PDF_CACHE_MAX_BYTES', str(200 * 1024 * 1024)))
+
+_pdf_pool = ThreadPoolExecutor(max_workers=PDF_WORKERS, thread_name_prefix='pdf-reports')
+_pdf_jobs = {}  # job_id -> job dict
+_pdf_jobs_lock = threading.Lock()
+
+# Report styles are immutable once built, so they are created once and shared by all
+# builds; generate_grants_pdf only creates the per-report and per-grant flowables.
+# (Flowables keep layout state from wrap/split, so they can't be shared between
+# reports built concurrently on the PDF pool.)
+_report_sample_styles = getSampleStyleSheet()
+
+REPORT_HEADER_STYLE = ParagraphStyle(
+    'HeaderStyle',
+    parent=_report_sample_styles['Heading1'],
+    fontSize=28,
+    spaceAfter=15,
+    alignment=1,  # Center alignment
+    textColor=colors.HexColor('#5d248f'),
+    fontName='Helvetica-Bold'
+)
+
+REPORT_SUBTITLE_STYLE = ParagraphStyle(
+    'SubtitleStyle',
+    parent=_report_sample_styles['Normal'],
+    fontSize=14,
+    spaceAfter=25,
+    alignment=1,  # Center alignment
+    textColor=colors.HexColor('#666666'),
+    fontName='Helvetica'
+)
+
+REPORT_DATE_STYLE = ParagraphStyle(
+    'DateStyle',
+    parent=_report_sample_styles['Normal'],
+    fontSize=11,
+    spaceAfter=30,
+    alignment=1,
+    textColor=colors.HexColor('#888888'),
+    fontName='Helvetica-Oblique'
+)
+
+REPORT_GRANT_ID_STYLE = ParagraphStyle(
+    'GrantID',
+    parent=_report_sample_styles['Normal'],
+    fontSize=12,
+    textColor=colors.white,
+    fontName='Helvetica-Bold',
+    alignment=0,  # Left align
+    spaceAfter=0
+)
+
+REPORT_DETAIL_STYLE = ParagraphStyle(
+    'GrantDetail',
+    parent=_report_sample_styles['Normal'],
+    fontSize=11,
+    textColor=colors.black,
+    fontName='Helvetica',
+    spaceAfter=6,
+    leftIndent=0,
+    leading=14
+)
+
+REPORT_REASON_STYLE = ParagraphStyle(
+    'MatchReason',
+    parent=_report_sample_styles['Normal'],
+    fontSize=11,
+    textColor=colors.black,
+    fontName='Helvetica',
+    spaceAfter=8,
+    leftIndent=0,
+    rightIndent=0,
+    leading=14
+)
+
+REPORT_LINK_STYLE = ParagraphStyle(
+    'LinkStyle',
+    parent=_report_sample_styles['Normal'],
+    fontSize=11,
+    textColor=colors.HexColor('#5d248f'),
+    fontName='Helvetica',
+    spaceAfter=0,
+    leftIndent=0,
+    leading=14
+)
+
+REPORT_FOOTER_STYLE = ParagraphStyle(
+    'FooterStyle',
+    parent=_report_sample_styles['Normal'],
+    fontSize=9,
+    alignment=1,
+    textColor=colors.HexColor('#6c757d'),
+    fontName='Helvetica-Oblique'
+)
+
+REPORT_CARD_TABLE_STYLE = TableStyle([
+    # Card background and border
+    ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f8f9fa')),
+    ('BOX', (0, 0), (-1, -1), 1, colors.HexColor('#dee2e6')),
+    ('ROUNDEDCORNERS', (0, 0), (-1, -1), 8),
+    
+    # Padding
+    ('LEFTPADDING', (0, 0), (-1, -1), 20),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 20),
+    ('TOPPADDING', (0, 0), (-1, -1), 15),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 15),
     
-    # Create a temporary file
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.pdf')
-    temp_file.close()
+    # Header styling - ensure proper background
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#5d248f')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 16),
+    ('VALIGN', (0, 0), (-1, 0), 'MIDDLE'),
+    
+    # Content styling
+    ('VALIGN', (0, 1), (-1, -1), 'TOP'),
+])
+
+REPORT_DETAILS_TABLE_STYLE = TableStyle([
+    ('LEFTPADDING', (0, 0), (-1, -1), 0),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 0),
+    ('TOPPADDING', (0, 0), (-1, -1), 0),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 0),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+])
+
+def generate_grants_pdf(grants_data, user_name="User", progress=None, generated_on=None):
+    """Generate PDF with grants data in professional card-based layout
+    
+    progress: optional callable receiving the fraction (0-1) of the layout done
+    generated_on: the time printed on the report (defaults to now)
+    Returns the PDF bytes.
+    """
+    
+    # Render into memory; callers decide where the bytes go
+    buffer = io.BytesIO()
     
     # Create PDF document in portrait orientation for better readability
-    from reportlab.lib.pagesizes import A4
-    doc = SimpleDocTemplate(temp_file.name, pagesize=A4, 
+    doc = SimpleDocTemplate(buffer, pagesize=A4, 
                           rightMargin=40, leftMargin=40, 
                           topMargin=60, bottomMargin=40,
                           encoding='utf-8')
@@ -1835,52 +4032,15 @@ def generate_grants_pdf(grants_data, user_name="User"):
     # Container for the 'Flowable' objects
     elements = []
     
-    # Define styles
-    styles = getSampleStyleSheet()
-    
-    # Header style
-    header_style = ParagraphStyle(
-        'HeaderStyle',
-        parent=styles['Heading1'],
-        fontSize=28,
-        spaceAfter=15,
-        alignment=1,  # Center alignment
-        textColor=colors.HexColor('#5d248f'),
-        fontName='Helvetica-Bold'
-    )
-    
-    # Subtitle style
-    subtitle_style = ParagraphStyle(
-        'SubtitleStyle',
-        parent=styles['Normal'],
-        fontSize=14,
-        spaceAfter=25,
-        alignment=1,  # Center alignment
-        textColor=colors.HexColor('#666666'),
-        fontName='Helvetica'
-    )
-    
     # Add header with company branding
-    header = Paragraph("MyProBuddy Premium", header_style)
-    elements.append(header)
+    elements.append(Paragraph("MyProBuddy Premium", REPORT_HEADER_STYLE))
     
     # Add subtitle
-    subtitle = Paragraph(f"Grant Matches Report for {user_name}", subtitle_style)
-    elements.append(subtitle)
+    elements.append(Paragraph(f"Grant Matches Report for {user_name}", REPORT_SUBTITLE_STYLE))
     
     # Add generation date
-    from datetime import datetime
-    date_style = ParagraphStyle(
-        'DateStyle',
-        parent=styles['Normal'],
-        fontSize=11,
-        spaceAfter=30,
-        alignment=1,
-        textColor=colors.HexColor('#888888'),
-        fontName='Helvetica-Oblique'
-    )
-    date_text = Paragraph(f"Generated on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}", date_style)
-    elements.append(date_text)
+    generated_on = generated_on or datetime.now()
+    elements.append(Paragraph(f"Generated on {generated_on.strftime('%B %d, %Y at %I:%M %p')}", REPORT_DATE_STYLE))
     
     elements.append(Spacer(1, 20))
     
@@ -1893,30 +4053,9 @@ def generate_grants_pdf(grants_data, user_name="User"):
         grant_id = grant.get('grant_id', 'N/A')
         grant_name = grant.get('name', 'Unknown Grant')
         
-        # Create separate header elements for better control
-        grant_id_style = ParagraphStyle(
-            'GrantID',
-            parent=styles['Normal'],
-            fontSize=12,
-            textColor=colors.white,
-            fontName='Helvetica-Bold',
-            alignment=0,  # Left align
-            spaceAfter=0
-        )
-        
-        grant_name_style = ParagraphStyle(
-            'GrantName',
-            parent=styles['Normal'],
-            fontSize=16,
-            textColor=colors.white,
-            fontName='Helvetica-Bold',
-            alignment=0,  # Left align
-            spaceAfter=0
-        )
-        
         # Create header content
         header_content = f"<para align='left'><font name='Helvetica-Bold' size='12' color='white'>Grant #{grant_id}</font><br/><font name='Helvetica-Bold' size='16' color='white'>{grant_name}</font></para>"
-        card_data.append([Paragraph(header_content, grant_id_style)])
+        card_data.append([Paragraph(header_content, REPORT_GRANT_ID_STYLE)])
         
         # Grant details in a 2-column layout
         details_data = []
@@ -1943,20 +4082,8 @@ def generate_grants_pdf(grants_data, user_name="User"):
         right_details.append(f"<b>Funding Amount:</b> {funding_display}")
         right_details.append(f"<b>Match Score:</b> {grant.get('relevance_score', 'N/A')}%")
         
-        # Create detail paragraphs with better styling
-        detail_style = ParagraphStyle(
-            'GrantDetail',
-            parent=styles['Normal'],
-            fontSize=11,
-            textColor=colors.black,
-            fontName='Helvetica',
-            spaceAfter=6,
-            leftIndent=0,
-            leading=14
-        )
-        
-        left_para = Paragraph("<br/>".join(left_details), detail_style)
-        right_para = Paragraph("<br/>".join(right_details), detail_style)
+        left_para = Paragraph("<br/>".join(left_details), REPORT_DETAIL_STYLE)
+        right_para = Paragraph("<br/>".join(right_details), REPORT_DETAIL_STYLE)
         
         details_data.append([left_para, right_para])
         
@@ -1966,74 +4093,20 @@ def generate_grants_pdf(grants_data, user_name="User"):
         # Fix rupee symbols in match reasons - replace with Rs.
         reason_text = str(reason_text).replace('₹', 'Rs.').replace('&#x20b9;', 'Rs.')
         
-        reason_style = ParagraphStyle(
-            'MatchReason',
-            parent=styles['Normal'],
-            fontSize=11,
-            textColor=colors.black,
-            fontName='Helvetica',
-            spaceAfter=8,
-            leftIndent=0,
-            rightIndent=0,
-            leading=14
-        )
-        reason_para = Paragraph(f"<b>Why This Matches:</b> {reason_text}", reason_style)
+        reason_para = Paragraph(f"<b>Why This Matches:</b> {reason_text}", REPORT_REASON_STYLE)
         card_data.append([reason_para])
         
         # Add application link
         app_link = grant.get('application_link', 'N/A')
-        link_style = ParagraphStyle(
-            'LinkStyle',
-            parent=styles['Normal'],
-            fontSize=11,
-            textColor=colors.HexColor('#5d248f'),
-            fontName='Helvetica',
-            spaceAfter=0,
-            leftIndent=0,
-            leading=14
-        )
         if app_link != 'N/A' and app_link:
-            link_para = Paragraph(f"<b>Application Link:</b> <link href='{app_link}' color='#5d248f'>{app_link}</link>", link_style)
+            link_para = Paragraph(f"<b>Application Link:</b> <link href='{app_link}' color='#5d248f'>{app_link}</link>", REPORT_LINK_STYLE)
         else:
-            link_para = Paragraph(f"<b>Application Link:</b> Not Available", link_style)
+            link_para = Paragraph(f"<b>Application Link:</b> Not Available", REPORT_LINK_STYLE)
         card_data.append([link_para])
         
-        # Create the card table with better styling
-        card_table = Table(card_data, colWidths=[7*inch])
-        
-        # Enhanced card styling
-        card_table.setStyle(TableStyle([
-            # Card background and border
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f8f9fa')),
-            ('BOX', (0, 0), (-1, -1), 1, colors.HexColor('#dee2e6')),
-            ('ROUNDEDCORNERS', (0, 0), (-1, -1), 8),
-            
-            # Padding
-            ('LEFTPADDING', (0, 0), (-1, -1), 20),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 20),
-            ('TOPPADDING', (0, 0), (-1, -1), 15),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 15),
-            
-            # Header styling - ensure proper background
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#5d248f')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 16),
-            ('VALIGN', (0, 0), (-1, 0), 'MIDDLE'),
-            
-            # Content styling
-            ('VALIGN', (0, 1), (-1, -1), 'TOP'),
-        ]))
-        
-        # Create details table with better spacing
-        details_table = Table(details_data, colWidths=[3.5*inch, 3.5*inch])
-        details_table.setStyle(TableStyle([
-            ('LEFTPADDING', (0, 0), (-1, -1), 0),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 0),
-            ('TOPPADDING', (0, 0), (-1, -1), 0),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 0),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ]))
+        # Create the card table and the details table below it
+        card_table = Table(card_data, colWidths=[7*inch], style=REPORT_CARD_TABLE_STYLE)
+        details_table = Table(details_data, colWidths=[3.5*inch, 3.5*inch], style=REPORT_DETAILS_TABLE_STYLE)
         
         # Add the card to elements
         elements.append(card_table)
@@ -2049,91 +4122,464 @@ def generate_grants_pdf(grants_data, user_name="User"):
     
     # Add footer
     elements.append(Spacer(1, 30))
-    footer_style = ParagraphStyle(
-        'FooterStyle',
-        parent=styles['Normal'],
-        fontSize=9,
-        alignment=1,
-        textColor=colors.HexColor('#6c757d'),
-        fontName='Helvetica-Oblique'
-    )
-    footer = Paragraph("This report was generated by MyProBuddy Premium Grant Matching System", footer_style)
-    elements.append(footer)
+    elements.append(Paragraph("This report was generated by MyProBuddy Premium Grant Matching System", REPORT_FOOTER_STYLE))
     
     # Build PDF
+    if progress:
+        total = max(len(elements), 1)
+        doc.setProgressCallBack(lambda kind, value: progress(min(value / total, 1.0)) if kind == 'PROGRESS' else None)
     doc.build(elements)
     
-    return temp_file.name
+    return buffer.getvalue()
 
-@api_router.get("/grants/download-pdf")
-async def download_grants_pdf(user: dict = Depends(get_current_user)):
-    """Download grants as PDF with processing delay"""
+def collect_report_grants(user: dict) -> List[dict]:
+    """The user's grant matches for the PDF report, or sample grants if they have none"""
+    # Get user's grant matches
+    grant_matches_df = load_grant_matches_df()
+    user_matches = grant_matches_df[grant_matches_df['user_id'] == user['id']]
+    
+    grants_data = []
+    for _, match_row in user_matches.iterrows():
+        try:
+            match_data = json.loads(match_row['match_data'])
+            grants_data.append(match_data)
+        except (json.JSONDecodeError, KeyError):
+            continue
+    
+    # If no matches found, get sample grants
+    if not grants_data:
+        grants_df = load_grants_df()
+        if not grants_df.empty:
+            sample_grants = grants_df.head(10).to_dict('records')
+            for grant in sample_grants:
+                grants_data.append({
+                    "grant_id": str(grant['Grant ID']),
+                    "name": str(grant['Name']),
+                    "relevance_score": 85.0,
+                    "funding_amount": str(grant['Funding Amount']),
+                    "soft_approval": "Yes" if grant['Grant ID'] in load_soft_approvals() else "No",
+                    "deadline": str(grant['Due Date']),
+                    "reason": f"Sample match for {grant.get('Sector(s)', 'your sector')}",
+                    "sector": str(grant['Sector(s)']),
+                    "eligibility": str(grant['Eligibility Criteria']),
+                    "application_link": str(grant['Application Link']),
+                    "stage": str(grant['Stage of Startup'])
+                })
+    return grants_data
+
+def report_cache_key(user_name: str, grants_data: List[dict]) -> str:
+    """Hash of everything a report is rendered from, except its generation time"""
+    soft_ids = load_soft_approvals()
+    payload = {
+        'template_version': PDF_TEMPLATE_VERSION,
+        'user_name': user_name,
+        'grants': grants_data,
+        'soft_approved': [is_soft_approved(grant.get('grant_id'), soft_ids) for grant in grants_data],
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+def read_cached_pdf(path: Path) -> Optional[bytes]:
+    """Read a cached report and mark it as recently used; None if it isn't cached"""
     try:
-        # Add a realistic delay to simulate PDF generation time
-        import asyncio
-        await asyncio.sleep(3)  # Wait 3 seconds to simulate processing
-        
-        # Get user's grant matches
-        grant_matches_df = load_grant_matches_df()
-        user_matches = grant_matches_df[grant_matches_df['user_id'] == user['id']]
-        
-        grants_data = []
-        for _, match_row in user_matches.iterrows():
+        with open(path, 'rb') as cached_file:
+            pdf_bytes = cached_file.read()
+    except FileNotFoundError:
+        return None
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        pass  # evicted after we read it; the bytes are still good
+    return pdf_bytes
+
+def store_cached_pdf(path: Path, pdf_bytes: bytes):
+    """Atomically write a report to the cache, then evict least recently used reports over the cap"""
+    PDF_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(dir=PDF_CACHE_DIR, prefix='.report-', suffix='.part')
+    try:
+        with os.fdopen(fd, 'wb') as temp_file:
+            temp_file.write(pdf_bytes)
+        os.replace(temp_name, path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+    entries = []
+    for entry in os.scandir(PDF_CACHE_DIR):
+        if entry.name.endswith('.pdf'):
             try:
-                match_data = json.loads(match_row['match_data'])
-                grants_data.append(match_data)
-            except (json.JSONDecodeError, KeyError):
+                stat_result = entry.stat()
+            except FileNotFoundError:
                 continue
+            entries.append((stat_result.st_mtime, stat_result.st_size, entry.path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, entry_path in sorted(entries):
+        if total <= PDF_CACHE_MAX_BYTES:
+            break
+        if entry_path != str(path):
+            Path(entry_path).unlink(missing_ok=True)
+            total -= size
+
+def render_user_report(user: dict, progress=None) -> tuple:
+    """Return (cache path, PDF bytes) of the user's report, building it on a cache miss (blocking)"""
+    grants_data = collect_report_grants(user)
+    path = PDF_CACHE_DIR / f"{report_cache_key(user['name'], grants_data)}.pdf"
+    pdf_bytes = read_cached_pdf(path)
+    if pdf_bytes is None:
+        pdf_bytes = generate_grants_pdf(grants_data, user['name'], progress)
+        store_cached_pdf(path, pdf_bytes)
+    return path, pdf_bytes
+
+def report_filename(user: dict) -> str:
+    return f"grant_matches_{user['name'].replace(' ', '_')}.pdf"
+
+def pdf_file_response(pdf_bytes: bytes, user: dict) -> Response:
+    filename = report_filename(user)
+    return Response(
+        content=pdf_bytes,
+        media_type='application/pdf',
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+def pdf_job_status(job: dict) -> dict:
+    return {key: job[key] for key in ['job_id', 'status', 'progress', 'error']}
+
+def _prune_pdf_jobs():
+    """Forget finished jobs older than PDF_JOB_TTL_SECONDS (their PDFs stay in the cache)"""
+    cutoff = time.time() - PDF_JOB_TTL_SECONDS
+    for job_id, job in list(_pdf_jobs.items()):
+        if job['created_at'] < cutoff and job['status'] in ['done', 'failed']:
+            del _pdf_jobs[job_id]
+
+def _run_pdf_job(job: dict, user: dict):
+    job['status'] = 'rendering'
+    try:
+        # Only the path is kept; the download reads the cached file again
+        job['path'], _ = render_user_report(user, progress=lambda fraction: job.update(progress=round(fraction, 3)))
+        job['progress'] = 1.0
+        job['status'] = 'done'
+    except Exception as e:
+        logging.error(f"PDF job {job['job_id']} failed: {e}")
+        job['error'] = "Failed to generate PDF"
+        job['status'] = 'failed'
+
+def start_pdf_job(user: dict) -> dict:
+    """Queue a report build for the user, reusing their job that is still in progress"""
+    with _pdf_jobs_lock:
+        _prune_pdf_jobs()
+        for job in _pdf_jobs.values():
+            if job['user_id'] == user['id'] and job['status'] in ['queued', 'rendering']:
+                return job
+        job = {
+            'job_id': str(uuid.uuid4()),
+            'user_id': user['id'],
+            'status': 'queued',
+            'progress': 0.0,
+            'error': None,
+            'path': None,
+            'created_at': time.time()
+        }
+        _pdf_jobs[job['job_id']] = job
+    _pdf_pool.submit(_run_pdf_job, job, user)
+    return job
+
+def get_pdf_job(job_id: str, user: dict) -> dict:
+    job = _pdf_jobs.get(job_id)
+    if job is None or job['user_id'] != user['id']:
+        raise HTTPException(status_code=404, detail="PDF job not found")
+    return job
+
+@api_router.get("/grants/download-pdf")
+async def download_grants_pdf(mode: str = 'sync', user: dict = Depends(get_current_user)):
+    """Download grants as PDF
+    
+    - mode=async: return a job to poll at /grants/pdf-jobs/{job_id} instead of waiting for the build
+    """
+    if mode not in ['sync', 'async']:
+        raise HTTPException(status_code=400, detail="mode must be 'sync' or 'async'")
+    try:
+        if mode == 'async':
+            return JSONResponse(status_code=202, content=pdf_job_status(start_pdf_job(user)))
         
-        # If no matches found, get sample grants
-        if not grants_data:
-            grants_df = load_grants_df()
-            if not grants_df.empty:
-                sample_grants = grants_df.head(10).to_dict('records')
-                for grant in sample_grants:
-                    grants_data.append({
-                        "grant_id": str(grant['Grant ID']),
-                        "name": str(grant['Name']),
-                        "relevance_score": 85.0,
-                        "funding_amount": str(grant['Funding Amount']),
-                        "soft_approval": "Yes" if grant['Grant ID'] in load_soft_approvals() else "No",
-                        "deadline": str(grant['Due Date']),
-                        "reason": f"Sample match for {grant.get('Sector(s)', 'your sector')}",
-                        "sector": str(grant['Sector(s)']),
-                        "eligibility": str(grant['Eligibility Criteria']),
-                        "application_link": str(grant['Application Link']),
-                        "stage": str(grant['Stage of Startup'])
-                    })
-        
-        # Add another delay for PDF generation
-        await asyncio.sleep(2)  # Wait 2 more seconds for PDF generation
-        
-        # Generate PDF
-        pdf_path = generate_grants_pdf(grants_data, user['name'])
-        
-        return FileResponse(
-            pdf_path,
-            media_type='application/pdf',
-            filename=f"grant_matches_{user['name'].replace(' ', '_')}.pdf",
-            headers={"Content-Disposition": f"attachment; filename=grant_matches_{user['name'].replace(' ', '_')}.pdf"}
-        )
+        _, pdf_bytes = await asyncio.wrap_future(_pdf_pool.submit(render_user_report, user))
+        return pdf_file_response(pdf_bytes, user)
         
     except Exception as e:
         logging.error(f"PDF generation error: {e}")
         raise HTTPException(status_code=500, detail="Failed to generate PDF")
 
+@api_router.get("/grants/pdf-jobs/{job_id}")
+async def get_grants_pdf_job(job_id: str, user: dict = Depends(get_current_user)):
+    """Status and progress (0-1) of an async PDF job"""
+    return pdf_job_status(get_pdf_job(job_id, user))
+
+@api_router.get("/grants/pdf-jobs/{job_id}/download")
+async def download_grants_pdf_job(job_id: str, user: dict = Depends(get_current_user)):
+    """Download the PDF built by a finished async job"""
+    job = get_pdf_job(job_id, user)
+    if job['status'] == 'failed':
+        raise HTTPException(status_code=500, detail=job['error'])
+    if job['status'] != 'done':
+        raise HTTPException(status_code=409, detail="PDF is not ready yet")
+    pdf_bytes = await asyncio.to_thread(read_cached_pdf, job['path'])
+    if pdf_bytes is None:
+        raise HTTPException(status_code=410, detail="PDF was evicted from the cache; start a new job")
+    return pdf_file_response(pdf_bytes, user)
+
+# ============= CHANGE FEED =============
+
+def _change_visible_to(table: str, row: dict, user: dict, assigned_startup_ids: set) -> bool:
+    """Apply the same visibility rules as the full-table endpoints to a changed row (or its logged scope)"""
+    user_id = str(user['id'])
+    tier = user.get('tier')
+    
+    if table == 'grants':
+        return True
+    if table == 'notifications':
+        return row.get('to_user_id') == user_id
+    if tier == 'admin':
+        return True
+    if table == 'startup_assignments':
+        return user_id in (row.get('assigned_to_id'), row.get('startup_id'))
+    if table == 'grant_tracking':
+        if tier == 'venture_analyst':
+            return row.get('user_id') == user_id
+        if tier == 'incubation_admin':
+            return row.get('startup_id') in assigned_startup_ids
+        return row.get('startup_id') == user_id
+    return False
+
+@api_router.get("/changes")
+async def get_changes(since: int = 0, limit: int = 500, user: dict = Depends(get_current_user)):
+    """Get grants, tracking, notification and assignment rows changed since a cursor
+    
+    Rows are collapsed to their latest change; 'insert' and 'update' carry the row's
+    current state and should be upserted, 'delete' carries only the row id. 'archive'
+    (notifications only) also carries just the id: the row left the live table but is
+    still listed by /notifications/history. Pass the
+    returned cursor as `since` on the next poll. `reset` means the cursor is unknown to
+    the server and the client should re-fetch everything. A cursor older than the
+    retained log gets 410: re-fetch everything, then continue from the cursor in the
+    error detail.
+    """
+    limit = max(1, min(limit, 5000))
+    entries, has_more, latest_seq, floor = await asyncio.to_thread(read_change_log, since, limit)
+    if since < floor:
+        raise HTTPException(status_code=410, detail={
+            "error": "resync",
+            "message": "Cursor is older than the retained change log; re-fetch everything and continue from cursor",
+            "cursor": latest_seq
+        })
+    
+    assigned_startup_ids = set()
+    if user.get('tier') == 'incubation_admin' and any(entry['table'] == 'grant_tracking' for entry in entries):
+        assignments_df = load_startup_assignments_df()
+        my_assignments = assignments_df[assignments_df['assigned_to_id'] == user['id']]
+        assigned_startup_ids = set(my_assignments['startup_id'].astype(str))
+    
+    latest_by_row = {}
+    for entry in entries:
+        if _change_visible_to(entry['table'], entry['scope'], user, assigned_startup_ids):
+            latest_by_row[(entry['table'], entry['row_id'])] = entry
+    
+    changes = []
+    for entry in sorted(latest_by_row.values(), key=lambda e: e['seq']):
+        removed = entry['op'] in ('delete', 'archive')
+        row = entry['row'] if not removed else None
+        # A row deleted by a later change, or since moved out of this user's view, reads as deleted
+        if row is not None and not _change_visible_to(entry['table'], row, user, assigned_startup_ids):
+            row = None
+        changes.append({
+            "seq": entry['seq'],
+            "table": entry['table'],
+            "id": entry['row_id'],
+            "op": entry['op'] if row is not None or removed else 'delete',
+            "changed_at": entry['changed_at'],
+            "row": row
+        })
+    
+    return {
+        "changes": changes,
+        "cursor": entries[-1]['seq'] if entries else min(since, latest_seq),
+        "has_more": has_more,
+        "reset": since > latest_seq
+    }
+
+# ============= KPI COUNTERS =============
+# Admin KPIs are kept as in-memory counters updated from the users, grant_tracking
+# and startup_assignments change listeners, so /admin/kpis never rescans the tables.
+# run_kpi_reconciler periodically recomputes them from disk to correct any drift
+# (e.g. CSVs edited outside the app).
+
+KPI_RECONCILE_INTERVAL_SECONDS = 300
+
+_kpi_counters = None
+
+def compute_kpi_counters() -> dict:
+    """Count tiers, application statuses and assignments with a full scan of the tables"""
+    users_df = load_users_df()
+    tracking_df = load_grant_tracking_df()
+    assignments_df = load_startup_assignments_df()
+    return {
+        'tiers': Counter(users_df['tier'].fillna('').astype(str).tolist()),
+        'application_status': Counter(tracking_df['status'].fillna('').astype(str).tolist()) if not tracking_df.empty else Counter(),
+        'total_applications': len(tracking_df),
+        'total_assignments': len(assignments_df)
+    }
+
+def get_kpi_counters() -> dict:
+    """Return a copy of the live KPI counters, computing them on first use"""
+    global _kpi_counters
+    with _change_lock:
+        if _kpi_counters is None:
+            _kpi_counters = compute_kpi_counters()
+        # Listeners keep updating the live counters once the lock is released
+        return {key: Counter(value) if isinstance(value, Counter) else value for key, value in _kpi_counters.items()}
+
+def _comparable_kpis(counters) -> tuple:
+    # Unary + drops the zero counts left behind by incremental updates
+    return (+counters['tiers'], +counters['application_status'], counters['total_applications'], counters['total_assignments'])
+
+KPI_TABLES = ('users', 'grant_tracking', 'startup_assignments')
+
+def reconcile_kpi_counters() -> bool:
+    """Recompute the KPI counters from disk, returning whether the live counters had drifted"""
+    global _kpi_counters
+    # Rescan outside the change lock so saves aren't blocked for the whole scan; if any of the
+    # tables was saved meanwhile, the listeners already moved the counters and the next run retries
+    with _change_lock:
+        versions = get_table_version(*KPI_TABLES)
+    recomputed = compute_kpi_counters()
+    with _change_lock:
+        if get_table_version(*KPI_TABLES) != versions:
+            return False
+        drifted = _kpi_counters is not None and _comparable_kpis(_kpi_counters) != _comparable_kpis(recomputed)
+        if drifted:
+            logging.warning("KPI counters drifted from the stored tables; resetting from a full recompute")
+        _kpi_counters = recomputed
+    return drifted
+
+async def run_kpi_reconciler():
+    """Background task that reconciles the KPI counters every KPI_RECONCILE_INTERVAL_SECONDS"""
+    while True:
+        await asyncio.sleep(KPI_RECONCILE_INTERVAL_SECONDS)
+        try:
+            await asyncio.to_thread(reconcile_kpi_counters)
+        except Exception as e:
+            logging.error(f"Error reconciling KPI counters: {e}")
+
+def _apply_counter_changes(counter, column, changes):
+    """Move counts between values of column for inserted, updated and deleted rows"""
+    for entry in changes:
+        if entry['op'] in ('update', 'delete') and entry['previous'] is not None:
+            counter[entry['previous'].get(column, '')] -= 1
+        if entry['op'] in ('insert', 'update'):
+            counter[entry['row'].get(column, '')] += 1
+
+def _row_count_delta(changes) -> int:
+    return sum(1 if entry['op'] == 'insert' else -1 if entry['op'] == 'delete' else 0 for entry in changes)
+
+@on_table_change('users')
+def _update_user_kpis(changes):
+    if _kpi_counters is not None:
+        _apply_counter_changes(_kpi_counters['tiers'], 'tier', changes)
+
+@on_table_change('grant_tracking')
+def _update_tracking_kpis(changes):
+    if _kpi_counters is not None:
+        _apply_counter_changes(_kpi_counters['application_status'], 'status', changes)
+        _kpi_counters['total_applications'] += _row_count_delta(changes)
+
+@on_table_change('startup_assignments')
+def _update_assignment_kpis(changes):
+    if _kpi_counters is not None:
+        _kpi_counters['total_assignments'] += _row_count_delta(changes)
+
+# ============= FUNNEL ANALYTICS =============
+# Weekly registration cohorts and how far each startup got through the funnel.
+# Results are cached per data version of the tables they read.
+
+FUNNEL_STAGES = ['registered', 'screened', 'upgraded', 'applied', 'approved', 'disbursed']
+FUNNEL_TABLES = ('users', 'grant_tracking', 'startup_assignments')
+
+_funnel_cache = {}
+
+def parse_utc_dates(values) -> pd.Series:
+    """Parse ISO timestamp strings to UTC datetimes (missing or invalid values become NaT)"""
+    return pd.to_datetime(values, utc=True, errors='coerce', format='ISO8601')
+
+def compute_funnel(start=None, end=None, incubator_id=None) -> dict:
+    """Compute weekly cohort funnel counts, median hours to approval, total disbursed and success rate"""
+    users_df = load_users_df()
+    startups = users_df[~users_df['tier'].isin(NON_STARTUP_TIERS)]
+    if incubator_id:
+        startups = startups[startups['id'].isin(incubator_startup_ids(incubator_id, startups, users_df, load_startup_assignments_df()))]
+    registered_at = parse_utc_dates(startups['created_at'])
+    in_range = registered_at.notna()
+    if start is not None:
+        in_range &= registered_at >= start
+    if end is not None:
+        in_range &= registered_at < end
+    startups = startups[in_range]
+    registered_at = registered_at[in_range]
+    
+    tracking_df = load_grant_tracking_df()
+    tracking = tracking_df[tracking_df['startup_id'].isin(set(startups['id']))]
+    applied_at = parse_utc_dates(tracking['applied_date'])
+    approved_at = parse_utc_dates(tracking['approved_date'])
+    # A later stage implies the earlier ones (older rows may skip intermediate dates)
+    disbursed = parse_utc_dates(tracking['disbursed_date']).notna()
+    approved = approved_at.notna() | disbursed
+    applied = applied_at.notna() | approved
+    reached = pd.DataFrame({
+        'startup_id': tracking['startup_id'],
+        'applied': applied,
+        'approved': approved,
+        'disbursed': disbursed
+    }).groupby('startup_id').any()
+    
+    coupon_used = startups['coupon_used'].fillna('').astype(str).str.strip() != ''
+    stages = pd.DataFrame({
+        'registered': True,
+        'screened': parse_utc_dates(startups['screening_completed_at']).notna().values,
+        'upgraded': (parse_utc_dates(startups['upgraded_at']).notna() | coupon_used).values
+    }, index=pd.Index(startups['id'].values))
+    stages = stages.join(reached).fillna(False).astype(int)
+    stages.index = pd.DatetimeIndex(registered_at.values)
+    
+    cohorts = []
+    if not stages.empty:
+        weekly = stages[FUNNEL_STAGES].resample('W-MON', label='left', closed='left').sum()
+        for week_start, counts in zip(weekly.index, weekly.to_dict('records')):
+            cohorts.append({'week_start': week_start.date().isoformat(), **{stage: int(counts[stage]) for stage in FUNNEL_STAGES}})
+    
+    hours_to_approval = ((approved_at - applied_at).dt.total_seconds() / 3600).dropna()
+    disbursed_amounts = pd.to_numeric(tracking.loc[disbursed, 'disbursed_amount'], errors='coerce')
+    applications = int(applied.sum())
+    return {
+        'cohorts': cohorts,
+        'totals': {stage: int(stages[stage].sum()) for stage in FUNNEL_STAGES},
+        'median_hours_to_approval': round(float(hours_to_approval.median()), 2) if not hours_to_approval.empty else None,
+        'total_disbursed': float(disbursed_amounts.sum()),
+        'success_rate': round(100.0 * int(approved.sum()) / applications, 1) if applications else 0.0
+    }
+
+def get_funnel(start=None, end=None, incubator_id=None) -> dict:
+    """Return compute_funnel results, cached until one of the funnel tables changes"""
+    version = get_table_version(*FUNNEL_TABLES)
+    if _funnel_cache.get('version') != version:
+        _funnel_cache.clear()
+        _funnel_cache['version'] = version
+    key = (start, end, incubator_id)
+    if key not in _funnel_cache:
+        _funnel_cache[key] = compute_funnel(start, end, incubator_id)
+    return _funnel_cache[key]
+
 # ============= ADMIN ENDPOINTS =============
 
 @api_router.post("/admin/create-user")
-async def admin_create_user(request: CreateUserRequest, admin: dict = Depends(get_admin_user)):
+def admin_create_user(request: CreateUserRequest, admin: dict = Depends(get_admin_user)):
     """Admin endpoint to create venture analysts and incubation admins"""
     try:
-        users_df = load_users_df()
-        
-        # Check if email already exists
-        if not users_df.empty and (users_df['email'].str.lower() == request.email.lower()).any():
-            raise HTTPException(status_code=400, detail="Email already registered")
-        
         # Create new user
         user_id = str(uuid.uuid4())
         hashed_password = hash_password(request.password)
@@ -2155,8 +4601,14 @@ async def admin_create_user(request: CreateUserRequest, admin: dict = Depends(ge
             'calendly_link': ''
         }
         
-        users_df = pd.concat([users_df, pd.DataFrame([new_user])], ignore_index=True)
-        save_users_df(users_df)
+        with _change_lock:
+            users_df = load_users_df()
+            
+            # Check if email already exists
+            if not users_df.empty and (users_df['email'].str.lower() == request.email.lower()).any():
+                raise HTTPException(status_code=400, detail="Email already registered")
+            
+            append_table_rows('users', pd.DataFrame([new_user]), load_users_df, save_users_df)
         
         return {"message": "User created successfully", "user_id": user_id}
         
@@ -2165,15 +4617,9 @@ async def admin_create_user(request: CreateUserRequest, admin: dict = Depends(ge
         raise HTTPException(status_code=500, detail=str(e))
 
 @api_router.post("/admin/assign-startups")
-async def admin_assign_startups(request: AssignStartupsRequest, admin: dict = Depends(get_admin_user)):
+def admin_assign_startups(request: AssignStartupsRequest, admin: dict = Depends(get_admin_user)):
     """Admin endpoint to assign startups to venture analysts or incubation admins"""
     try:
-        assignments_df = load_startup_assignments_df()
-        
-        # Remove existing assignments for these startups to this user
-        assignments_df = assignments_df[~((assignments_df['startup_id'].isin(request.startup_ids)) & 
-                                         (assignments_df['assigned_to_id'] == request.user_id))]
-        
         # Create new assignments
         new_assignments = []
         for startup_id in request.startup_ids:
@@ -2187,8 +4633,14 @@ async def admin_assign_startups(request: AssignStartupsRequest, admin: dict = De
             })
         
         if new_assignments:
-            assignments_df = pd.concat([assignments_df, pd.DataFrame(new_assignments)], ignore_index=True)
-            save_startup_assignments_df(assignments_df)
+            with _change_lock:
+                assignments_df = load_startup_assignments_df()
+                
+                # Remove existing assignments for these startups to this user
+                replaced = (assignments_df['startup_id'].isin(request.startup_ids)) & (assignments_df['assigned_to_id'] == request.user_id)
+                changed_ids = list(assignments_df.loc[replaced, 'id']) + [assignment['id'] for assignment in new_assignments]
+                assignments_df = pd.concat([assignments_df[~replaced], pd.DataFrame(new_assignments)], ignore_index=True)
+                save_startup_assignments_df(assignments_df, row_ids=changed_ids)
         
         return {"message": "Startups assigned successfully", "count": len(request.startup_ids)}
         
@@ -2196,254 +4648,465 @@ async def admin_assign_startups(request: AssignStartupsRequest, admin: dict = De
         logging.error(f"Error assigning startups: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@api_router.get("/admin/all-startups")
-async def admin_get_all_startups(admin: dict = Depends(get_admin_user)):
-    """Get all startups with their information, tier, matched grants, and assigned analysts"""
-    try:
-        users_df = load_users_df()
-        startups_df = load_startups_df()
-        grant_matches_df = load_grant_matches_df()
-        assignments_df = load_startup_assignments_df()
-        tracking_df = load_grant_tracking_df()
-        grants_df = load_grants_df()
-        
-        # Helper function to handle NaN values and numpy types
-        def safe_value(value, default=''):
-            if pd.isna(value):
-                return default
-            # Convert numpy types to Python native types for JSON serialization
-            if hasattr(value, 'item'):  # numpy scalar
-                return value.item()
-            return value
-        
-        # Filter for startup users (not admin/venture_analyst/incubation_admin)
-        startup_users = users_df[~users_df['tier'].isin(['admin', 'venture_analyst', 'incubation_admin'])]
-        
-        startups_data = []
-        for _, user in startup_users.iterrows():
-            # Get startup details from startups.csv
-            startup_info = startups_df[startups_df['Email'].str.lower() == user['email'].lower()]
-            
-            profile = None
-            if not startup_info.empty:
-                startup = startup_info.iloc[0]
-                profile = {
-                    'startup_name': safe_value(startup.get('Name', '')),
-                    'founder_name': safe_value(startup.get('Founder Name', '')),
-                    'entity_type': safe_value(startup.get('Entity Type', '')),
-                    'location': safe_value(startup.get('Location', '')),
-                    'year_of_incorporation': safe_value(startup.get('Year of Incorporation', '')),
-                    'industry': safe_value(startup.get('Industry', '')),
-                    'company_size': safe_value(startup.get('Company Size', '')),
-                    'description': safe_value(startup.get('Description', '')),
-                    'contact_email': safe_value(startup.get('Contact Email', '')),
-                    'contact_phone': safe_value(startup.get('Contact Phone', '')),
-                    'ownership_type': safe_value(startup.get('Ownership Type', '')),
-                    'funding_need': safe_value(startup.get('Funding Need', 0)),
-                    'stage': safe_value(startup.get('Stage', '')),
-                    'revenue': safe_value(startup.get('Revenue', 0)),
-                    'stability': safe_value(startup.get('Stability', '')),
-                    'demographic': safe_value(startup.get('Demographic', '')),
-                    'track_record': safe_value(startup.get('Track Record', '')),
-                    'past_grant_experience': safe_value(startup.get('Past Grant Experience', ''))
-                }
-            
-            # Get matched grants
-            user_matches = grant_matches_df[grant_matches_df['user_id'] == user['id']]
-            matched_grants = []
-            for _, match in user_matches.iterrows():
-                try:
-                    match_data = json.loads(match['match_data']) if isinstance(match['match_data'], str) else match['match_data']
-                    matched_grants.append({
-                        'grant_id': match_data.get('grant_id', ''),
-                        'name': match_data.get('name', ''),
-                        'funding_amount': match_data.get('funding_amount', '')
-                    })
-                except:
-                    pass
-            
-            # Get assigned analyst (get the latest assignment)
-            assignment = assignments_df[assignments_df['startup_id'] == user['id']]
-            assigned_analyst = None
-            if not assignment.empty:
-                # Sort by assigned_at to get the latest assignment
-                assignment = assignment.sort_values('assigned_at', ascending=False)
-                analyst_id = assignment.iloc[0]['assigned_to_id']
-                analyst = users_df[users_df['id'] == analyst_id]
-                if not analyst.empty:
-                    assigned_analyst = {
-                        'id': analyst.iloc[0]['id'],
-                        'name': analyst.iloc[0]['name'],
-                        'type': assignment.iloc[0]['assigned_to_type']
-                    }
-            
-            # Get registration source (incubation admin who created registration link)
-            registration_source_info = None
-            if pd.notna(user.get('profile')) and user['profile']:
-                try:
-                    user_profile = json.loads(user['profile'])
-                    registration_source = user_profile.get('registration_source', '')
-                    if registration_source:
-                        # Find the incubation admin who owns this link
-                        links_df = load_incubation_links_df()
-                        link_row = links_df[links_df['link_code'] == registration_source]
-                        if not link_row.empty:
-                            incubation_admin_id = link_row.iloc[0]['incubation_admin_id']
-                            incubation_admin = users_df[users_df['id'] == incubation_admin_id]
-                            if not incubation_admin.empty:
-                                registration_source_info = {
-                                    'id': incubation_admin.iloc[0]['id'],
-                                    'name': incubation_admin.iloc[0]['name'],
-                                    'link_code': registration_source
-                                }
-                except:
-                    pass
-            
-            # Get tracking data for expert tier
-            tracking_data = []
-            if user['tier'] == 'expert':
-                user_tracking = tracking_df[tracking_df['startup_id'] == user['id']]
-                for _, track in user_tracking.iterrows():
-                    analyst_name = "Unknown"
-                    if pd.notna(track.get('user_id')):
-                        analyst = users_df[users_df['id'] == track['user_id']]
-                        if not analyst.empty:
-                            analyst_name = analyst.iloc[0]['name']
-                    
-                    # Get grant name from grants_df
-                    grant_name = "Unknown Grant"
-                    grant_id = track.get('grant_id', '')
-                    if not grants_df.empty and grant_id:
-                        grant_row = grants_df[grants_df['Grant ID'] == str(grant_id)]
-                        if not grant_row.empty:
-                            grant_name = grant_row.iloc[0].get('Name', 'Unknown Grant')
-                    
-                    tracking_data.append({
-                        'grant_id': track.get('grant_id', ''),
-                        'grant_name': grant_name,
-                        'status': track.get('status', ''),
-                        'progress': track.get('progress', ''),
-                        'applied_by': analyst_name
-                    })
-            
-            startups_data.append({
-                'id': safe_value(user['id']),
-                'name': safe_value(user['name']),
-                'email': safe_value(user['email']),
-                'tier': safe_value(user['tier']),
-                'created_at': safe_value(user.get('created_at', '')),
-                'password_hash': safe_value(user.get('password_hash', '')),
-                'has_completed_screening': bool(user.get('has_completed_screening', False)),
-                'profile': profile,
-                'matched_grants': matched_grants,
-                'assigned_analyst': assigned_analyst,
-                'registration_source_info': registration_source_info,
-                'tracking': tracking_data
+# Startup profile fields exposed to dashboards, keyed by their startups.csv column
+STARTUP_PROFILE_COLUMNS = {
+    'startup_name': 'Name',
+    'founder_name': 'Founder Name',
+    'entity_type': 'Entity Type',
+    'location': 'Location',
+    'year_of_incorporation': 'Year of Incorporation',
+    'industry': 'Industry',
+    'company_size': 'Company Size',
+    'description': 'Description',
+    'contact_email': 'Contact Email',
+    'contact_phone': 'Contact Phone',
+    'ownership_type': 'Ownership Type',
+    'funding_need': 'Funding Need',
+    'stage': 'Stage',
+    'revenue': 'Revenue',
+    'stability': 'Stability',
+    'demographic': 'Demographic',
+    'track_record': 'Track Record',
+    'past_grant_experience': 'Past Grant Experience'
+}
+NUMERIC_PROFILE_FIELDS = ['funding_need', 'revenue']
+
+def index_startup_profiles(startups_df) -> Dict[str, dict]:
+    """Map lower-cased startup email -> dashboard profile built from startups.csv"""
+    if startups_df.empty or 'Email' not in startups_df.columns:
+        return {}
+    startups = startups_df[startups_df['Email'].notna()]
+    fields = list(STARTUP_PROFILE_COLUMNS)
+    columns = []
+    for field in fields:
+        column = STARTUP_PROFILE_COLUMNS[field]
+        if column in startups.columns:
+            columns.append(startups[column].astype(object).where(startups[column].notna(), '').tolist())
+        else:
+            columns.append([0 if field in NUMERIC_PROFILE_FIELDS else ''] * len(startups))
+    
+    profiles = {}
+    emails = startups['Email'].astype(str).str.lower().tolist()
+    for email, values in zip(emails, zip(*columns)):
+        if email not in profiles:
+            profiles[email] = dict(zip(fields, values))
+    return profiles
+
+def group_matched_grants(grant_matches_df, user_ids) -> Dict[str, list]:
+    """Group grant match summaries by user_id, parsing each match_data payload once"""
+    grouped = {}
+    if grant_matches_df.empty:
+        return grouped
+    matches = grant_matches_df[grant_matches_df['user_id'].isin(user_ids)]
+    for user_id, match_data in zip(matches['user_id'].tolist(), matches['match_data'].tolist()):
+        try:
+            match_data = json.loads(match_data) if isinstance(match_data, str) else match_data
+            grouped.setdefault(user_id, []).append({
+                'grant_id': match_data.get('grant_id', ''),
+                'name': match_data.get('name', ''),
+                'funding_amount': match_data.get('funding_amount', '')
             })
+        except Exception:
+            pass
+    return grouped
+
+def latest_assignments_by_startup(assignments_df, users_df) -> Dict[str, dict]:
+    """Map startup_id -> the most recently assigned analyst/incubation admin"""
+    if assignments_df.empty or users_df.empty:
+        return {}
+    latest = assignments_df.sort_values('assigned_at', ascending=False, kind='stable')
+    latest = latest.drop_duplicates('startup_id', keep='first')
+    assignees = users_df[['id', 'name']].drop_duplicates('id').rename(columns={'id': 'assigned_to_id', 'name': 'assigned_to_name'})
+    latest = latest.merge(assignees, on='assigned_to_id', how='inner')
+    return {
+        row.startup_id: {
+            'id': row.assigned_to_id,
+            'name': row.assigned_to_name,
+            'type': row.assigned_to_type
+        }
+        for row in latest.itertuples(index=False)
+    }
+
+def registration_sources_by_user(users, users_df, links_df) -> Dict[str, dict]:
+    """Map user id -> the incubation admin whose registration link the user signed up with"""
+    sources = registration_source_column(users)
+    sources = dict(zip(users['id'].tolist(), sources.tolist()))
+    sources = {user_id: code for user_id, code in sources.items() if code}
+    if not sources or links_df.empty:
+        return {}
+    
+    links = links_df.drop_duplicates('link_code', keep='first')
+    admins = users_df[['id', 'name']].drop_duplicates('id').rename(columns={'id': 'incubation_admin_id'})
+    links = links[['link_code', 'incubation_admin_id']].merge(admins, on='incubation_admin_id', how='inner')
+    admin_by_code = {
+        row.link_code: {'id': row.incubation_admin_id, 'name': row.name, 'link_code': row.link_code}
+        for row in links.itertuples(index=False)
+    }
+    return {user_id: admin_by_code[code] for user_id, code in sources.items() if code in admin_by_code}
+
+def group_tracking_summaries(tracking_df, users_df, grants_df, startup_ids) -> Dict[str, list]:
+    """Group tracking summaries (grant name, status, progress, analyst) by startup_id"""
+    if tracking_df.empty:
+        return {}
+    tracking = tracking_df[tracking_df['startup_id'].isin(startup_ids)]
+    if tracking.empty:
+        return {}
+    
+    analyst_names = users_df.drop_duplicates('id').set_index('id')['name']
+    if not grants_df.empty and 'Grant ID' in grants_df.columns:
+        grant_names = grants_df.drop_duplicates('Grant ID').set_index('Grant ID')['Name']
+    else:
+        grant_names = pd.Series(dtype=object)
+    
+    summaries = pd.DataFrame({
+        'startup_id': tracking['startup_id'],
+        'grant_id': tracking['grant_id'],
+        'grant_name': tracking['grant_id'].astype(str).map(grant_names).fillna('Unknown Grant'),
+        'status': tracking['status'],
+        'progress': tracking['progress'],
+        'applied_by': tracking['user_id'].map(analyst_names).fillna('Unknown')
+    })
+    grouped = {}
+    for record in frame_to_records(summaries):
+        grouped.setdefault(record.pop('startup_id'), []).append(record)
+    return grouped
+
+# Optional startup card sections, each built from one grouped join per call
+STARTUP_CARD_SECTIONS = ['matched_grants', 'tracking', 'assigned_analyst']
+
+def build_startup_cards(startup_users, users_df, sections=STARTUP_CARD_SECTIONS, assigned_analysts=None) -> List[dict]:
+    """Build startup cards (core user fields plus the requested sections) for a frame of startup users
+    
+    assigned_analysts: a precomputed latest_assignments_by_startup map, if the caller has one
+    """
+    startup_ids = set(startup_users['id'])
+    matched_grants = group_matched_grants(load_grant_matches_df(), startup_ids) if 'matched_grants' in sections else {}
+    tracking = {}
+    if 'tracking' in sections:
+        # Tracking is only shown for expert tier startups
+        expert_ids = set(startup_users.loc[startup_users['tier'] == 'expert', 'id'])
+        tracking = group_tracking_summaries(load_grant_tracking_df(), users_df, load_grants_df(), expert_ids)
+    if 'assigned_analyst' in sections and assigned_analysts is None:
+        assigned_analysts = latest_assignments_by_startup(load_startup_assignments_df(), users_df)
+    
+    # Every value below is already a native, NaN-free Python value
+    cards = []
+    for user in frame_to_records(startup_users, fill=''):
+        user_id = user['id']
+        card = {
+            'id': user_id,
+            'name': user['name'],
+            'email': user['email'],
+            'tier': user['tier'],
+            'created_at': user.get('created_at', ''),
+            'has_completed_screening': bool(user.get('has_completed_screening', False))
+        }
+        if 'matched_grants' in sections:
+            card['matched_grants'] = matched_grants.get(user_id, [])
+        if 'tracking' in sections:
+            card['tracking'] = tracking.get(user_id, [])
+        if 'assigned_analyst' in sections:
+            card['assigned_analyst'] = assigned_analysts.get(user_id)
+        cards.append(card)
+    return cards
+
+def parse_user_profiles(startup_users) -> Dict[str, dict]:
+    """Map user id -> the parsed profile JSON stored on the users.csv row"""
+    profiles = {}
+    for user_id, profile in zip(startup_users['id'].tolist(), startup_users['profile'].tolist()):
+        profile_data = {}
+        if isinstance(profile, str) and profile:
+            try:
+                profile_data = json.loads(profile)
+            except Exception:
+                pass
+        profiles[user_id] = profile_data
+    return profiles
+
+# Fields of an admin startup record; list views default to the slim projection, and
+# the per-startup sections (profile, matched grants, tracking) come from the detail endpoint
+STARTUP_DETAIL_FIELDS = [
+    'id', 'name', 'email', 'tier', 'created_at', 'has_completed_screening', 'profile',
+    'matched_grants', 'assigned_analyst', 'registration_source_info', 'tracking'
+]
+STARTUP_LIST_FIELDS = [
+    'id', 'name', 'email', 'tier', 'created_at', 'has_completed_screening',
+    'assigned_analyst', 'registration_source_info'
+]
+STARTUP_SCREENING_FILTERS = ['completed', 'pending']
+STARTUP_PAGE_MAX_LIMIT = 1000
+NON_STARTUP_TIERS = ['admin', 'venture_analyst', 'incubation_admin']
+
+_startup_list_index = {}
+
+def encode_page_cursor(sort_key: int, row_id: str) -> str:
+    """Encode a (sort key, id) keyset position as an opaque cursor"""
+    return base64.urlsafe_b64encode(f"{sort_key}|{row_id}".encode()).decode()
+
+def decode_page_cursor(cursor: str) -> tuple:
+    """Decode a cursor produced by encode_page_cursor"""
+    try:
+        sort_key, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|', 1)
+        return int(sort_key), row_id
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def created_at_sort_keys(created_at) -> pd.Series:
+    """Parse created_at strings into sortable int64 nanosecond keys (unparseable dates sort oldest)"""
+    # Newer pandas may infer microsecond resolution; pin to ns so keys compare with Timestamp.value
+    parsed = pd.to_datetime(created_at, utc=True, errors='coerce', format='ISO8601').dt.as_unit('ns')
+    # NaT views as the minimum int64, so unparseable dates need no special casing
+    return pd.Series(parsed.values.view('int64'), index=parsed.index)
+
+def incubator_startup_ids(incubator_id, startup_users, users_df, assignments_df) -> set:
+    """Ids of startups assigned to an incubation admin or registered through their links"""
+    matching_ids = set(assignments_df.loc[assignments_df['assigned_to_id'] == incubator_id, 'startup_id'])
+    links_df = load_incubation_links_df()
+    admin_links = links_df[links_df['incubation_admin_id'] == incubator_id]
+    matching_ids |= set(registration_sources_by_user(startup_users, users_df, admin_links))
+    return matching_ids
+
+def get_startup_list_index() -> dict:
+    """Return startup users sorted newest first, plus the assignments they are filtered by, cached per data version
+    
+    Keys: users (all of users.csv), startups (startup users with _sort_key / _screened
+    columns, sorted by (_sort_key, id) descending), assignments and assigned_analysts
+    (latest_assignments_by_startup).
+    """
+    version = get_table_version('users', 'startup_assignments')
+    if _startup_list_index.get('version') != version:
+        users_df = load_users_df()
+        startup_users = users_df[~users_df['tier'].isin(NON_STARTUP_TIERS)]
+        startup_users = startup_users.assign(
+            _sort_key=created_at_sort_keys(startup_users['created_at']).values,
+            _screened=startup_users['has_completed_screening'].astype(str).str.lower().isin(['true', '1']).values
+        )
+        startup_users = startup_users.sort_values(['_sort_key', 'id'], ascending=False, kind='stable')
+        assignments_df = load_startup_assignments_df()
+        _startup_list_index.update(
+            version=version,
+            users=users_df,
+            startups=startup_users,
+            assignments=assignments_df,
+            assigned_analysts=latest_assignments_by_startup(assignments_df, users_df)
+        )
+    return _startup_list_index
+
+def build_admin_startup_records(startup_users, users_df, fields, assigned_analysts=None) -> List[dict]:
+    """Build admin startup records for the given startup users, computing only the requested fields"""
+    # Build each lookup once with grouped joins instead of per-user filtering
+    sections = [section for section in STARTUP_CARD_SECTIONS if section in fields]
+    cards = build_startup_cards(startup_users, users_df, sections, assigned_analysts)
+    profiles_by_email = {}
+    if 'profile' in fields:
+        joined = get_startup_user_join()
+        profiles_by_email = index_startup_profiles(joined[joined['user_id'].isin(set(startup_users['id']))])
+    registration_sources = {}
+    if 'registration_source_info' in fields:
+        registration_sources = registration_sources_by_user(startup_users, users_df, load_incubation_links_df())
+    
+    records = []
+    for card in cards:
+        card['profile'] = profiles_by_email.get(str(card['email']).lower())
+        card['registration_source_info'] = registration_sources.get(card['id'])
+        records.append({field: card[field] for field in fields})
+    return records
+
+@api_router.get("/admin/all-startups")
+async def admin_get_all_startups(
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    tier: Optional[str] = None,
+    screening: Optional[str] = None,
+    analyst_id: Optional[str] = None,
+    incubator_id: Optional[str] = None,
+    industry: Optional[str] = None,
+    q: Optional[str] = None,
+    order: str = 'desc',
+    fields: Optional[str] = None,
+    admin: dict = Depends(get_admin_user)
+):
+    """Get a page of startups sorted by created_at, with server-side filters and field projection
+    
+    - tier: comma-separated tiers (free, premium, expert)
+    - screening: 'completed' or 'pending'
+    - analyst_id / incubator_id: startups assigned to that user (incubator_id also matches
+      startups registered through the incubation admin's links)
+    - industry: case-insensitive match on the startup's industry
+    - q: case-insensitive substring of the startup's name (for typeahead search)
+    - fields: comma-separated record fields (defaults to the slim list projection)
+    - cursor: the next_cursor value returned by the previous page
+    """
+    if order not in ['asc', 'desc']:
+        raise HTTPException(status_code=400, detail="order must be 'asc' or 'desc'")
+    if screening is not None and screening not in STARTUP_SCREENING_FILTERS:
+        raise HTTPException(status_code=400, detail="screening must be 'completed' or 'pending'")
+    selected_fields = [f.strip() for f in fields.split(',') if f.strip()] if fields else STARTUP_LIST_FIELDS
+    unknown_fields = set(selected_fields) - set(STARTUP_DETAIL_FIELDS)
+    if unknown_fields:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown_fields))}")
+    limit = max(1, min(limit, STARTUP_PAGE_MAX_LIMIT))
+    cursor_position = decode_page_cursor(cursor) if cursor else None
+    
+    try:
+        # The sorted startup list and assignment lookups are rebuilt only when users.csv or
+        # startup_assignments.csv change, so a page request doesn't reload and re-sort them
+        index = get_startup_list_index()
+        users_df = index['users']
+        startup_users = index['startups']
+        
+        # Server-side filters, applied before any per-startup work
+        if tier:
+            startup_users = startup_users[startup_users['tier'].isin([t.strip() for t in tier.split(',')])]
+        if screening:
+            startup_users = startup_users[startup_users['_screened'] == (screening == 'completed')]
+        if analyst_id or incubator_id:
+            assignments_df = index['assignments']
+            for assignee_id in [analyst_id, incubator_id]:
+                if not assignee_id:
+                    continue
+                if assignee_id == incubator_id:
+                    matching_ids = incubator_startup_ids(incubator_id, startup_users, users_df, assignments_df)
+                else:
+                    matching_ids = set(assignments_df.loc[assignments_df['assigned_to_id'] == assignee_id, 'startup_id'])
+                startup_users = startup_users[startup_users['id'].isin(matching_ids)]
+        if industry:
+            joined = get_startup_user_join()
+            industry_user_ids = joined.loc[joined['Industry'].astype(str).str.lower() == industry.lower(), 'user_id']
+            startup_users = startup_users[startup_users['id'].isin(set(industry_user_ids.dropna()))]
+        if q and q.strip():
+            names = startup_users['name'].fillna('').astype(str).str.lower()
+            startup_users = startup_users[names.str.contains(q.strip().lower(), regex=False)]
+        
+        # Keyset pagination over (created_at, id); the index is already sorted newest first
+        ascending = order == 'asc'
+        if ascending:
+            startup_users = startup_users.iloc[::-1]
+        total = len(startup_users)
+        
+        if cursor_position:
+            cursor_key, cursor_id = cursor_position
+            if ascending:
+                after = (startup_users['_sort_key'] > cursor_key) | ((startup_users['_sort_key'] == cursor_key) & (startup_users['id'] > cursor_id))
+            else:
+                after = (startup_users['_sort_key'] < cursor_key) | ((startup_users['_sort_key'] == cursor_key) & (startup_users['id'] < cursor_id))
+            startup_users = startup_users[after]
         
-        return {"startups": convert_numpy_types(startups_data)}
+        page = startup_users.head(limit)
+        next_cursor = None
+        if len(startup_users) > limit:
+            last = page.iloc[-1]
+            next_cursor = encode_page_cursor(int(last['_sort_key']), last['id'])
+        
+        page = page.drop(columns=['_sort_key', '_screened'])
+        return {
+            "startups": build_admin_startup_records(page, users_df, selected_fields, index['assigned_analysts']),
+            "total": total,
+            "next_cursor": next_cursor
+        }
         
     except Exception as e:
         logging.error(f"Error fetching startups: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@api_router.get("/admin/startups/{startup_id}")
+async def admin_get_startup(startup_id: str, admin: dict = Depends(get_admin_user)):
+    """Get one startup's expanded record (profile, matched grants, assignment, tracking)"""
+    try:
+        users_df = load_users_df()
+        startup_user = users_df[(users_df['id'] == startup_id) & ~users_df['tier'].isin(NON_STARTUP_TIERS)]
+    except Exception as e:
+        logging.error(f"Error fetching startup: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    if startup_user.empty:
+        raise HTTPException(status_code=404, detail="Startup not found")
+    
+    return {"startup": build_admin_startup_records(startup_user.head(1), users_df, STARTUP_DETAIL_FIELDS)[0]}
+
+@api_router.post("/admin/notifications/sweep")
+async def admin_sweep_notifications(retention_days: Optional[int] = None, admin: dict = Depends(get_admin_user)):
+    """Archive read notifications older than retention_days (defaults to NOTIFICATION_RETENTION_DAYS) now"""
+    if retention_days is not None and retention_days < 0:
+        raise HTTPException(status_code=400, detail="retention_days must be non-negative")
+    try:
+        days = NOTIFICATION_RETENTION_DAYS if retention_days is None else retention_days
+        return await asyncio.to_thread(sweep_notifications, days)
+    except Exception as e:
+        logging.error(f"Error sweeping notifications: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@api_router.post("/admin/uploads/gc")
+async def admin_collect_uploads(min_age_seconds: Optional[int] = None, admin: dict = Depends(get_admin_user)):
+    """Delete uploads no row references now
+    
+    - min_age_seconds: defaults to UPLOAD_GC_MIN_AGE_SECONDS; values below UPLOAD_GC_MIN_AGE_FLOOR_SECONDS are raised to it
+    """
+    if min_age_seconds is not None and min_age_seconds < 0:
+        raise HTTPException(status_code=400, detail="min_age_seconds must be non-negative")
+    try:
+        age = UPLOAD_GC_MIN_AGE_SECONDS if min_age_seconds is None else min_age_seconds
+        return await asyncio.to_thread(collect_orphaned_uploads, age)
+    except Exception as e:
+        logging.error(f"Error collecting orphaned uploads: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @api_router.get("/admin/kpis")
 async def admin_get_kpis(admin: dict = Depends(get_admin_user)):
     """Get admin KPIs"""
     try:
-        users_df = load_users_df()
-        tracking_df = load_grant_tracking_df()
-        assignments_df = load_startup_assignments_df()
-        
-        total_startups = len(users_df[~users_df['tier'].isin(['admin', 'venture_analyst', 'incubation_admin'])])
-        total_analysts = len(users_df[users_df['tier'] == 'venture_analyst'])
-        total_incubation_admins = len(users_df[users_df['tier'] == 'incubation_admin'])
-        
-        # Tier distribution
-        tier_counts = users_df[~users_df['tier'].isin(['admin', 'venture_analyst', 'incubation_admin'])]['tier'].value_counts().to_dict()
-        
-        # Tracking stats
-        total_applications = len(tracking_df)
-        status_counts = tracking_df['status'].value_counts().to_dict() if not tracking_df.empty else {}
+        # Background saves hold the change lock during CSV I/O, so wait for it off the event loop
+        counters = await asyncio.to_thread(get_kpi_counters)
+        tiers = counters['tiers']
+        startup_tiers = {tier: count for tier, count in tiers.most_common() if tier not in NON_STARTUP_TIERS and count > 0}
         
-        # Assignment stats
-        total_assignments = len(assignments_df)
+        # Startups without a tier count towards the total but not the distribution
+        total_startups = sum(startup_tiers.values())
+        startup_tiers.pop('', None)
         
         return {
-            "total_startups": int(total_startups),
-            "total_analysts": int(total_analysts),
-            "total_incubation_admins": int(total_incubation_admins),
-            "tier_distribution": tier_counts,
-            "total_applications": int(total_applications),
-            "application_status": status_counts,
-            "total_assignments": int(total_assignments)
+            "total_startups": total_startups,
+            "total_analysts": tiers['venture_analyst'],
+            "total_incubation_admins": tiers['incubation_admin'],
+            "tier_distribution": startup_tiers,
+            "total_applications": counters['total_applications'],
+            "application_status": {status: count for status, count in counters['application_status'].most_common() if status and count > 0},
+            "total_assignments": counters['total_assignments']
         }
         
     except Exception as e:
         logging.error(f"Error fetching KPIs: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@api_router.get("/admin/analytics/funnel")
+async def admin_get_funnel(
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    incubator_id: Optional[str] = None,
+    admin: dict = Depends(get_admin_user)
+):
+    """Get the weekly cohort funnel (registered -> disbursed) for startups registered in [start, end]
+    
+    - start / end: ISO dates, both inclusive
+    - incubator_id: only startups assigned to or registered via that incubation admin
+    """
+    try:
+        start_at = pd.Timestamp(start, tz='UTC') if start else None
+        end_at = pd.Timestamp(end, tz='UTC') + pd.Timedelta(days=1) if end else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="start and end must be ISO dates (YYYY-MM-DD)")
+    
+    try:
+        return get_funnel(start_at, end_at, incubator_id)
+    except Exception as e:
+        logging.error(f"Error computing funnel analytics: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @api_router.post("/admin/grants")
 async def admin_create_grant(request: CreateGrantRequest, admin: dict = Depends(get_admin_user)):
     """Admin endpoint to add new grants"""
     try:
-        grants_df = load_grants_df()
-        
-        # Generate new grant ID by finding the highest numeric ID and incrementing
-        max_id = 0
-        if not grants_df.empty and 'Grant ID' in grants_df.columns:
-            # Filter only numeric IDs and find max
-            numeric_ids = pd.to_numeric(grants_df['Grant ID'], errors='coerce').dropna()
-            if not numeric_ids.empty:
-                max_id = int(numeric_ids.max())
-        new_grant_id = str(max_id + 1)
-        
-        # Create new grant entry with all CSV fields
-        sector_value = request.sector
-        if request.sector == 'Other' and request.sector_other:
-            sector_value = request.sector_other
-        
-        new_grant = {
-            'Grant ID': new_grant_id,
-            'Name': request.name,
-            'Sector(s)': sector_value,
-            'Eligibility Criteria': request.eligibility,
-            'Funding Amount': request.funding_amount,
-            'Funding Type': request.funding_type,
-            'Funding Ratio': request.funding_ratio,
-            'Application Link': request.application_link,
-            'Documents Required': request.documents_required,
-            'Due Date': request.deadline,
-            'Region/Focus': request.region_focus,
-            'Contact Info': request.contact_info,
-            'Place': request.place,
-            'Created At': datetime.now(timezone.utc).strftime('%Y-%m-%d'),
-            'Soft Approval': request.soft_approval,
-            'Stage of Startup': request.stage,
-            'Sector Focus': request.sector_focus,
-            'Gender Focus': request.gender_focus,
-            'Innovation Type': request.innovation_type,
-            'TRL': request.trl,
-            'Impact Criteria': request.impact_criteria,
-            'Co-investment Requirement': request.co_investment_requirement,
-            'Matching Investment': request.matching_investment,
-            'Repayment Terms': request.repayment_terms,
-            'Disbursement Schedule': request.disbursement_schedule,
-            'Mentorship/Training': request.mentorship_training,
-            'Program Duration': request.program_duration,
-            'Success Metrics': request.success_metrics
-        }
-        
-        grants_df = pd.concat([grants_df, pd.DataFrame([new_grant])], ignore_index=True)
-        save_grants_df(grants_df)
-        
-        # Add to soft approval if needed
-        if request.soft_approval == "Yes":
-            soft_approvals = load_soft_approvals()
-            soft_approvals_df = pd.DataFrame(soft_approvals, columns=['grant_id'])
-            soft_approvals_df = pd.concat([soft_approvals_df, pd.DataFrame([{'grant_id': new_grant_id}])], ignore_index=True)
-            soft_approvals_df.to_csv(SOFT_APPROVAL_CSV, index=False)
-        
+        new_grant_id = await asyncio.to_thread(create_grant, request)
         return {"message": "Grant created successfully", "grant_id": new_grant_id}
         
     except Exception as e:
@@ -2551,77 +5214,26 @@ async def incubation_get_startups(incubation_admin: dict = Depends(get_incubatio
     try:
         users_df = load_users_df()
         assignments_df = load_startup_assignments_df()
-        grant_matches_df = load_grant_matches_df()
-        tracking_df = load_grant_tracking_df()
-        grants_df = load_grants_df()
         
         # Get assigned startups
         assigned_startups = assignments_df[assignments_df['assigned_to_id'] == incubation_admin['id']]['startup_id'].tolist()
         
         # Filter startups
         startups = users_df[users_df['id'].isin(assigned_startups)]
+        profiles = parse_user_profiles(startups)
         
         startups_data = []
-        for _, user in startups.iterrows():
-            # Parse profile data
-            profile_data = {}
-            if pd.notna(user.get('profile')) and user['profile']:
-                try:
-                    profile_data = json.loads(user['profile'])
-                except:
-                    pass
-            
-            # Get matched grants
-            user_matches = grant_matches_df[grant_matches_df['user_id'] == user['id']]
-            matched_grants = []
-            for _, match in user_matches.iterrows():
-                try:
-                    match_data = json.loads(match['match_data']) if isinstance(match['match_data'], str) else match['match_data']
-                    matched_grants.append({
-                        'grant_id': match_data.get('grant_id', ''),
-                        'name': match_data.get('name', ''),
-                        'funding_amount': match_data.get('funding_amount', '')
-                    })
-                except:
-                    pass
-            
-            # Get tracking data for expert tier
-            tracking_data = []
-            if user['tier'] == 'expert':
-                user_tracking = tracking_df[tracking_df['startup_id'] == user['id']]
-                for _, track in user_tracking.iterrows():
-                    analyst_name = "Unknown"
-                    if pd.notna(track.get('user_id')):
-                        analyst = users_df[users_df['id'] == track['user_id']]
-                        if not analyst.empty:
-                            analyst_name = analyst.iloc[0]['name']
-                    
-                    # Get grant name from grants_df
-                    grant_name = "Unknown Grant"
-                    grant_id = track.get('grant_id', '')
-                    if not grants_df.empty and grant_id:
-                        grant_row = grants_df[grants_df['Grant ID'] == str(grant_id)]
-                        if not grant_row.empty:
-                            grant_name = grant_row.iloc[0].get('Name', 'Unknown Grant')
-                    
-                    tracking_data.append({
-                        'grant_id': track.get('grant_id', ''),
-                        'grant_name': grant_name,
-                        'status': track.get('status', ''),
-                        'progress': track.get('progress', ''),
-                        'applied_by': analyst_name
-                    })
-            
+        for card in build_startup_cards(startups, users_df, ['matched_grants', 'tracking']):
             startups_data.append({
-                'id': user['id'],
-                'name': user['name'],
-                'email': user['email'],
-                'tier': user['tier'],
-                'created_at': user.get('created_at', ''),
-                'has_completed_screening': bool(user.get('has_completed_screening', False)),
-                'profile': profile_data,
-                'matched_grants': matched_grants,
-                'tracking': tracking_data
+                'id': card['id'],
+                'name': card['name'],
+                'email': card['email'],
+                'tier': card['tier'],
+                'created_at': card['created_at'],
+                'has_completed_screening': card['has_completed_screening'],
+                'profile': profiles[card['id']],
+                'matched_grants': card['matched_grants'],
+                'tracking': card['tracking']
             })
         
         return {"startups": convert_numpy_types(startups_data)}
@@ -2634,62 +5246,7 @@ async def incubation_get_startups(incubation_admin: dict = Depends(get_incubatio
 async def incubation_create_grant(request: CreateGrantRequest, incubation_admin: dict = Depends(get_incubation_admin_user)):
     """Incubation admin endpoint to add new grants"""
     try:
-        grants_df = load_grants_df()
-        
-        # Generate new grant ID by finding the highest numeric ID and incrementing
-        max_id = 0
-        if not grants_df.empty and 'Grant ID' in grants_df.columns:
-            # Filter only numeric IDs and find max
-            numeric_ids = pd.to_numeric(grants_df['Grant ID'], errors='coerce').dropna()
-            if not numeric_ids.empty:
-                max_id = int(numeric_ids.max())
-        new_grant_id = str(max_id + 1)
-        
-        # Create new grant entry with all CSV fields
-        sector_value = request.sector
-        if request.sector == 'Other' and request.sector_other:
-            sector_value = request.sector_other
-        
-        new_grant = {
-            'Grant ID': new_grant_id,
-            'Name': request.name,
-            'Sector(s)': sector_value,
-            'Eligibility Criteria': request.eligibility,
-            'Funding Amount': request.funding_amount,
-            'Funding Type': request.funding_type,
-            'Funding Ratio': request.funding_ratio,
-            'Application Link': request.application_link,
-            'Documents Required': request.documents_required,
-            'Due Date': request.deadline,
-            'Region/Focus': request.region_focus,
-            'Contact Info': request.contact_info,
-            'Place': request.place,
-            'Created At': datetime.now(timezone.utc).strftime('%Y-%m-%d'),
-            'Soft Approval': request.soft_approval,
-            'Stage of Startup': request.stage,
-            'Sector Focus': request.sector_focus,
-            'Gender Focus': request.gender_focus,
-            'Innovation Type': request.innovation_type,
-            'TRL': request.trl,
-            'Impact Criteria': request.impact_criteria,
-            'Co-investment Requirement': request.co_investment_requirement,
-            'Matching Investment': request.matching_investment,
-            'Repayment Terms': request.repayment_terms,
-            'Disbursement Schedule': request.disbursement_schedule,
-            'Mentorship/Training': request.mentorship_training,
-            'Program Duration': request.program_duration,
-            'Success Metrics': request.success_metrics
-        }
-        
-        grants_df = pd.concat([grants_df, pd.DataFrame([new_grant])], ignore_index=True)
-        save_grants_df(grants_df)
-        
-        if request.soft_approval == "Yes":
-            soft_approvals = load_soft_approvals()
-            soft_approvals_df = pd.DataFrame(soft_approvals, columns=['grant_id'])
-            soft_approvals_df = pd.concat([soft_approvals_df, pd.DataFrame([{'grant_id': new_grant_id}])], ignore_index=True)
-            soft_approvals_df.to_csv(SOFT_APPROVAL_CSV, index=False)
-        
+        new_grant_id = await asyncio.to_thread(create_grant, request)
         return {"message": "Grant created successfully", "grant_id": new_grant_id}
         
     except Exception as e:
@@ -2742,35 +5299,134 @@ async def incubation_get_grants(incubation_admin: dict = Depends(get_incubation_
         logging.error(f"Error fetching grants: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# ============= REGISTRATION SOURCE INDEX =============
+# registration_source (the link code a startup signed up with) and incubation_admin_id
+# are stored as users.csv columns. Older rows only had them inside the profile JSON;
+# backfill_registration_columns copies them over at startup.
+
+REGISTRATION_COLUMNS = ['registration_source', 'incubation_admin_id']
+
+_registration_index = None  # link_code -> set of user ids
+_registration_index_lock = threading.Lock()
+
+def profile_registration_source(profile) -> str:
+    """Read the legacy registration_source key out of a profile JSON string"""
+    if not isinstance(profile, str) or not profile:
+        return ''
+    try:
+        profile_data = json.loads(profile)
+    except (json.JSONDecodeError, TypeError):
+        return ''
+    if not isinstance(profile_data, dict):
+        return ''
+    return profile_data.get('registration_source') or ''
+
+def registration_source_column(users_df, fallback_to_profile: bool = False) -> pd.Series:
+    """Return registration_source as clean strings ('' when unset), optionally reading legacy profiles"""
+    if 'registration_source' in users_df.columns:
+        sources = users_df['registration_source'].fillna('').astype(str).str.strip()
+    else:
+        sources = pd.Series('', index=users_df.index)
+        fallback_to_profile = True
+    if fallback_to_profile:
+        missing = sources == ''
+        sources = sources.copy()
+        sources[missing] = users_df.loc[missing, 'profile'].map(profile_registration_source)
+    return sources
+
+def backfill_registration_columns() -> int:
+    """Copy registration_source / incubation_admin_id from profile JSON into their own columns"""
+    try:
+        users_df = load_users_df()
+        if users_df.empty:
+            return 0
+        columns_added = False
+        for column in REGISTRATION_COLUMNS:
+            if column not in users_df.columns:
+                users_df[column] = ''
+                columns_added = True
+        users_df[REGISTRATION_COLUMNS] = users_df[REGISTRATION_COLUMNS].astype(object)
+        
+        admin_by_code = {}
+        links_df = load_incubation_links_df()
+        if not links_df.empty:
+            admin_by_code = dict(zip(links_df['link_code'], links_df['incubation_admin_id']))
+        
+        stored = registration_source_column(users_df)
+        sources = registration_source_column(users_df, fallback_to_profile=True)
+        backfill = (stored == '') & (sources != '')
+        for idx in users_df.index[backfill]:
+            link_code = sources[idx]
+            users_df.at[idx, 'registration_source'] = link_code
+            users_df.at[idx, 'incubation_admin_id'] = admin_by_code.get(link_code, '')
+        updated = int(backfill.sum())
+        
+        if columns_added or updated:
+            save_users_df(users_df)
+            logging.info(f"Backfilled registration source for {updated} users")
+        return updated
+    except Exception as e:
+        logging.error(f"Error backfilling registration source columns: {e}")
+        return 0
+
+def get_registration_index() -> Dict[str, set]:
+    """Return the link_code -> user ids index, building it from users.csv on first use"""
+    global _registration_index
+    with _registration_index_lock:
+        if _registration_index is None:
+            users_df = load_users_df()
+            index = {}
+            codes = registration_source_column(users_df, fallback_to_profile=True)
+            for user_id, code in zip(users_df['id'].tolist(), codes.tolist()):
+                if code:
+                    index.setdefault(code, set()).add(user_id)
+            _registration_index = index
+        return _registration_index
+
+@on_table_change('users')
+def _update_registration_index(changes):
+    """Keep the registration index in step with users.csv writes"""
+    with _registration_index_lock:
+        if _registration_index is None:
+            return
+        for entry in changes:
+            previous_code = (entry['previous'] or {}).get('registration_source', '').strip()
+            if previous_code:
+                _registration_index.get(previous_code, set()).discard(entry['row_id'])
+            code = entry['row'].get('registration_source', '').strip()
+            if entry['op'] != 'delete' and code:
+                _registration_index.setdefault(code, set()).add(entry['row_id'])
+
 # ============= INCUBATION ADMIN REGISTRATION LINKS =============
 
 @api_router.post("/incubation-admin/generate-link")
-async def generate_incubation_registration_link(incubation_admin: dict = Depends(get_incubation_admin_user)):
+def generate_incubation_registration_link(incubation_admin: dict = Depends(get_incubation_admin_user)):
     """Generate a unique registration link for the incubation admin"""
     try:
-        links_df = load_incubation_links_df()
-        
-        # Generate unique link code
-        link_code = generate_link_code()
-        while not links_df.empty and link_code in links_df['link_code'].values:
+        with _change_lock:
+            links_df = load_incubation_links_df()
+            
+            # Generate unique link code
             link_code = generate_link_code()
-        
-        # Create new link
-        link_id = str(uuid.uuid4())
-        new_link = {
-            'id': link_id,
-            'incubation_admin_id': incubation_admin['id'],
-            'incubation_admin_name': incubation_admin['name'],
-            'link_code': link_code,
-            'created_at': datetime.now(timezone.utc).isoformat(),
-            'is_active': True,
-            'usage_count': 0
-        }
-        
-        # Add to dataframe
-        new_link_df = pd.DataFrame([new_link])
-        links_df = pd.concat([links_df, new_link_df], ignore_index=True)
-        save_incubation_links_df(links_df)
+            while not links_df.empty and link_code in links_df['link_code'].values:
+                link_code = generate_link_code()
+            
+            # Create new link
+            link_id = str(uuid.uuid4())
+            new_link = {
+                'id': link_id,
+                'incubation_admin_id': incubation_admin['id'],
+                'incubation_admin_name': incubation_admin['name'],
+                'link_code': link_code,
+                'created_at': datetime.now(timezone.utc).isoformat(),
+                'is_active': True,
+                'usage_count': 0
+            }
+            
+            # Add to dataframe
+            new_link_df = pd.DataFrame([new_link])
+            links_df = pd.concat([links_df, new_link_df], ignore_index=True)
+            save_incubation_links_df(links_df)
         
         # Generate the full registration URL
         base_url = "http://localhost:3000"  # Frontend URL
@@ -2817,22 +5473,23 @@ async def get_incubation_registration_links(incubation_admin: dict = Depends(get
         raise HTTPException(status_code=500, detail=str(e))
 
 @api_router.put("/incubation-admin/links/{link_id}/toggle")
-async def toggle_incubation_registration_link(link_id: str, incubation_admin: dict = Depends(get_incubation_admin_user)):
+def toggle_incubation_registration_link(link_id: str, incubation_admin: dict = Depends(get_incubation_admin_user)):
     """Toggle the active status of a registration link"""
     try:
-        links_df = load_incubation_links_df()
-        
-        # Find the link
-        link_idx = links_df[(links_df['id'] == link_id) & (links_df['incubation_admin_id'] == incubation_admin['id'])].index
-        
-        if link_idx.empty:
-            raise HTTPException(status_code=404, detail="Link not found")
-        
-        # Toggle the active status
-        current_status = links_df.at[link_idx[0], 'is_active']
-        links_df.at[link_idx[0], 'is_active'] = not current_status
-        
-        save_incubation_links_df(links_df)
+        with _change_lock:
+            links_df = load_incubation_links_df()
+            
+            # Find the link
+            link_idx = links_df[(links_df['id'] == link_id) & (links_df['incubation_admin_id'] == incubation_admin['id'])].index
+            
+            if link_idx.empty:
+                raise HTTPException(status_code=404, detail="Link not found")
+            
+            # Toggle the active status
+            current_status = links_df.at[link_idx[0], 'is_active']
+            links_df.at[link_idx[0], 'is_active'] = not current_status
+            
+            save_incubation_links_df(links_df)
         
         return {
             "message": f"Link {'activated' if not current_status else 'deactivated'} successfully",
@@ -2847,85 +5504,39 @@ async def toggle_incubation_registration_link(link_id: str, incubation_admin: di
 async def get_startups_via_registration_links(incubation_admin: dict = Depends(get_incubation_admin_user)):
     """Get startups that registered via this incubation admin's registration links"""
     try:
-        users_df = load_users_df()
         links_df = load_incubation_links_df()
-        grant_matches_df = load_grant_matches_df()
-        tracking_df = load_grant_tracking_df()
-        grants_df = load_grants_df()
         
         # Get all link codes for this incubation admin
         admin_links = links_df[links_df['incubation_admin_id'] == incubation_admin['id']]
         link_codes = admin_links['link_code'].tolist()
         
-        # Find users who registered via these links (stored in profile as registration_source)
+        # Look up the users registered via these links in the registration index
+        registration_index = get_registration_index()
+        user_ids = set()
+        for link_code in link_codes:
+            user_ids |= registration_index.get(link_code, set())
+        if not user_ids:
+            return {"startups": []}
+        
+        users_df = load_users_df()
+        startups = users_df[users_df['id'].isin(user_ids)]
+        profiles = parse_user_profiles(startups)
+        sources = dict(zip(startups['id'].tolist(), registration_source_column(startups, fallback_to_profile=True).tolist()))
+        
         startups_data = []
-        for _, user in users_df.iterrows():
-            # Check if user has registration source indicating they came from this incubation admin
-            profile_data = {}
-            if pd.notna(user.get('profile')) and user['profile']:
-                try:
-                    profile_data = json.loads(user['profile'])
-                except:
-                    pass
-            
-            # Check if this user was registered via one of our links
-            registration_source = profile_data.get('registration_source', '')
-            logging.info(f"Checking user {user['email']}: registration_source='{registration_source}', link_codes={link_codes}")
-            
-            if registration_source in link_codes:
-                # Get matched grants
-                user_matches = grant_matches_df[grant_matches_df['user_id'] == user['id']]
-                matched_grants = []
-                for _, match in user_matches.iterrows():
-                    try:
-                        match_data = json.loads(match['match_data']) if isinstance(match['match_data'], str) else match['match_data']
-                        matched_grants.append({
-                            'grant_id': match_data.get('grant_id', ''),
-                            'name': match_data.get('name', ''),
-                            'funding_amount': match_data.get('funding_amount', '')
-                        })
-                    except:
-                        pass
-                
-                # Get tracking data for expert tier
-                tracking_data = []
-                if user['tier'] == 'expert':
-                    user_tracking = tracking_df[tracking_df['startup_id'] == user['id']]
-                    for _, track in user_tracking.iterrows():
-                        analyst_name = "Unknown"
-                        if pd.notna(track.get('user_id')):
-                            analyst = users_df[users_df['id'] == track['user_id']]
-                            if not analyst.empty:
-                                analyst_name = analyst.iloc[0]['name']
-                        
-                        # Get grant name from grants_df
-                        grant_name = "Unknown Grant"
-                        grant_id = track.get('grant_id', '')
-                        if not grants_df.empty and grant_id:
-                            grant_row = grants_df[grants_df['Grant ID'] == str(grant_id)]
-                            if not grant_row.empty:
-                                grant_name = grant_row.iloc[0].get('Name', 'Unknown Grant')
-                        
-                        tracking_data.append({
-                            'grant_id': track.get('grant_id', ''),
-                            'grant_name': grant_name,
-                            'status': track.get('status', ''),
-                            'progress': track.get('progress', ''),
-                            'applied_by': analyst_name
-                        })
-                
-                startups_data.append({
-                    'id': user['id'],
-                    'name': user['name'],
-                    'email': user['email'],
-                    'tier': user['tier'],
-                    'created_at': user.get('created_at', ''),
-                    'has_completed_screening': bool(user.get('has_completed_screening', False)),
-                    'registration_source': registration_source,
-                    'profile': profile_data,
-                    'matched_grants': matched_grants,
-                    'tracking': tracking_data
-                })
+        for card in build_startup_cards(startups, users_df, ['matched_grants', 'tracking']):
+            startups_data.append({
+                'id': card['id'],
+                'name': card['name'],
+                'email': card['email'],
+                'tier': card['tier'],
+                'created_at': card['created_at'],
+                'has_completed_screening': card['has_completed_screening'],
+                'registration_source': sources[card['id']],
+                'profile': profiles[card['id']],
+                'matched_grants': card['matched_grants'],
+                'tracking': card['tracking']
+            })
         
         return {"startups": convert_numpy_types(startups_data)}
         
@@ -2936,55 +5547,58 @@ async def get_startups_via_registration_links(incubation_admin: dict = Depends(g
 # ============= INCUBATION REGISTRATION ENDPOINT =============
 
 @api_router.post("/auth/register/incubation")
-async def register_via_incubation_link(user: IncubationUserRegister):
+def register_via_incubation_link(user: IncubationUserRegister):
     """Register a new user via incubation admin registration link"""
     try:
-        # Validate the link code
-        links_df = load_incubation_links_df()
-        link_row = links_df[(links_df['link_code'] == user.link_code) & (links_df['is_active'] == True)]
-        
-        if link_row.empty:
-            raise HTTPException(status_code=400, detail="Invalid or inactive registration link")
+        password_hash = hash_password(user.password)
         
-        link_info = link_row.iloc[0]
-        
-        # Load existing users
-        users_df = load_users_df()
-        
-        # Check if user exists
-        if not users_df.empty and user.email in users_df['email'].values:
-            raise HTTPException(status_code=400, detail="Email already registered")
-        
-        # Create new user
-        user_id = str(uuid.uuid4())
-        new_user = {
-            "id": user_id,
-            "name": user.name,
-            "email": user.email,
-            "password": hash_password(user.password),
-            "tier": "free",
-            "has_completed_screening": False,
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "profile": json.dumps({
+        # Hold the change lock from the checks to the saves so concurrent registrations can't overwrite each other
+        with _change_lock:
+            # Validate the link code
+            links_df = load_incubation_links_df()
+            link_row = links_df[(links_df['link_code'] == user.link_code) & (links_df['is_active'] == True)]
+            
+            if link_row.empty:
+                raise HTTPException(status_code=400, detail="Invalid or inactive registration link")
+            
+            link_info = link_row.iloc[0]
+            
+            # Load existing users
+            users_df = load_users_df()
+            
+            # Check if user exists
+            if not users_df.empty and user.email in users_df['email'].values:
+                raise HTTPException(status_code=400, detail="Email already registered")
+            
+            # Create new user
+            user_id = str(uuid.uuid4())
+            new_user = {
+                "id": user_id,
+                "name": user.name,
+                "email": user.email,
+                "password": password_hash,
+                "tier": "free",
+                "has_completed_screening": False,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "profile": json.dumps({
+                    "registration_source": user.link_code,
+                    "incubation_admin_id": link_info['incubation_admin_id'],
+                    "incubation_admin_name": link_info['incubation_admin_name']
+                }),
+                "screening_completed_at": "",
+                "upgraded_at": "",
+                "coupon_used": "",
                 "registration_source": user.link_code,
-                "incubation_admin_id": link_info['incubation_admin_id'],
-                "incubation_admin_name": link_info['incubation_admin_name']
-            }),
-            "screening_completed_at": "",
-            "upgraded_at": "",
-            "coupon_used": ""
-        }
-        
-        # Add new user to dataframe
-        new_user_df = pd.DataFrame([new_user])
-        users_df = pd.concat([users_df, new_user_df], ignore_index=True)
-        save_users_df(users_df)
-        
-        # Update usage count for the link
-        link_idx = links_df[links_df['link_code'] == user.link_code].index
-        if not link_idx.empty:
-            links_df.at[link_idx[0], 'usage_count'] = links_df.at[link_idx[0], 'usage_count'] + 1
-            save_incubation_links_df(links_df)
+                "incubation_admin_id": link_info['incubation_admin_id']
+            }
+            
+            append_table_rows('users', pd.DataFrame([new_user]), load_users_df, save_users_df)
+            
+            # Update usage count for the link
+            link_idx = links_df[links_df['link_code'] == user.link_code].index
+            if not link_idx.empty:
+                links_df.at[link_idx[0], 'usage_count'] = links_df.at[link_idx[0], 'usage_count'] + 1
+                save_incubation_links_df(links_df)
         
         return {
             "message": "Registration successful",
@@ -3091,62 +5705,11 @@ async def venture_analyst_get_grants(analyst: dict = Depends(get_current_user)):
 @api_router.post("/venture-analyst/grants")
 async def venture_analyst_create_grant(request: CreateGrantRequest, analyst: dict = Depends(get_current_user)):
     """Venture analyst endpoint to add new grants"""
+    if analyst['tier'] != 'venture_analyst':
+        raise HTTPException(status_code=403, detail="Venture analyst access required")
+    
     try:
-        if analyst['tier'] != 'venture_analyst':
-            raise HTTPException(status_code=403, detail="Venture analyst access required")
-        
-        grants_df = load_grants_df()
-        
-        # Generate new grant ID by finding the highest numeric ID and incrementing
-        max_id = 0
-        if not grants_df.empty and 'Grant ID' in grants_df.columns:
-            # Filter only numeric IDs and find max
-            numeric_ids = pd.to_numeric(grants_df['Grant ID'], errors='coerce').dropna()
-            if not numeric_ids.empty:
-                max_id = int(numeric_ids.max())
-        new_grant_id = str(max_id + 1)
-        
-        # Create new grant entry with all CSV fields
-        sector_value = request.sector
-        if request.sector == 'Other' and request.sector_other:
-            sector_value = request.sector_other
-        
-        new_grant = {
-            'Grant ID': new_grant_id,
-            'Name': request.name,
-            'Sector(s)': sector_value,
-            'Eligibility Criteria': request.eligibility,
-            'Funding Amount': request.funding_amount,
-            'Funding Type': request.funding_type,
-            'Funding Ratio': request.funding_ratio,
-            'Application Link': request.application_link,
-            'Documents Required': request.documents_required,
-            'Due Date': request.deadline,
-            'Region/Focus': request.region_focus,
-            'Contact Info': request.contact_info,
-            'Place': request.place,
-            'Created At': datetime.now(timezone.utc).strftime('%Y-%m-%d'),
-            'Soft Approval': request.soft_approval,
-            'Stage of Startup': request.stage,
-            'Sector Focus': request.sector_focus,
-            'Gender Focus': request.gender_focus,
-            'Innovation Type': request.innovation_type,
-            'TRL': request.trl,
-            'Impact Criteria': request.impact_criteria,
-            'Co-investment Requirement': request.co_investment_requirement,
-            'Matching Investment': request.matching_investment,
-            'Repayment Terms': request.repayment_terms,
-            'Disbursement Schedule': request.disbursement_schedule,
-            'Mentorship/Training': request.mentorship_training,
-            'Program Duration': request.program_duration,
-            'Success Metrics': request.success_metrics
-        }
-        
-        # Add to dataframe
-        new_grant_df = pd.DataFrame([new_grant])
-        grants_df = pd.concat([grants_df, new_grant_df], ignore_index=True)
-        save_grants_df(grants_df)
-        
+        new_grant_id = await asyncio.to_thread(create_grant, request)
         return {
             "message": "Grant created successfully",
             "grant_id": new_grant_id
@@ -18,6 +18,13 @@ const AdminDashboard = ({ user, handleLogout }) => {
   const [activeTab, setActiveTab] = useState('overview');
   const [kpis, setKpis] = useState({});
   const [startups, setStartups] = useState([]);
+  const [startupOptions, setStartupOptions] = useState([]);
+  const [startupSearch, setStartupSearch] = useState('');
+  const [selectedStartupNames, setSelectedStartupNames] = useState({});
+  const [startupsTotal, setStartupsTotal] = useState(0);
+  const [startupCursors, setStartupCursors] = useState([null]);
+  const [nextStartupCursor, setNextStartupCursor] = useState(null);
+  const [startupFilters, setStartupFilters] = useState({ tier: '', screening: '' });
   const [grants, setGrants] = useState([]);
   const [ventureAnalysts, setVentureAnalysts] = useState([]);
   const [incubationAdmins, setIncubationAdmins] = useState([]);
@@ -83,21 +90,34 @@ const AdminDashboard = ({ user, handleLogout }) => {
   useEffect(() => {
     if (user?.tier === 'admin') {
       fetchKPIs();
-      fetchStartups();
       fetchGrants();
       fetchUsers();
     }
   }, [user]);
   
-  // Reset page to 1 when switching tabs
+  // Startups are paginated and filtered on the server; load page 1 when the tab opens or the filters change
   useEffect(() => {
-    if (activeTab === 'startups') {
+    if (user?.tier === 'admin' && activeTab === 'startups') {
       setCurrentPage(1);
-    } else if (activeTab === 'grants') {
+      setStartupCursors([null]);
+      fetchStartups(null);
+    }
+  }, [user, startupFilters, activeTab]);
+  
+  // Reset page to 1 when switching tabs
+  useEffect(() => {
+    if (activeTab === 'grants') {
       setGrantsCurrentPage(1);
     }
   }, [activeTab]);
   
+  // The assign dialog searches startups by name on the server, debounced while typing
+  useEffect(() => {
+    if (!isAssignStartupsDialogOpen) return;
+    const timer = setTimeout(() => fetchStartupOptions(startupSearch), 250);
+    return () => clearTimeout(timer);
+  }, [isAssignStartupsDialogOpen, startupSearch]);
+  
   const fetchKPIs = async () => {
     try {
       const token = localStorage.getItem('token');
@@ -110,19 +130,63 @@ const AdminDashboard = ({ user, handleLogout }) => {
     }
   };
   
-  const fetchStartups = async () => {
+  const fetchStartups = async (cursor = startupCursors[currentPage - 1]) => {
     try {
       const token = localStorage.getItem('token');
+      const params = { limit: startupsPerPage };
+      if (cursor) params.cursor = cursor;
+      if (startupFilters.tier) params.tier = startupFilters.tier;
+      if (startupFilters.screening) params.screening = startupFilters.screening;
       const response = await axios.get(`${API}/admin/all-startups`, {
-        headers: { Authorization: `Bearer ${token}` }
+        headers: { Authorization: `Bearer ${token}` },
+        params
       });
-      console.log('Fetched startups:', response.data.startups);
       setStartups(response.data.startups);
+      setStartupsTotal(response.data.total);
+      setNextStartupCursor(response.data.next_cursor);
     } catch (error) {
       console.error('Error fetching startups:', error);
     }
   };
   
+  const fetchStartupOptions = async (search) => {
+    try {
+      const token = localStorage.getItem('token');
+      const params = { fields: 'id,name', limit: 20 };
+      if (search.trim()) params.q = search.trim();
+      const response = await axios.get(`${API}/admin/all-startups`, {
+        headers: { Authorization: `Bearer ${token}` },
+        params
+      });
+      setStartupOptions(response.data.startups);
+    } catch (error) {
+      console.error('Error fetching startup options:', error);
+    }
+  };
+  
+  // Remember the names of selected startups so they stay listed when a new search replaces the options
+  const handleStartupSelection = (selected) => {
+    setAssignmentData({...assignmentData, startup_ids: selected});
+    setSelectedStartupNames(prev => Object.fromEntries(selected.map(id => [
+      id, prev[id] ?? startupOptions.find(s => s.id === id)?.name ?? id
+    ])));
+  };
+  
+  const closeAssignStartupsDialog = () => {
+    setIsAssignStartupsDialogOpen(false);
+    setStartupSearch('');
+    setSelectedStartupNames({});
+  };
+  
+  const goToStartupPage = (page) => {
+    const cursor = page > currentPage ? nextStartupCursor : startupCursors[page - 1];
+    if (page > currentPage) {
+      setStartupCursors(prev => [...prev.slice(0, page - 1), cursor]);
+    }
+    setCurrentPage(page);
+    fetchStartups(cursor);
+  };
+  
   const fetchGrants = async () => {
     try {
       const token = localStorage.getItem('token');
@@ -174,7 +238,7 @@ const AdminDashboard = ({ user, handleLogout }) => {
       });
       toast.success(`Assigned ${assignmentData.startup_ids.length} startup(s)`);
       setAssignmentData({ user_id: '', startup_ids: [], assigned_to_type: 'venture_analyst' });
-      setIsAssignStartupsDialogOpen(false);
+      closeAssignStartupsDialog();
       fetchStartups();
     } catch (error) {
       toast.error('Failed to assign startups');
@@ -202,9 +266,18 @@ const AdminDashboard = ({ user, handleLogout }) => {
     }
   };
   
-  const handleViewStartupDetails = (startup) => {
+  const handleViewStartupDetails = async (startup) => {
     setSelectedStartup(startup);
     setIsStartupDetailsDialogOpen(true);
+    try {
+      const token = localStorage.getItem('token');
+      const response = await axios.get(`${API}/admin/startups/${startup.id}`, {
+        headers: { Authorization: `Bearer ${token}` }
+      });
+      setSelectedStartup(response.data.startup);
+    } catch (error) {
+      console.error('Error fetching startup details:', error);
+    }
   };
   
   const getTierColor = (tier) => {
@@ -315,16 +388,10 @@ const AdminDashboard = ({ user, handleLogout }) => {
         )}
         
         {activeTab === 'startups' && (() => {
-          // Sort startups by created_at (newest first)
-          const sortedStartups = [...startups].sort((a, b) => 
-            new Date(b.created_at) - new Date(a.created_at)
-          );
-          
-          // Pagination logic
-          const indexOfLastStartup = currentPage * startupsPerPage;
-          const indexOfFirstStartup = indexOfLastStartup - startupsPerPage;
-          const currentStartups = sortedStartups.slice(indexOfFirstStartup, indexOfLastStartup);
-          const totalPages = Math.ceil(sortedStartups.length / startupsPerPage);
+          // The server returns one page, newest first
+          const indexOfFirstStartup = (currentPage - 1) * startupsPerPage;
+          const currentStartups = startups;
+          const totalPages = Math.ceil(startupsTotal / startupsPerPage);
           
           return (
             <div className="space-y-6">
@@ -332,9 +399,22 @@ const AdminDashboard = ({ user, handleLogout }) => {
                 <div>
                   <h2 className="text-2xl font-bold text-gray-900">All Startups</h2>
                   <p className="text-sm text-gray-600 mt-1">
-                    Showing {indexOfFirstStartup + 1}-{Math.min(indexOfLastStartup, sortedStartups.length)} of {sortedStartups.length} startups
+                    Showing {startupsTotal === 0 ? 0 : indexOfFirstStartup + 1}-{indexOfFirstStartup + startups.length} of {startupsTotal} startups
                   </p>
                 </div>
+                <div className="flex items-center space-x-2">
+                  <select value={startupFilters.tier} onChange={(e) => setStartupFilters({...startupFilters, tier: e.target.value})} className="border rounded-md p-2 text-sm">
+                    <option value="">All tiers</option>
+                    <option value="free">Free</option>
+                    <option value="premium">Premium</option>
+                    <option value="expert">Expert</option>
+                  </select>
+                  <select value={startupFilters.screening} onChange={(e) => setStartupFilters({...startupFilters, screening: e.target.value})} className="border rounded-md p-2 text-sm">
+                    <option value="">Any screening</option>
+                    <option value="completed">Screening completed</option>
+                    <option value="pending">Screening pending</option>
+                  </select>
+                </div>
                 <Button onClick={() => setIsAssignStartupsDialogOpen(true)} className="bg-[#5d248f] hover:bg-[#4a1d70]">
                   <Link2 className="w-4 h-4 mr-2" />
                   Assign Startups
@@ -366,24 +446,7 @@ const AdminDashboard = ({ user, handleLogout }) => {
                           <Badge variant="outline" className="ml-2">{startup.assigned_analyst.type}</Badge>
                         </p>
                       )}
-                      <div className="mt-3">
-                        <p className="text-sm font-medium text-gray-700 mb-2">Matched Grants ({startup.matched_grants?.length || 0})</p>
-                        {startup.matched_grants?.slice(0, 3).map((grant, idx) => (
-                          <div key={idx} className="text-sm text-gray-600 ml-4">• {grant.name} - {grant.funding_amount}</div>
-                        ))}
-                      </div>
-                      {startup.tier === 'expert' && startup.tracking?.length > 0 && (
-                        <div className="mt-4 border-t pt-4">
-                          <p className="text-sm font-medium text-gray-700 mb-2">Grant Applications</p>
-                          {startup.tracking.map((track, idx) => (
-                            <div key={idx} className="text-sm text-gray-600 ml-4 mb-1">
-                              • {track.grant_name || 'Unknown Grant'} (ID: {track.grant_id}) - <Badge className={getStatusColor(track.status)}>{track.status}</Badge>
-                              <span className="ml-2">({track.progress})</span>
-                              <span className="ml-2 text-gray-500">by: {track.applied_by}</span>
-                            </div>
-                          ))}
-                        </div>
-                      )}
+                      {/* Matched grants and grant applications are loaded with the details dialog */}
                     </div>
                     <Button 
                       onClick={() => handleViewStartupDetails(startup)} 
@@ -403,30 +466,21 @@ const AdminDashboard = ({ user, handleLogout }) => {
               <div className="flex justify-center items-center space-x-2 mt-6">
                 <Button
                   variant="outline"
-                  onClick={() => setCurrentPage(prev => Math.max(prev - 1, 1))}
+                  onClick={() => goToStartupPage(currentPage - 1)}
                   disabled={currentPage === 1}
                   className="px-4"
                 >
                   Previous
                 </Button>
                 
-                <div className="flex space-x-1">
-                  {[...Array(totalPages)].map((_, idx) => (
-                    <Button
-                      key={idx}
-                      variant={currentPage === idx + 1 ? 'default' : 'outline'}
-                      onClick={() => setCurrentPage(idx + 1)}
-                      className={currentPage === idx + 1 ? 'bg-[#5d248f] hover:bg-[#4a1d70]' : ''}
-                    >
-                      {idx + 1}
-                    </Button>
-                  ))}
-                </div>
+                <span className="text-sm text-gray-600 px-2">
+                  Page {currentPage} of {totalPages}
+                </span>
                 
                 <Button
                   variant="outline"
-                  onClick={() => setCurrentPage(prev => Math.min(prev + 1, totalPages))}
-                  disabled={currentPage === totalPages}
+                  onClick={() => goToStartupPage(currentPage + 1)}
+                  disabled={!nextStartupCursor}
                   className="px-4"
                 >
                   Next
@@ -605,7 +659,7 @@ const AdminDashboard = ({ user, handleLogout }) => {
         </DialogContent>
       </Dialog>
       
-      <Dialog open={isAssignStartupsDialogOpen} onOpenChange={setIsAssignStartupsDialogOpen}>
+      <Dialog open={isAssignStartupsDialogOpen} onOpenChange={(open) => open ? setIsAssignStartupsDialogOpen(true) : closeAssignStartupsDialog()}>
         <DialogContent className="max-w-md">
           <DialogHeader><DialogTitle>Assign Startups</DialogTitle></DialogHeader>
           <div className="space-y-4">
@@ -627,10 +681,19 @@ const AdminDashboard = ({ user, handleLogout }) => {
             </div>
             <div>
               <Label>Select Startups</Label>
+              <Input
+                value={startupSearch}
+                onChange={(e) => setStartupSearch(e.target.value)}
+                placeholder="Search startups by name..."
+                className="mb-2"
+              />
               <MultiSelect
-                options={startups.map(s => ({ value: s.id, label: s.name }))}
+                options={[
+                  ...Object.entries(selectedStartupNames).map(([id, name]) => ({ value: id, label: name })),
+                  ...startupOptions.filter(s => !(s.id in selectedStartupNames)).map(s => ({ value: s.id, label: s.name }))
+                ]}
                 value={assignmentData.startup_ids}
-                onChange={(selected) => setAssignmentData({...assignmentData, startup_ids: selected})}
+                onChange={handleStartupSelection}
                 placeholder="Select startups..."
               />
             </div>
@@ -1004,12 +1067,6 @@ const AdminDashboard = ({ user, handleLogout }) => {
                       </Badge>
                     </div>
                   )}
-                  {selectedStartup.password_hash && (
-                    <div className="col-span-2">
-                      <p className="text-sm font-medium text-gray-700">Password Hash</p>
-                      <p className="text-xs text-gray-600 font-mono break-all bg-gray-50 p-2 rounded">{selectedStartup.password_hash}</p>
-                    </div>
-                  )}
                 </div>
               </div>
               
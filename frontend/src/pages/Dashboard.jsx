@@ -18,6 +18,13 @@ import UserProfile from '../components/UserProfile';
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL || 'http://localhost:8000';
 const API = `${BACKEND_URL}/api`;
 
+// Helper to get a tracking screenshot URL from the short-lived signed URL the API returns,
+// since <img> can't send the Authorization header
+const getScreenshotUrl = (screenshotUrl, size) => {
+  if (!screenshotUrl) return '';
+  return `${BACKEND_URL}${screenshotUrl}${size ? `&size=${size}` : ''}`;
+};
+
 const Dashboard = () => {
   const navigate = useNavigate();
   const [user, setUser] = useState(null);
@@ -532,7 +539,7 @@ const FreeTierDashboard = ({ user, grants, searchTerm, setSearchTerm, handleLogo
                     </div>
 
                     {/* Screenshot Preview for Applied Status */}
-                    {tracking.status === 'Applied' && tracking.screenshot_path && (
+                    {tracking.status === 'Applied' && tracking.screenshot_url && (
                       <div className="bg-yellow-50 border border-yellow-200 p-4 rounded-lg mt-4">
                         <div className="flex items-center justify-between mb-3">
                           <p className="text-sm font-semibold text-yellow-900 flex items-center">
@@ -540,7 +547,7 @@ const FreeTierDashboard = ({ user, grants, searchTerm, setSearchTerm, handleLogo
                             Application Screenshot
                           </p>
                           <a 
-                            href={`http://localhost:8000/${tracking.screenshot_path.replace(/\\/g, '/')}`}
+                            href={getScreenshotUrl(tracking.screenshot_url)}
                             target="_blank"
                             rel="noopener noreferrer"
                             className="text-xs text-yellow-700 hover:text-yellow-900 font-medium underline"
@@ -550,7 +557,7 @@ const FreeTierDashboard = ({ user, grants, searchTerm, setSearchTerm, handleLogo
                         </div>
                         <div className="relative rounded-lg overflow-hidden border-2 border-yellow-300">
                           <img 
-                            src={`http://localhost:8000/${tracking.screenshot_path.replace(/\\/g, '/')}`}
+                            src={getScreenshotUrl(tracking.screenshot_url, 'medium')}
                             alt="Application Screenshot"
                             className="w-full h-auto max-h-96 object-contain bg-white"
                             onError={(e) => {
@@ -877,7 +884,7 @@ const PremiumTierDashboard = ({ user, grants, searchTerm, setSearchTerm, handleL
                     </div>
 
                     {/* Screenshot Preview for Applied Status */}
-                    {tracking.status === 'Applied' && tracking.screenshot_path && (
+                    {tracking.status === 'Applied' && tracking.screenshot_url && (
                       <div className="bg-yellow-50 border border-yellow-200 p-4 rounded-lg mt-4">
                         <div className="flex items-center justify-between mb-3">
                           <p className="text-sm font-semibold text-yellow-900 flex items-center">
@@ -885,7 +892,7 @@ const PremiumTierDashboard = ({ user, grants, searchTerm, setSearchTerm, handleL
                             Application Screenshot
                           </p>
                           <a 
-                            href={`http://localhost:8000/${tracking.screenshot_path.replace(/\\/g, '/')}`}
+                            href={getScreenshotUrl(tracking.screenshot_url)}
                             target="_blank"
                             rel="noopener noreferrer"
                             className="text-xs text-yellow-700 hover:text-yellow-900 font-medium underline"
@@ -895,7 +902,7 @@ const PremiumTierDashboard = ({ user, grants, searchTerm, setSearchTerm, handleL
                         </div>
                         <div className="relative rounded-lg overflow-hidden border-2 border-yellow-300">
                           <img 
-                            src={`http://localhost:8000/${tracking.screenshot_path.replace(/\\/g, '/')}`}
+                            src={getScreenshotUrl(tracking.screenshot_url, 'medium')}
                             alt="Application Screenshot"
                             className="w-full h-auto max-h-96 object-contain bg-white"
                             onError={(e) => {
@@ -1066,10 +1073,10 @@ const ExpertTierDashboard = ({ user, grants, searchTerm, setSearchTerm, handleLo
   };
 
   // Resolve media/photo URL to absolute if backend returned a relative path
-  const resolvePhotoUrl = (url) => {
+  const resolvePhotoUrl = (url, size) => {
     if (!url) return '';
     if (url.startsWith('http://') || url.startsWith('https://')) return url;
-    return `${BACKEND_URL}${url}`;
+    return `${BACKEND_URL}${url}${size ? `?size=${size}` : ''}`;
   };
 
   // Handle callback request notification
@@ -1557,7 +1564,7 @@ const ExpertTierDashboard = ({ user, grants, searchTerm, setSearchTerm, handleLo
                           )}
 
                           {/* Screenshot Preview for Applied Status */}
-                          {tracking.status === 'Applied' && tracking.screenshot_path && (
+                          {tracking.status === 'Applied' && tracking.screenshot_url && (
                             <div className="bg-yellow-50 border border-yellow-200 p-4 rounded-lg">
                               <div className="flex items-center justify-between mb-3">
                                 <p className="text-sm font-semibold text-yellow-900 flex items-center">
@@ -1565,7 +1572,7 @@ const ExpertTierDashboard = ({ user, grants, searchTerm, setSearchTerm, handleLo
                                   Application Screenshot
                                 </p>
                                 <a 
-                                  href={`http://localhost:8000/${tracking.screenshot_path.replace(/\\/g, '/')}`}
+                                  href={getScreenshotUrl(tracking.screenshot_url)}
                                   target="_blank"
                                   rel="noopener noreferrer"
                                   className="text-xs text-yellow-700 hover:text-yellow-900 font-medium underline"
@@ -1575,7 +1582,7 @@ const ExpertTierDashboard = ({ user, grants, searchTerm, setSearchTerm, handleLo
                               </div>
                               <div className="relative rounded-lg overflow-hidden border-2 border-yellow-300">
                                 <img 
-                                  src={`http://localhost:8000/${tracking.screenshot_path.replace(/\\/g, '/')}`}
+                                  src={getScreenshotUrl(tracking.screenshot_url, 'medium')}
                                   alt="Application Screenshot"
                                   className="w-full h-auto max-h-96 object-contain bg-white"
                                   onError={(e) => {
@@ -1676,7 +1683,7 @@ const ExpertTierDashboard = ({ user, grants, searchTerm, setSearchTerm, handleLo
                         <div className="w-16 h-16 rounded-full border-2 border-white/60 shadow-md overflow-hidden">
                           {getAssignedVentureAnalyst().assigned_to_photo_url ? (
                             <img 
-                              src={resolvePhotoUrl(getAssignedVentureAnalyst().assigned_to_photo_url)} 
+                              src={resolvePhotoUrl(getAssignedVentureAnalyst().assigned_to_photo_url, 'thumb')} 
                               alt={getAssignedVentureAnalyst().assigned_to_name}
                               className="w-full h-full object-cover"
                               onError={(e) => {
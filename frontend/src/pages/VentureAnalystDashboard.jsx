@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { Card, CardContent, CardHeader, CardTitle } from '../components/ui/card';
 import { Button } from '../components/ui/button';
 import { Input } from '../components/ui/input';
@@ -30,11 +30,18 @@ import axios from 'axios';
 const API = process.env.REACT_APP_API_URL || 'http://localhost:8000/api';
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL || 'http://localhost:8000';
 
-// Helper to get full photo URL
-const getPhotoUrl = (photoUrl) => {
+// Helper to get a tracking screenshot URL from the short-lived signed URL the API returns,
+// since <img> can't send the Authorization header
+const getScreenshotUrl = (screenshotUrl, size) => {
+  if (!screenshotUrl) return '';
+  return `${BACKEND_URL}${screenshotUrl}${size ? `&size=${size}` : ''}`;
+};
+
+// Helper to get full photo URL (size: optional 'thumb' / 'medium' variant of an upload)
+const getPhotoUrl = (photoUrl, size) => {
   if (!photoUrl) return '';
   if (photoUrl.startsWith('http')) return photoUrl;
-  return `${BACKEND_URL}${photoUrl}`;
+  return `${BACKEND_URL}${photoUrl}${size ? `?size=${size}` : ''}`;
 };
 
 const VentureAnalystDashboard = ({ user, handleLogout }) => {
@@ -107,6 +114,9 @@ const VentureAnalystDashboard = ({ user, handleLogout }) => {
   const [photoPreview, setPhotoPreview] = useState(user?.photo_url ? getPhotoUrl(user.photo_url) : '');
   // Notifications state
   const [notifications, setNotifications] = useState([]);
+  const [notificationsCursor, setNotificationsCursor] = useState(null);
+  // Ids already in the list, so a pushed notification we've also fetched isn't counted twice
+  const knownNotificationIds = useRef(new Set());
   const [unreadCount, setUnreadCount] = useState(0);
   const [showNotifications, setShowNotifications] = useState(false);
   const { toast } = useToast();
@@ -148,13 +158,75 @@ const VentureAnalystDashboard = ({ user, handleLogout }) => {
       if (selectedStartup) {
         loadTrackingData(selectedStartup);
       }
-      loadNotifications();
     }, 5000);
     
     // Cleanup interval on unmount
     return () => clearInterval(refreshInterval);
   }, [selectedStartup]);
 
+  // New notifications are pushed over Server-Sent Events instead of polled
+  useEffect(() => {
+    const token = localStorage.getItem('token');
+    if (!token) return undefined;
+    
+    let source = null;
+    let reconnectTimer = null;
+    let lastEventId = null;
+    let closed = false;
+    
+    // EventSource can't send headers, so open it with a short-lived stream-only ticket
+    const connect = async () => {
+      let ticket;
+      try {
+        const response = await axios.post(`${API}/notifications/stream-ticket`, {}, {
+          headers: { Authorization: `Bearer ${token}` }
+        });
+        ticket = response.data.ticket;
+      } catch (error) {
+        console.error('Error opening notification stream:', error);
+        if (!closed) reconnectTimer = setTimeout(connect, 30000);
+        return;
+      }
+      if (closed) return;
+      
+      const params = new URLSearchParams({ ticket });
+      if (lastEventId) params.set('last_event_id', lastEventId);
+      source = new EventSource(`${API}/notifications/stream?${params}`);
+      // Each event carries the new notification, so merge it in rather than refetching
+      source.addEventListener('notification', (event) => {
+        lastEventId = event.lastEventId || lastEventId;
+        let pushed;
+        try {
+          pushed = JSON.parse(event.data);
+        } catch (error) {
+          console.error('Malformed notification event:', error);
+          return;
+        }
+        if (knownNotificationIds.current.has(pushed.id)) return;
+        knownNotificationIds.current.add(pushed.id);
+        setNotifications(prev => [pushed, ...prev]);
+        if (!pushed.read) {
+          setUnreadCount(count => count + 1);
+        }
+      });
+      // The browser retries on its own with the same URL; once the ticket has expired
+      // that fails and the source closes, so fetch a fresh ticket and resume from lastEventId
+      source.onerror = () => {
+        if (source.readyState === EventSource.CLOSED && !closed) {
+          source.close();
+          reconnectTimer = setTimeout(connect, 3000);
+        }
+      };
+    };
+    
+    connect();
+    return () => {
+      closed = true;
+      clearTimeout(reconnectTimer);
+      if (source) source.close();
+    };
+  }, []);
+
   // Manual refresh function
   const handleRefresh = async () => {
     await loadAllTrackingData();
@@ -271,28 +343,37 @@ const VentureAnalystDashboard = ({ user, handleLogout }) => {
     }
   };
 
-  const loadNotifications = async () => {
+  // The inbox is paginated: loadNotifications fetches the newest page and
+  // loadMoreNotifications appends the next one using the server's cursor
+  const loadNotifications = async (cursor = null) => {
     try {
       const token = localStorage.getItem('token');
       const response = await axios.get(`${API}/notifications/my`, {
-        headers: { Authorization: `Bearer ${token}` }
+        headers: { Authorization: `Bearer ${token}` },
+        params: cursor ? { cursor } : {}
       });
       const list = response.data.notifications || [];
-      setNotifications(list);
-      setUnreadCount(list.filter(n => !n.read).length);
+      list.forEach(n => knownNotificationIds.current.add(n.id));
+      setNotifications(prev => cursor ? [...prev, ...list.filter(n => !prev.some(p => p.id === n.id))] : list);
+      setNotificationsCursor(response.data.next_cursor || null);
+      setUnreadCount(response.data.unread_count ?? list.filter(n => !n.read).length);
     } catch (error) {
       // Silently ignore, don't spam user
       console.error('Error loading notifications:', error);
     }
   };
 
+  const loadMoreNotifications = () => loadNotifications(notificationsCursor);
+
   const markNotificationRead = async (notificationId) => {
     try {
       const token = localStorage.getItem('token');
       await axios.post(`${API}/notifications/${notificationId}/read`, {}, {
         headers: { Authorization: `Bearer ${token}` }
       });
-      await loadNotifications();
+      // Update in place so pages loaded with "Load more" stay in the list
+      setNotifications(prev => prev.map(n => n.id === notificationId ? { ...n, read: true } : n));
+      setUnreadCount(count => Math.max(count - 1, 0));
     } catch (error) {
       console.error('Error marking notification as read:', error);
     }
@@ -587,7 +668,7 @@ const VentureAnalystDashboard = ({ user, handleLogout }) => {
               <div className="flex items-center space-x-3 bg-white rounded-lg p-3 shadow-sm border border-gray-200">
                 {user?.photo_url ? (
                   <img 
-                    src={getPhotoUrl(user.photo_url)} 
+                    src={getPhotoUrl(user.photo_url, 'thumb')} 
                     alt={user.name}
                     className="w-12 h-12 rounded-full object-cover border-2 border-[#5d248f]"
                     onError={(e) => {
@@ -676,6 +757,13 @@ const VentureAnalystDashboard = ({ user, handleLogout }) => {
                       )}
                     </div>
                   ))}
+                  {notificationsCursor && (
+                    <div className="text-center">
+                      <Button size="sm" variant="outline" onClick={loadMoreNotifications}>
+                        Load more
+                      </Button>
+                    </div>
+                  )}
                 </div>
               )}
             </CardContent>
@@ -948,7 +1036,7 @@ const VentureAnalystDashboard = ({ user, handleLogout }) => {
                           </div>
 
                           {/* Screenshot Preview for Applied Status */}
-                          {tracking.status === 'Applied' && tracking.screenshot_path && (
+                          {tracking.status === 'Applied' && tracking.screenshot_url && (
                             <div className="bg-yellow-50 border border-yellow-200 p-3 rounded-lg mt-4">
                               <div className="flex items-center justify-between mb-2">
                                 <p className="text-xs font-semibold text-yellow-900 flex items-center">
@@ -956,7 +1044,7 @@ const VentureAnalystDashboard = ({ user, handleLogout }) => {
                                   Application Screenshot
                                 </p>
                                 <a 
-                                  href={`http://localhost:8000/${tracking.screenshot_path.replace(/\\/g, '/')}`}
+                                  href={getScreenshotUrl(tracking.screenshot_url)}
                                   target="_blank"
                                   rel="noopener noreferrer"
                                   className="text-xs text-yellow-700 hover:text-yellow-900 font-medium underline"
@@ -966,7 +1054,7 @@ const VentureAnalystDashboard = ({ user, handleLogout }) => {
                               </div>
                               <div className="relative rounded-lg overflow-hidden border-2 border-yellow-300">
                                 <img 
-                                  src={`http://localhost:8000/${tracking.screenshot_path.replace(/\\/g, '/')}`}
+                                  src={getScreenshotUrl(tracking.screenshot_url, 'medium')}
                                   alt="Application Screenshot"
                                   className="w-full h-auto max-h-64 object-contain bg-white"
                                   onError={(e) => {
@@ -0,0 +1,47 @@
+"""
+Shared fixtures for the backend tests
+
+Each test imports its own copy of backend/server.py from a temporary directory
+holding copies of backend/data and backend/uploads, so tests can write freely and
+never touch the checked-in CSVs.
+"""
+
+import importlib.util
+import shutil
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / 'backend'
+
+ADMIN_ID = 'admin-001'
+ANALYST_ID = '710e6054-2c20-4b1d-a61f-e40ed2e9fead'
+OTHER_ANALYST_ID = 'cd9711ab-b7c6-4274-ae90-5189568a17f6'
+EXPERT_ID = '774b55bb-3e80-4243-9520-e3b7b33672bc'
+INCUBATION_ADMIN_ID = 'b3e817b9-cffd-4175-bf6a-7a6ba7f57b0d'
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    """A fresh import of server.py whose data and uploads directories are in tmp_path"""
+    shutil.copy(BACKEND_DIR / 'server.py', tmp_path / 'server.py')
+    shutil.copytree(BACKEND_DIR / 'data', tmp_path / 'data')
+    shutil.copytree(BACKEND_DIR / 'uploads', tmp_path / 'uploads')
+    monkeypatch.chdir(tmp_path)
+    spec = importlib.util.spec_from_file_location('server_under_test', tmp_path / 'server.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+@pytest.fixture
+def client(server):
+    """TestClient with the app's lifespan (migrations, index warm-up) already run"""
+    with TestClient(server.app) as test_client:
+        yield test_client
+
+@pytest.fixture
+def auth(server):
+    """Return Authorization headers for a user id"""
+    def headers(user_id: str) -> dict:
+        return {'Authorization': f"Bearer {server.create_token(user_id, 'test@example.com')}"}
+    return headers
@@ -0,0 +1,54 @@
+"""Tests for the keyset-paginated /admin/all-startups listing"""
+
+from tests.conftest import ADMIN_ID, ANALYST_ID
+
+def collect_pages(client, headers, **params):
+    ids, cursor = [], None
+    while True:
+        query = dict(params, **({'cursor': cursor} if cursor else {}))
+        page = client.get('/api/admin/all-startups', params=query, headers=headers).json()
+        ids += [startup['id'] for startup in page['startups']]
+        cursor = page['next_cursor']
+        if not cursor:
+            return ids, page['total']
+
+def test_cursor_pages_cover_every_startup_once(client, auth):
+    headers = auth(ADMIN_ID)
+    everything = client.get('/api/admin/all-startups', params={'limit': 1000, 'fields': 'id'}, headers=headers).json()
+
+    newest_first, total = collect_pages(client, headers, limit=7, order='desc', fields='id')
+    oldest_first, _ = collect_pages(client, headers, limit=7, order='asc', fields='id')
+
+    assert total == everything['total'] == len(newest_first)
+    assert len(set(newest_first)) == len(newest_first)
+    assert newest_first == [startup['id'] for startup in everything['startups']]
+    assert oldest_first == newest_first[::-1]
+
+def test_cursor_stays_stable_when_rows_are_added(server, client, auth):
+    headers = auth(ADMIN_ID)
+    first = client.get('/api/admin/all-startups', params={'limit': 5, 'order': 'asc', 'fields': 'id'}, headers=headers).json()
+
+    client.post('/api/auth/register', json={
+        'name': 'Late Startup', 'email': 'late-startup@example.com', 'password': 'secret123'
+    })
+    rest, _ = collect_pages(client, headers, limit=5, order='asc', fields='id', cursor=first['next_cursor'])
+    seen = [startup['id'] for startup in first['startups']] + rest
+    assert len(seen) == len(set(seen))
+    assert seen[-1] == server.load_users_df().set_index('email').at['late-startup@example.com', 'id']
+
+def test_filters_and_search(client, auth):
+    headers = auth(ADMIN_ID)
+    total = client.get('/api/admin/all-startups', headers=headers).json()['total']
+    completed = client.get('/api/admin/all-startups', params={'screening': 'completed'}, headers=headers).json()['total']
+    pending = client.get('/api/admin/all-startups', params={'screening': 'pending'}, headers=headers).json()['total']
+    assert completed + pending == total
+
+    matches = client.get('/api/admin/all-startups', params={'q': 'RUPEE', 'fields': 'id,name'}, headers=headers).json()
+    assert matches['startups']
+    assert all('rupee' in startup['name'].lower() for startup in matches['startups'])
+
+def test_rejects_bad_parameters(client, auth):
+    headers = auth(ADMIN_ID)
+    assert client.get('/api/admin/all-startups', params={'screening': 'bogus'}, headers=headers).status_code == 400
+    assert client.get('/api/admin/all-startups', params={'cursor': 'not-a-cursor'}, headers=headers).status_code == 400
+    assert client.get('/api/admin/all-startups', headers=auth(ANALYST_ID)).status_code == 403
@@ -0,0 +1,83 @@
+"""Tests for the /changes feed, its compaction floor and concurrent writers"""
+
+import threading
+
+import pandas as pd
+
+from tests.conftest import ADMIN_ID, ANALYST_ID, EXPERT_ID
+
+def send(client, auth, title):
+    response = client.post('/api/notifications/send', headers=auth(EXPERT_ID), json={
+        'to_user_id': ANALYST_ID, 'type': 'message', 'title': title, 'message': 'hello'
+    })
+    assert response.status_code == 200
+    return response.json()['notification']['id']
+
+def test_changes_follow_a_cursor(client, auth):
+    cursor = client.get('/api/changes', headers=auth(ANALYST_ID)).json()['cursor']
+    first = send(client, auth, 'first')
+    second = send(client, auth, 'second')
+
+    feed = client.get('/api/changes', params={'since': cursor}, headers=auth(ANALYST_ID)).json()
+    assert [(change['table'], change['id'], change['op']) for change in feed['changes']] == [
+        ('notifications', first, 'insert'),
+        ('notifications', second, 'insert'),
+    ]
+    assert feed['changes'][0]['row']['title'] == 'first'
+
+    # Scoped rows are hidden from other users, but the cursor still advances
+    other = client.get('/api/changes', params={'since': cursor}, headers=auth(EXPERT_ID)).json()
+    assert other['changes'] == []
+
+    again = client.get('/api/changes', params={'since': feed['cursor']}, headers=auth(ANALYST_ID)).json()
+    assert again['changes'] == [] and not again['has_more']
+
+def test_cursor_below_compaction_floor_gets_410(server, client, auth):
+    send(client, auth, 'old')
+    send(client, auth, 'older')
+    result = server.compact_change_log(retention_hours=0)
+    assert result['removed'] > 0 and result['floor'] > 0
+
+    response = client.get('/api/changes', params={'since': 0}, headers=auth(ADMIN_ID))
+    assert response.status_code == 410
+    detail = response.json()['detail']
+    assert detail['error'] == 'resync'
+    assert detail['cursor'] == result['floor']
+
+    # Resuming from the cursor in the 410 picks up later changes
+    newer = send(client, auth, 'newer')
+    feed = client.get('/api/changes', params={'since': detail['cursor']}, headers=auth(ANALYST_ID)).json()
+    assert [change['id'] for change in feed['changes']] == [newer]
+
+def test_compaction_survives_a_restart(server, client, auth):
+    send(client, auth, 'old')
+    floor = server.compact_change_log(retention_hours=0)['floor']
+
+    server._change_log_entries = None
+    server._change_log_seqs = []
+    server._change_log_floor = 0
+    _, _, latest_seq, reloaded_floor = server.read_change_log(0, 10)
+    assert reloaded_floor == floor
+    assert latest_seq == floor
+
+def test_concurrent_row_updates_are_not_lost(server, client, auth):
+    tracking_df = server.load_grant_tracking_df()
+    tracking_ids = tracking_df['id'].astype(str).tolist()[:8]
+    cursor = client.get('/api/changes', headers=auth(ADMIN_ID)).json()['cursor']
+
+    barrier = threading.Barrier(len(tracking_ids))
+    def update(tracking_id):
+        barrier.wait()
+        assert server.update_tracking_row(tracking_id, {'notes': f"note for {tracking_id}"})
+    threads = [threading.Thread(target=update, args=(tracking_id,)) for tracking_id in tracking_ids]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    on_disk = pd.read_csv(server.GRANT_TRACKING_CSV, dtype=str).set_index('id')
+    assert all(on_disk.at[tracking_id, 'notes'] == f"note for {tracking_id}" for tracking_id in tracking_ids)
+
+    feed = client.get('/api/changes', params={'since': cursor}, headers=auth(ADMIN_ID)).json()
+    updated = {change['id'] for change in feed['changes'] if change['table'] == 'grant_tracking'}
+    assert updated == set(tracking_ids)
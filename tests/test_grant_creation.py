@@ -0,0 +1,43 @@
+"""Tests for grant creation and grant ID allocation"""
+
+import threading
+
+import pandas as pd
+
+from tests.conftest import ADMIN_ID
+
+def create(client, auth, name):
+    response = client.post('/api/admin/grants', json={'name': name, 'sector': 'Technology'}, headers=auth(ADMIN_ID))
+    assert response.status_code == 200
+    return response.json()['grant_id']
+
+def catalog_ids(server):
+    return pd.read_csv(server.GRANTS_CSV, dtype=str, quoting=1)['Grant ID'].tolist()
+
+def test_ids_continue_after_the_catalog_maximum(server, client, auth):
+    highest = int(pd.to_numeric(pd.Series(catalog_ids(server)), errors='coerce').max())
+    assert create(client, auth, 'First') == str(highest + 1)
+    assert create(client, auth, 'Second') == str(highest + 2)
+    assert server.GRANT_ID_SEQUENCE_FILE.read_text() == str(highest + 2)
+
+def test_grants_added_outside_create_grant_advance_the_sequence(server, client, auth):
+    create(client, auth, 'Seeds the sequence')
+
+    # An import appends a grant with a higher ID without touching the sequence file
+    server.append_grant_row({'Grant ID': '500', 'Name': 'Imported grant'})
+    assert create(client, auth, 'After import') == '501'
+
+    # A stale or corrupt sequence never goes backwards either
+    server.GRANT_ID_SEQUENCE_FILE.write_text('not a number')
+    assert create(client, auth, 'After corruption') == '502'
+
+def test_concurrent_creates_get_distinct_ids(server, client):
+    requests = [server.CreateGrantRequest(name=f"Grant {i}", sector='Technology') for i in range(6)]
+    ids = []
+    threads = [threading.Thread(target=lambda request=request: ids.append(server.create_grant(request))) for request in requests]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(ids)) == len(requests)
+    assert set(ids) <= set(catalog_ids(server))
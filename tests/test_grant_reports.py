@@ -0,0 +1,118 @@
+"""Tests for the grant matches PDF report and its cache"""
+
+import base64
+import importlib.util
+import re
+import sys
+import time
+import zlib
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from tests.conftest import BACKEND_DIR
+
+def report_user(server):
+    """A user with grant matches, shaped like get_current_user's result"""
+    matches_df = pd.read_csv(server.GRANT_MATCHES_CSV, dtype=str)
+    user_id = matches_df['user_id'].value_counts().index[0]
+    users_df = server.load_users_df()
+    user = users_df[users_df['id'] == user_id].iloc[0]
+    return {'id': user_id, 'name': user['name'], 'tier': user['tier'], 'email': user['email']}
+
+def report_text(pdf_bytes):
+    """Text drawn on the report's pages (ReportLab writes ASCII85 + Flate content streams)"""
+    text = []
+    for match in re.finditer(rb'stream\r?\n(.*?)endstream', pdf_bytes, re.S):
+        data = match.group(1).strip()
+        try:
+            data = zlib.decompress(base64.a85decode(data, adobe=True))
+        except ValueError:
+            continue
+        text += [part.decode('latin-1') for part in re.findall(rb'\((.*?)\) Tj', data)]
+    return '\n'.join(text)
+
+def count_builds(server, monkeypatch):
+    builds = []
+    generate = server.generate_grants_pdf
+    def counting_generate(*args, **kwargs):
+        builds.append(1)
+        return generate(*args, **kwargs)
+    monkeypatch.setattr(server, 'generate_grants_pdf', counting_generate)
+    return builds
+
+def test_report_prints_the_full_generation_time(server):
+    pdf_bytes = server.generate_grants_pdf([], 'Someone', generated_on=datetime(2026, 3, 4, 15, 7))
+    assert 'Generated on March 04, 2026 at 03:07 PM' in report_text(pdf_bytes)
+
+def test_unchanged_report_is_served_from_the_cache(server, client, auth, monkeypatch):
+    builds = count_builds(server, monkeypatch)
+    headers = auth(report_user(server)['id'])
+
+    first = client.get('/api/grants/download-pdf', headers=headers)
+    assert first.status_code == 200
+    assert first.headers['content-type'] == 'application/pdf'
+    assert 'Generated on' in report_text(first.content)
+
+    # The generation time is not part of the key, so a request days later still hits
+    class Later(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.now(tz) + timedelta(days=2)
+    monkeypatch.setattr(server, 'datetime', Later)
+    second = client.get('/api/grants/download-pdf', headers=headers)
+    assert second.content == first.content
+    assert len(builds) == 1
+
+def test_cache_key_tracks_what_the_report_shows(server):
+    user = report_user(server)
+    grants_data = server.collect_report_grants(user)
+    key = server.report_cache_key(user['name'], grants_data)
+    assert server.report_cache_key(user['name'], grants_data) == key
+    assert server.report_cache_key(user['name'] + ' Jr', grants_data) != key
+
+    soft_ids = server.load_soft_approvals()
+    unapproved = next(grant['grant_id'] for grant in grants_data if not server.is_soft_approved(grant['grant_id'], soft_ids))
+    server.register_soft_approval(unapproved)
+    assert server.report_cache_key(user['name'], grants_data) != key
+
+def test_async_job_downloads_the_cached_report(server, client, auth):
+    headers = auth(report_user(server)['id'])
+    job = client.get('/api/grants/download-pdf', params={'mode': 'async'}, headers=headers)
+    assert job.status_code == 202
+    job_id = job.json()['job_id']
+
+    for _ in range(100):
+        status = client.get(f"/api/grants/pdf-jobs/{job_id}", headers=headers).json()
+        if status['status'] in ('done', 'failed'):
+            break
+        time.sleep(0.05)
+    assert status['status'] == 'done' and status['progress'] == 1.0
+
+    download = client.get(f"/api/grants/pdf-jobs/{job_id}/download", headers=headers)
+    assert download.content == client.get('/api/grants/download-pdf', headers=headers).content
+
+def test_concurrent_builds_share_styles_without_interfering(server):
+    user = report_user(server)
+    grants_data = server.collect_report_grants(user)
+    generated_on = datetime(2026, 1, 2, 9, 30)
+    header_size = server.REPORT_HEADER_STYLE.fontSize
+    expected = report_text(server.generate_grants_pdf(grants_data, user['name'], generated_on=generated_on))
+
+    futures = [
+        server._pdf_pool.submit(server.generate_grants_pdf, grants_data, user['name'], None, generated_on)
+        for _ in range(4)
+    ]
+    assert all(report_text(future.result()) == expected for future in futures)
+    assert server.REPORT_HEADER_STYLE.fontSize == header_size
+    assert all(f"Grant #{grant['grant_id']}" in expected for grant in grants_data)
+
+def test_pdf_benchmark_runs(server, monkeypatch, capsys):
+    # The benchmark imports `server`; point it at this test's copy
+    monkeypatch.setitem(sys.modules, 'server', server)
+    spec = importlib.util.spec_from_file_location('benchmark_grants_pdf', BACKEND_DIR / 'benchmark_grants_pdf.py')
+    benchmark = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(benchmark)
+    results = benchmark.benchmark([2, 20])
+    assert [result['grants'] for result in results] == [2, 20]
+    assert results[1]['pages'] > results[0]['pages']
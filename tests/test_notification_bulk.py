@@ -0,0 +1,69 @@
+"""Tests for bulk mark-read and bulk delete of notifications"""
+
+import pandas as pd
+
+from tests.conftest import ANALYST_ID, EXPERT_ID
+
+def send(client, auth, sender, recipient, title):
+    response = client.post('/api/notifications/send', headers=auth(sender), json={
+        'to_user_id': recipient, 'type': 'message', 'title': title, 'message': 'hello'
+    })
+    return response.json()['notification']['id']
+
+def unread_count(client, headers):
+    return client.get('/api/notifications/unread-count', headers=headers).json()['unread_count']
+
+def test_bulk_read_rejects_ids_owned_by_someone_else(server, client, auth):
+    headers = auth(ANALYST_ID)
+    mine = [send(client, auth, EXPERT_ID, ANALYST_ID, str(i)) for i in range(3)]
+    theirs = send(client, auth, ANALYST_ID, EXPERT_ID, 'not yours')
+    before = unread_count(client, headers)
+
+    response = client.post('/api/notifications/read', json={'ids': mine + [theirs]}, headers=headers)
+    assert response.status_code == 403
+    # Nothing is applied when any id fails the ownership check
+    assert unread_count(client, headers) == before
+    assert unread_count(client, auth(EXPERT_ID)) >= 1
+
+    response = client.post('/api/notifications/read', json={'ids': mine[:2]}, headers=headers)
+    assert response.json()['updated'] == 2
+    assert unread_count(client, headers) == before - 2
+
+def test_bulk_delete_rejects_ids_owned_by_someone_else(server, client, auth):
+    headers = auth(ANALYST_ID)
+    mine = send(client, auth, EXPERT_ID, ANALYST_ID, 'mine')
+    theirs = send(client, auth, ANALYST_ID, EXPERT_ID, 'theirs')
+
+    assert client.post('/api/notifications/delete', json={'ids': [mine, theirs]}, headers=headers).status_code == 403
+    assert client.post('/api/notifications/delete', json={'ids': [theirs]}, headers=headers).status_code == 403
+    stored_ids = set(pd.read_csv(server.NOTIFICATIONS_CSV, dtype=str)['id'])
+    assert {mine, theirs} <= stored_ids
+
+    assert client.post('/api/notifications/delete', json={'ids': [mine]}, headers=headers).json()['deleted'] == 1
+    stored_ids = set(pd.read_csv(server.NOTIFICATIONS_CSV, dtype=str)['id'])
+    assert mine not in stored_ids and theirs in stored_ids
+
+def test_all_before_only_touches_own_notifications(server, client, auth):
+    headers = auth(ANALYST_ID)
+    send(client, auth, EXPERT_ID, ANALYST_ID, 'mine')
+    send(client, auth, ANALYST_ID, EXPERT_ID, 'theirs')
+    expert_unread = unread_count(client, auth(EXPERT_ID))
+
+    client.post('/api/notifications/read', json={'all_before': '2100-01-01T00:00:00Z'}, headers=headers)
+    assert unread_count(client, headers) == 0
+    assert unread_count(client, auth(EXPERT_ID)) == expert_unread
+
+    client.post('/api/notifications/delete', json={'all_before': '2100-01-01T00:00:00Z'}, headers=headers)
+    stored = pd.read_csv(server.NOTIFICATIONS_CSV, dtype=str)
+    assert not (stored['to_user_id'] == ANALYST_ID).any()
+    assert (stored['to_user_id'] == EXPERT_ID).any()
+
+def test_single_read_checks_ownership(client, auth):
+    theirs = send(client, auth, ANALYST_ID, EXPERT_ID, 'theirs')
+    assert client.post(f"/api/notifications/{theirs}/read", headers=auth(ANALYST_ID)).status_code == 403
+    assert client.post('/api/notifications/missing/read', headers=auth(ANALYST_ID)).status_code == 404
+
+def test_requires_exactly_one_selector(client, auth):
+    headers = auth(ANALYST_ID)
+    assert client.post('/api/notifications/read', json={}, headers=headers).status_code == 400
+    assert client.post('/api/notifications/read', json={'all_before': 'yesterday'}, headers=headers).status_code == 400
@@ -0,0 +1,76 @@
+"""Tests for /notifications/fanout recipient resolution and authorization"""
+
+import importlib.util
+
+import pandas as pd
+
+from tests.conftest import ADMIN_ID, ANALYST_ID, BACKEND_DIR, EXPERT_ID, INCUBATION_ADMIN_ID, OTHER_ANALYST_ID
+
+OTHER_ANALYSTS_STARTUP_ID = '40548211-1347-4c52-96bb-7f43a2a3205f'
+
+def fan_out(client, headers, recipients, title='Announcement'):
+    return client.post('/api/notifications/fanout', headers=headers, json={
+        'recipients': recipients, 'title': title, 'message': 'hello'
+    })
+
+def stored_notifications(server):
+    return pd.read_csv(server.NOTIFICATIONS_CSV, dtype=str)
+
+def nothing_sent(server):
+    return stored_notifications(server).query("title == 'Announcement'").empty
+
+def test_admin_can_notify_a_whole_tier(server, client, auth):
+    analysts = server.load_users_df().query("tier == 'venture_analyst'")['id'].tolist()
+    response = fan_out(client, auth(ADMIN_ID), {'tiers': ['venture_analyst']}, title='To analysts')
+    assert response.status_code == 200
+    assert response.json()['count'] == len(analysts)
+
+    sent = stored_notifications(server).query("title == 'To analysts'")
+    assert sorted(sent['to_user_id']) == sorted(analysts)
+    assert (sent['from_user_id'] == ADMIN_ID).all()
+
+def test_non_admins_cannot_use_tier_or_foreign_group_selectors(server, client, auth):
+    assert fan_out(client, auth(ANALYST_ID), {'tiers': ['free']}).status_code == 403
+    assert fan_out(client, auth(EXPERT_ID), {'analysts_of_startup': OTHER_ANALYSTS_STARTUP_ID}).status_code == 403
+    assert fan_out(client, auth(ANALYST_ID), {'startups_of_incubator': INCUBATION_ADMIN_ID}).status_code == 403
+    assert nothing_sent(server)
+
+def test_non_admin_user_ids_must_all_be_assigned(server, client, auth):
+    response = fan_out(client, auth(ANALYST_ID), {'user_ids': [EXPERT_ID, OTHER_ANALYSTS_STARTUP_ID]})
+    assert response.status_code == 403
+    assert nothing_sent(server)
+
+    response = fan_out(client, auth(ANALYST_ID), {'user_ids': [EXPERT_ID]}, title='To my startup')
+    assert response.json()['count'] == 1
+    assert stored_notifications(server).query("title == 'To my startup'")['to_user_id'].tolist() == [EXPERT_ID]
+
+def test_own_group_selectors(server, client, auth):
+    response = fan_out(client, auth(EXPERT_ID), {'analysts_of_startup': EXPERT_ID}, title='To my analysts')
+    assert response.status_code == 200
+    assert stored_notifications(server).query("title == 'To my analysts'")['to_user_id'].tolist() == [ANALYST_ID]
+
+    response = fan_out(client, auth(INCUBATION_ADMIN_ID), {'startups_of_incubator': INCUBATION_ADMIN_ID}, title='To my startups')
+    assert response.status_code == 200
+    recipients = set(stored_notifications(server).query("title == 'To my startups'")['to_user_id'])
+    assert recipients == set(server.own_notification_recipients({'id': INCUBATION_ADMIN_ID}))
+    assert OTHER_ANALYST_ID not in recipients and ANALYST_ID not in recipients
+
+def test_non_admin_recipient_cap(server, client, auth, monkeypatch):
+    monkeypatch.setattr(server, 'NOTIFICATION_FANOUT_MAX_RECIPIENTS_NON_ADMIN', 1)
+    response = fan_out(client, auth(INCUBATION_ADMIN_ID), {'startups_of_incubator': INCUBATION_ADMIN_ID})
+    assert response.status_code == 400
+    assert nothing_sent(server)
+
+def test_fanout_updates_the_inbox_index(server, client, auth):
+    before = client.get('/api/notifications/unread-count', headers=auth(ANALYST_ID)).json()['unread_count']
+    fan_out(client, auth(ADMIN_ID), {'tiers': ['venture_analyst'], 'user_ids': [ANALYST_ID]})
+    after = client.get('/api/notifications/unread-count', headers=auth(ANALYST_ID)).json()['unread_count']
+    # Recipients are a union, so a user matched twice gets one notification
+    assert after == before + 1
+
+def test_fanout_benchmark_runs(capsys):
+    spec = importlib.util.spec_from_file_location('benchmark_notification_fanout', BACKEND_DIR / 'benchmark_notification_fanout.py')
+    benchmark = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(benchmark)
+    benchmark.benchmark(recipients=200, sample=2)
+    assert 'Speed-up' in capsys.readouterr().out
@@ -0,0 +1,82 @@
+"""Tests for the notification SSE stream: tickets, Last-Event-ID replay and live delivery"""
+
+import asyncio
+import json
+import uuid
+from datetime import datetime, timezone
+
+from starlette.requests import Request
+
+from tests.conftest import ANALYST_ID, EXPERT_ID
+
+def notification_row(title):
+    return {
+        'id': str(uuid.uuid4()),
+        'to_user_id': ANALYST_ID,
+        'from_user_id': EXPERT_ID,
+        'type': 'message',
+        'title': title,
+        'message': 'hello',
+        'data': '{}',
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'read': False,
+    }
+
+def stream_request(headers=()):
+    async def receive():
+        await asyncio.sleep(3600)
+        return {'type': 'http.disconnect'}
+    scope = {'type': 'http', 'method': 'GET', 'path': '/api/notifications/stream', 'query_string': b'', 'headers': list(headers)}
+    return Request(scope, receive)
+
+async def next_event(body):
+    """Next notification event from the stream, skipping retry/keepalive lines"""
+    while True:
+        chunk = await asyncio.wait_for(body.__anext__(), timeout=5)
+        if chunk.startswith('id: '):
+            event_id, _, data = chunk.strip().split('\n')
+            return event_id[len('id: '):], json.loads(data[len('data: '):])
+
+def test_ticket_opens_only_the_stream(server, client, auth):
+    response = client.post('/api/notifications/stream-ticket', headers=auth(ANALYST_ID))
+    assert response.status_code == 200
+    ticket = response.json()['ticket']
+
+    # The ticket is not a login token, and the login token is not a ticket
+    assert client.get('/api/notifications/my', headers={'Authorization': f"Bearer {ticket}"}).status_code == 401
+    login_token = auth(ANALYST_ID)['Authorization'][len('Bearer '):]
+    assert client.get('/api/notifications/stream', params={'ticket': login_token}).status_code == 401
+    assert client.get('/api/notifications/stream', params={'token': login_token}).status_code == 401
+    assert client.post('/api/notifications/stream-ticket').status_code == 403
+
+def test_replays_after_last_event_id_then_streams_live(server, client):
+    rows = [notification_row(f"before {i}") for i in range(3)]
+    server.append_notification_rows(rows)
+
+    async def scenario():
+        request = stream_request([(b'last-event-id', rows[0]['id'].encode())])
+        response = await server.stream_notifications(request, ticket=server.create_stream_ticket(ANALYST_ID))
+        assert response.headers['referrer-policy'] == 'no-referrer'
+        body = response.body_iterator
+        try:
+            replayed = [await next_event(body), await next_event(body)]
+            assert [event_id for event_id, _ in replayed] == [rows[1]['id'], rows[2]['id']]
+            assert replayed[0][1]['title'] == 'before 1'
+
+            # Saves run on worker threads; the event still reaches this loop
+            live = notification_row('live')
+            await asyncio.to_thread(server.append_notification_rows, [live])
+            event_id, record = await next_event(body)
+            assert event_id == live['id'] and record['title'] == 'live'
+        finally:
+            await body.aclose()
+        assert ANALYST_ID not in server._notification_subscribers
+
+    asyncio.run(scenario())
+
+def test_other_users_notifications_are_not_replayed(server, client):
+    mine = notification_row('mine')
+    theirs = dict(notification_row('theirs'), to_user_id=EXPERT_ID)
+    server.append_notification_rows([mine, theirs])
+    assert server.notifications_after(ANALYST_ID, theirs['id']) == []
+    assert server.notifications_after(EXPERT_ID, mine['id']) == []
@@ -0,0 +1,73 @@
+"""Tests for the streaming upload pipeline: size limits and magic-byte type checks"""
+
+import io
+
+import pandas as pd
+from PIL import Image
+
+from tests.conftest import ANALYST_ID
+
+def png_bytes(color='blue', size=(60, 40)):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, color).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+def leftover_temp_files(server):
+    return [path for path in server.UPLOADS_DIR.rglob('*') if path.name.startswith('.upload-')]
+
+def upload_photo(client, headers, data, filename='photo.png', content_type='image/png'):
+    return client.post('/api/auth/upload-photo', files={'file': (filename, data, content_type)}, headers=headers)
+
+def upload_screenshot(client, headers, tracking_id, data):
+    return client.post(f"/api/tracking/{tracking_id}/screenshot", files={'file': ('shot', data, 'application/octet-stream')}, headers=headers)
+
+def own_tracking_id(server):
+    tracking_df = server.load_grant_tracking_df()
+    return str(tracking_df[tracking_df['user_id'] == ANALYST_ID]['id'].iloc[0])
+
+def test_type_comes_from_magic_bytes_not_the_name(server, client, auth):
+    response = upload_photo(client, auth(ANALYST_ID), png_bytes(), filename='photo.jpeg', content_type='image/jpeg')
+    assert response.status_code == 200
+    photo_url = response.json()['photo_url']
+    assert photo_url.endswith('.png')
+    assert client.get(photo_url).content == png_bytes()
+
+    users_df = pd.read_csv(server.USERS_CSV, dtype=str).set_index('id')
+    assert users_df.at[ANALYST_ID, 'photo_url'] == photo_url
+
+def test_rejects_non_images_whatever_they_claim_to_be(server, client, auth):
+    response = upload_photo(client, auth(ANALYST_ID), b'<html><script>alert(1)</script></html>')
+    assert response.status_code == 400
+    assert 'Invalid file type' in response.json()['detail']
+    response = upload_screenshot(client, auth(ANALYST_ID), own_tracking_id(server), b'%PDF-1.4 not an image')
+    assert response.status_code == 400
+    assert upload_photo(client, auth(ANALYST_ID), b'').status_code == 400
+    assert leftover_temp_files(server) == []
+
+def test_each_kind_has_its_own_size_limit(server, client, auth):
+    headers = auth(ANALYST_ID)
+    six_megabytes = b'\xff\xd8\xff' + b'0' * (6 * 1024 * 1024)
+
+    response = upload_photo(client, headers, six_megabytes, filename='big.jpg', content_type='image/jpeg')
+    assert response.status_code == 413
+    assert '5 MB' in response.json()['detail']
+
+    # Screenshots allow up to 10 MB
+    assert upload_screenshot(client, headers, own_tracking_id(server), six_megabytes).status_code == 200
+    eleven_megabytes = b'\xff\xd8\xff' + b'0' * (11 * 1024 * 1024)
+    assert upload_screenshot(client, headers, own_tracking_id(server), eleven_megabytes).status_code == 413
+    assert leftover_temp_files(server) == []
+
+def test_declared_length_over_the_limit_is_rejected_up_front(server, client, auth):
+    headers = dict(auth(ANALYST_ID), **{
+        'Content-Type': 'multipart/form-data; boundary=x',
+        'Content-Length': str(50 * 1024 * 1024),
+    })
+    response = client.post('/api/auth/upload-photo', content=b'--x--\r\n', headers=headers)
+    assert response.status_code == 413
+
+def test_screenshot_requires_access_to_the_tracking_row(server, client, auth):
+    tracking_df = server.load_grant_tracking_df()
+    foreign_id = str(tracking_df[tracking_df['user_id'] != ANALYST_ID]['id'].iloc[0])
+    assert upload_screenshot(client, auth(ANALYST_ID), foreign_id, png_bytes()).status_code == 403
+    assert upload_screenshot(client, auth(ANALYST_ID), 'missing', png_bytes()).status_code == 404
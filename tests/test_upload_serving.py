@@ -0,0 +1,107 @@
+"""Tests for serving uploads: validators, Range requests and signed screenshot URLs"""
+
+import io
+
+from PIL import Image
+
+from tests.conftest import ADMIN_ID, ANALYST_ID, EXPERT_ID, INCUBATION_ADMIN_ID, OTHER_ANALYST_ID
+
+def png_bytes(color='blue', size=(300, 200)):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, color).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+def upload_photo(client, headers):
+    response = client.post('/api/auth/upload-photo', files={'file': ('photo.png', png_bytes(), 'image/png')}, headers=headers)
+    return response.json()['photo_url']
+
+def upload_screenshot(server, client, auth):
+    """Attach a screenshot to the analyst's tracking row for EXPERT_ID's startup and return the row as the API lists it"""
+    tracking_df = server.load_grant_tracking_df()
+    own_rows = tracking_df[(tracking_df['user_id'] == ANALYST_ID) & (tracking_df['startup_id'] == EXPERT_ID)]
+    tracking_id = str(own_rows['id'].iloc[0])
+    client.post(f"/api/tracking/{tracking_id}/screenshot", files={'file': ('shot.png', png_bytes('red'), 'image/png')}, headers=auth(ANALYST_ID))
+    rows = client.get('/api/tracking/all', headers=auth(ANALYST_ID)).json()['tracking']
+    return next(row for row in rows if row['id'] == tracking_id)
+
+def test_etag_and_not_modified(client, auth):
+    photo_url = upload_photo(client, auth(ANALYST_ID))
+    response = client.get(photo_url)
+    assert response.status_code == 200
+    assert 'immutable' in response.headers['cache-control']
+    assert response.headers['content-type'] == 'image/png'
+
+    revalidated = client.get(photo_url, headers={'If-None-Match': response.headers['etag']})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b''
+
+    head = client.head(photo_url)
+    assert head.status_code == 200
+    assert int(head.headers['content-length']) == len(response.content)
+
+def test_range_requests(client, auth):
+    photo_url = upload_photo(client, auth(ANALYST_ID))
+    full = client.get(photo_url).content
+
+    first = client.get(photo_url, headers={'Range': 'bytes=0-99'})
+    assert first.status_code == 206
+    assert first.headers['content-range'] == f"bytes 0-99/{len(full)}"
+    assert first.content == full[:100]
+
+    suffix = client.get(photo_url, headers={'Range': 'bytes=-10'})
+    assert suffix.status_code == 206 and suffix.content == full[-10:]
+
+    unsatisfiable = client.get(photo_url, headers={'Range': f"bytes={len(full) + 10}-"})
+    assert unsatisfiable.status_code == 416
+    assert unsatisfiable.headers['content-range'] == f"bytes */{len(full)}"
+
+    # Multiple ranges and a stale If-Range fall back to the whole file
+    assert client.get(photo_url, headers={'Range': 'bytes=0-1,5-6'}).status_code == 200
+    assert client.get(photo_url, headers={'Range': 'bytes=0-9', 'If-Range': '"stale"'}).status_code == 200
+
+def test_parse_byte_range(server):
+    assert server.parse_byte_range('bytes=0-', 100) == (0, 99)
+    assert server.parse_byte_range('bytes=10-20', 100) == (10, 20)
+    assert server.parse_byte_range('bytes=-5', 100) == (95, 99)
+    assert server.parse_byte_range('bytes=abc', 100) is None
+    assert server.parse_byte_range('items=0-1', 100) is None
+
+def test_resized_variants(client, auth):
+    photo_url = upload_photo(client, auth(ANALYST_ID))
+    thumb = client.get(photo_url, params={'size': 'thumb'})
+    assert thumb.status_code == 200
+    assert thumb.headers['content-type'] == 'image/webp'
+    assert max(Image.open(io.BytesIO(thumb.content)).size) < 300
+
+def test_uploads_cannot_escape_the_uploads_directory(client):
+    assert client.get('/backend/uploads/../data/users.csv').status_code == 404
+
+def test_screenshots_use_signed_urls(server, client, auth):
+    row = upload_screenshot(server, client, auth)
+    signed_url = row['screenshot_url']
+    path = signed_url.split('?')[0]
+    assert 'token=' not in signed_url
+
+    response = client.get(signed_url)
+    assert response.status_code == 200
+    assert response.headers['referrer-policy'] == 'no-referrer'
+    assert response.headers['cache-control'].startswith('private')
+    assert client.get(f"{signed_url}&size=medium").status_code == 200
+
+    assert client.get(path).status_code == 401
+    assert client.get(signed_url[:-4] + '0000').status_code == 401
+    login_token = auth(ANALYST_ID)['Authorization'][len('Bearer '):]
+    assert client.get(path, params={'token': login_token}).status_code == 401
+
+    reference = path[len('/backend/uploads/'):]
+    expired = client.get(path, params={'expires': 100, 'sig': server._upload_signature(reference, 100)})
+    assert expired.status_code == 401
+
+def test_screenshot_access_with_a_bearer_header(server, client, auth):
+    path = upload_screenshot(server, client, auth)['screenshot_url'].split('?')[0]
+    assert client.get(path, headers=auth(ANALYST_ID)).status_code == 200
+    assert client.get(path, headers=auth(ADMIN_ID)).status_code == 200
+    # The startup the row belongs to may see it; an unrelated analyst or incubator may not
+    assert client.get(path, headers=auth(EXPERT_ID)).status_code == 200
+    assert client.get(path, headers=auth(OTHER_ANALYST_ID)).status_code == 403
+    assert client.get(path, headers=auth(INCUBATION_ADMIN_ID)).status_code == 403
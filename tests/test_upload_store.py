@@ -0,0 +1,105 @@
+"""Tests for the content-addressed upload store: deduplication, refcounts and garbage collection"""
+
+import io
+import os
+import time
+
+from PIL import Image
+
+from tests.conftest import ADMIN_ID, ANALYST_ID, OTHER_ANALYST_ID
+
+def png_bytes(color):
+    buffer = io.BytesIO()
+    Image.new('RGB', (60, 40), color).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+def upload_photo(client, headers, data):
+    response = client.post('/api/auth/upload-photo', files={'file': ('photo.png', data, 'image/png')}, headers=headers)
+    assert response.status_code == 200
+    return response.json()['photo_url']
+
+def reference_of(url):
+    return url[len('/backend/uploads/'):]
+
+def make_old(server, reference):
+    old = time.time() - 24 * 3600
+    os.utime(server.UPLOADS_DIR / reference, (old, old))
+
+def test_identical_uploads_share_one_file(server, client, auth):
+    data = png_bytes('blue')
+    first = upload_photo(client, auth(ANALYST_ID), data)
+    second = upload_photo(client, auth(OTHER_ANALYST_ID), data)
+    assert first == second
+    assert server.get_upload_refcounts()[reference_of(first)] == 2
+
+    stored = list((server.UPLOADS_DIR / 'profile_photos').rglob(f"{os.path.basename(first)}"))
+    assert len(stored) == 1
+
+def test_refcounts_follow_row_changes_and_match_a_rebuild(server, client, auth):
+    blue = upload_photo(client, auth(ANALYST_ID), png_bytes('blue'))
+    green = upload_photo(client, auth(ANALYST_ID), png_bytes('green'))
+    refcounts = server.get_upload_refcounts()
+    assert not refcounts.get(reference_of(blue))
+    assert refcounts[reference_of(green)] == 1
+
+    incremental = dict(server.get_upload_refcounts())
+    server._upload_refcounts = None
+    server._table_snapshots.clear()
+    assert dict(server.get_upload_refcounts()) == incremental
+
+def test_gc_removes_only_old_unreferenced_files(server, client, auth):
+    orphan = upload_photo(client, auth(ANALYST_ID), png_bytes('blue'))
+    kept = upload_photo(client, auth(ANALYST_ID), png_bytes('green'))
+    assert client.get(orphan, params={'size': 'thumb'}).status_code == 200
+
+    # Too recent: a just-replaced photo may still be in flight
+    client.post('/api/admin/uploads/gc', params={'min_age_seconds': 0}, headers=auth(ADMIN_ID))
+    assert (server.UPLOADS_DIR / reference_of(orphan)).exists()
+
+    make_old(server, reference_of(orphan))
+    make_old(server, reference_of(kept))
+    result = client.post('/api/admin/uploads/gc', params={'min_age_seconds': 0}, headers=auth(ADMIN_ID)).json()
+    assert result['removed'] >= 1
+    assert not (server.UPLOADS_DIR / reference_of(orphan)).exists()
+    assert not server.derivative_path(server.UPLOADS_DIR / reference_of(orphan), 'thumb').exists()
+    assert (server.UPLOADS_DIR / reference_of(kept)).exists()
+
+def test_gc_spares_a_file_referenced_after_its_scan(server, client, auth, monkeypatch):
+    orphan = upload_photo(client, auth(ANALYST_ID), png_bytes('blue'))
+    upload_photo(client, auth(ANALYST_ID), png_bytes('green'))
+    make_old(server, reference_of(orphan))
+
+    # A save that points a row at the file lands between the scan and the recheck
+    original = server.get_upload_refcounts
+    calls = []
+    def refcounts_with_concurrent_save():
+        calls.append(1)
+        if len(calls) == 2:
+            server.update_user_row(OTHER_ANALYST_ID, {'photo_url': orphan})
+        return original()
+    monkeypatch.setattr(server, 'get_upload_refcounts', refcounts_with_concurrent_save)
+
+    server.collect_orphaned_uploads(0)
+    assert len(calls) >= 2
+    assert (server.UPLOADS_DIR / reference_of(orphan)).exists()
+
+def test_gc_spares_a_file_reused_by_an_upload_after_its_scan(server, client, auth, monkeypatch):
+    data = png_bytes('blue')
+    orphan = upload_photo(client, auth(ANALYST_ID), data)
+    upload_photo(client, auth(ANALYST_ID), png_bytes('green'))
+    make_old(server, reference_of(orphan))
+
+    # A deduplicated upload refreshes the stored file's mtime before its row is saved
+    original = server.get_upload_refcounts
+    calls = []
+    def refcounts_with_concurrent_upload():
+        calls.append(1)
+        if len(calls) == 2:
+            os.utime(server.UPLOADS_DIR / reference_of(orphan))
+        return original()
+    monkeypatch.setattr(server, 'get_upload_refcounts', refcounts_with_concurrent_upload)
+
+    server.collect_orphaned_uploads(0)
+    assert (server.UPLOADS_DIR / reference_of(orphan)).exists()
+    monkeypatch.setattr(server, 'get_upload_refcounts', original)
+    assert upload_photo(client, auth(ANALYST_ID), data) == orphan